@@ -0,0 +1,95 @@
+'''
+Kiem tra cac query tong hop (daily_chart, mtd_avg, store_summary, daily_headline) cho cung ket qua
+voi cach cu (lay het data_daily roi groupby trong pandas) cho tung thang, ca khoang ngay va khi loc
+ngay trong tuan, va do thoi gian 2 cach. Thang 10 khong co luong_tt_daily_avg_mtd: pandas .sum()
+tra ve 0, SQL phai coalesce(sum(), 0) moi giong.
+
+Tra ve exit code 1 neu co ket qua khac nhau.
+
+    python benchmarks/bench_aggregates.py
+'''
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from core import ingest, queries  # noqa: E402
+from core.connection import ConnectionPool  # noqa: E402
+
+CHART_SUMS = ['tc', 'tc_forecast', 'luong_tt_daily', 'total_luongtt_act', 'chenh_lech_luong_khoan',
+              'baseline_rfc', 'baseline_act', 'whr_act', 'whr_gstar', 'total_whr_act']
+MTD_KEYS = ['ym', 'profit_center', 'store_vt', 'level_report_mtd']
+MTD_AGG = {'mtd_avg_tc': 'mean', 'total_luongtt_act': 'sum', 'luong_tt_daily_avg_mtd': 'sum',
+           'tc': 'sum', 'tc_forecast': 'sum'}
+STORE_SUMS = ['luong_tt_daily_avg_mtd', 'total_luongtt_act', 'tc', 'tc_forecast']
+# (ten, tu ngay, den ngay, ngay trong tuan)
+RANGES = [
+    ('202410', date(2024, 10, 1), date(2024, 10, 31), None),
+    ('202411', date(2024, 11, 1), date(2024, 11, 30), None),
+    ('202412', date(2024, 12, 1), date(2024, 12, 31), None),
+    ('all', date(2000, 1, 1), date(2100, 1, 1), None),
+    ('all Mon/Tue', date(2000, 1, 1), date(2100, 1, 1), ('2.Mon', '3.Tue')),
+]
+
+
+def pandas_aggregates(pool, from_date, to_date, days):
+    '''
+    Cach cu: SELECT * roi groupby trong pandas
+    '''
+    data_daily = queries.fetch_df(pool, 'data_daily', from_date, to_date)
+    if days:
+        data_daily = data_daily[data_daily['day_of_week2'].isin(days)]
+    chart = data_daily.groupby('report_date', as_index=False)[CHART_SUMS].sum()
+    chart['min_luong'] = chart[['luong_tt_daily', 'total_luongtt_act']].min(axis=1)
+    chart['abs_chenh_lech'] = chart['chenh_lech_luong_khoan'].abs()
+    mtd = data_daily.groupby(MTD_KEYS, as_index=False, dropna=False).agg(MTD_AGG)
+    mtd['chenh_lech_luong_khoan'] = mtd['luong_tt_daily_avg_mtd'] - mtd['total_luongtt_act']
+    stores = data_daily.groupby(['profit_center', 'store_vt'], as_index=False)[STORE_SUMS].sum()
+    tong_khoan = mtd['luong_tt_daily_avg_mtd'].sum()
+    tong_actual = mtd['total_luongtt_act'].sum()
+    headline = pd.DataFrame({'tong_khoan': [tong_khoan], 'tong_actual': [tong_actual],
+                             'chenh_lech': [tong_khoan - tong_actual]})
+    return {'daily_chart': chart, 'mtd_avg': mtd, 'store_summary': stores, 'daily_headline': headline}
+
+
+def sql_aggregates(pool, from_date, to_date, days):
+    return {name: queries.fetch_df(pool, name, from_date, to_date, days=days)
+            for name in ('daily_chart', 'mtd_avg', 'store_summary', 'daily_headline')}
+
+
+def same(expected, actual):
+    actual = actual[list(expected.columns)]
+    try:
+        pd.testing.assert_frame_equal(expected.reset_index(drop=True), actual.reset_index(drop=True),
+                                      check_dtype=False, check_exact=False)
+    except AssertionError:
+        return False
+    return True
+
+
+def main():
+    pool = ConnectionPool(':memory:', size=1)
+    with pool.connection() as con:
+        ingest.ingest(con, ROOT)
+
+    failed = []
+    print(f"{'range':<13}{'pandas (ms)':>13}{'sql (ms)':>10}  khac nhau")
+    for name, from_date, to_date, days in RANGES:
+        start = time.perf_counter()
+        expected = pandas_aggregates(pool, from_date, to_date, days)
+        pandas_s = time.perf_counter() - start
+        start = time.perf_counter()
+        actual = sql_aggregates(pool, from_date, to_date, days)
+        sql_s = time.perf_counter() - start
+        diff = [query for query in expected if not same(expected[query], actual[query])]
+        failed += [f'{name}: {query}' for query in diff]
+        print(f"{name:<13}{pandas_s * 1e3:>13.1f}{sql_s * 1e3:>10.1f}  {', '.join(diff) or '-'}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
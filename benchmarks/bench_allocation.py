@@ -0,0 +1,70 @@
+'''
+Benchmark engine phan bo chenh lech khoan (allocation.py) voi cach groupby().apply tung store-thang,
+tren du lieu gia lap N nhan vien-thang; kiem tra tong phan bo moi store-thang bang tong da lam tron.
+
+    python benchmarks/bench_allocation.py --rows 10000 100000
+'''
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from core import allocation  # noqa: E402
+
+rng = np.random.default_rng(0)
+
+
+def make_employees(n_rows, per_group=20):
+    n_groups = max(n_rows // per_group, 1)
+    group = rng.integers(0, n_groups, n_rows)
+    var_luongtt = rng.uniform(0, 5e7, n_groups) * (rng.random(n_groups) > 0.3)
+    return pd.DataFrame({
+        'profit_center': np.char.add('10GG', (group // 12).astype(str)),
+        'start_of_month': pd.Timestamp('2024-01-01') + pd.to_timedelta((group % 12) * 31, unit='D'),
+        'ma_nhan_vien': np.arange(n_rows).astype(str),
+        'whr': rng.uniform(10, 250, n_rows).round(2),
+        'he_so': rng.choice([0.7, 1.0, 1.2, 1.5], n_rows),
+        'var_luongtt': var_luongtt[group],
+    })
+
+
+def allocate_apply(df):
+    '''
+    Cach lam cu: tinh ty le trong tung nhom bang groupby().apply, khong lam tron
+    '''
+    def one_group(g):
+        g = g.copy()
+        g['whr_sau_he_so'] = g['whr'] * g['he_so']
+        g['whr_ratio'] = g['whr_sau_he_so'] / g['whr_sau_he_so'].sum()
+        g['allocated_bonus'] = g['whr_ratio'] * g['var_luongtt']
+        return g
+    return df.groupby(allocation.GROUP_COLUMNS, group_keys=False).apply(one_group, include_groups=False)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>9}{'groups':>9}{'engine (ms)':>13}{'apply (ms)':>12}{'max |sum - total|':>20}")
+    for n in args.rows:
+        df = make_employees(n)
+        start = time.perf_counter()
+        result = allocation.allocate(df)
+        engine = time.perf_counter() - start
+        start = time.perf_counter()
+        allocate_apply(df)
+        apply = time.perf_counter() - start
+
+        check = result.groupby(allocation.GROUP_COLUMNS).agg(
+            allocated=('allocated_bonus', 'sum'), total=('var_luongtt', 'first'))
+        error = (check['allocated'] - (check['total'] / allocation.ROUND_UNIT).round() * allocation.ROUND_UNIT).abs().max()
+        print(f'{n:>9}{len(check):>9}{engine * 1e3:>13.1f}{apply * 1e3:>12.1f}{error:>20.1f}')
+
+
+if __name__ == '__main__':
+    main()
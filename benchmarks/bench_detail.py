@@ -0,0 +1,80 @@
+'''
+Bang "Dữ liệu chi tiết": thoi gian tao Styler + serialize giong st.dataframe (streamlit.elements.arrow.marshall)
+va kich thuoc du lieu gui len browser, theo 3 cach:
+
+- rowwise: ca bang, mau chu tinh bang highlight_text goi cho tung dong (cach cu, bench_styling.py)
+- full: ca bang, mau chu tinh 1 lan bang np.where (reports.display_daily, core/styling.py)
+- page: sap xep o server (daily_order) va chi format / gui 1 trang DAILY_PAGE_SIZE dong (display_page)
+
+Du lieu gia lap bang cach nhan ban data_daily --scale lan (moi ban 1 nhom store khac). Ca bang qua
+styler.render.max_elements o (262144, ~14k dong) thi st.dataframe bao loi, chi cach page chay duoc.
+
+    python benchmarks/bench_detail.py --scale 1 10 50
+'''
+import argparse
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from core import ingest, queries, reports  # noqa: E402
+from core.connection import ConnectionPool  # noqa: E402
+
+from streamlit.elements.arrow import marshall  # noqa: E402
+from streamlit.errors import StreamlitAPIException  # noqa: E402
+from streamlit.proto.Arrow_pb2 import Arrow  # noqa: E402
+
+from bench_styling import highlight_text  # noqa: E402
+
+
+def rowwise(data_daily):
+    data_display = reports.daily_table(data_daily)
+    return data_display.style.format(subset=reports.DAILY_FORMAT_COLUMNS, formatter="{:,.0f}").apply(highlight_text, axis=1)
+
+
+def full(data_daily):
+    return reports.display_daily(reports.daily_table(data_daily))
+
+
+def page(data_daily):
+    positions = reports.daily_order(data_daily, sort_by='chenh_lech_luong_khoan', descending=True)
+    return reports.display_page(data_daily, positions[:reports.DAILY_PAGE_SIZE])
+
+
+def measure(build, data_daily):
+    start = time.perf_counter()
+    proto = Arrow()
+    marshall(proto, build(data_daily), 'bench')
+    return time.perf_counter() - start, proto.ByteSize()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scale', type=int, nargs='+', default=[1, 10, 50])
+    args = parser.parse_args()
+
+    print(f"{'rows':>9}  {'cach':<9}{'time (ms)':>11}{'payload (KB)':>14}")
+    for scale in args.scale:
+        pool = ConnectionPool(':memory:', size=1)
+        with pool.connection() as con:
+            ingest.ingest(con, ROOT)
+            con.execute('''
+                CREATE OR REPLACE TABLE data_daily AS
+                SELECT t.* REPLACE (t.store_vt || ' ' || r.range AS store_vt)
+                FROM data_daily t, range($n) r
+                ''', {'n': scale})
+        data_daily = queries.fetch_df(pool, 'data_daily', date(2000, 1, 1), date(2100, 1, 1))
+        for build in (rowwise, full, page):
+            try:
+                elapsed, size = measure(build, data_daily)
+            except StreamlitAPIException:
+                # st.dataframe khong render Styler qua styler.render.max_elements o (mac dinh 262144)
+                print(f'{len(data_daily):>9,}  {build.__name__:<9}  loi: qua so o toi da cua Styler')
+                continue
+            print(f'{len(data_daily):>9,}  {build.__name__:<9}{elapsed * 1e3:>11.0f}{size / 1024:>14.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+'''
+Bo nho cua cac DataFrame 1 session giu (1 lan load trang, toan bo khoang ngay, tat ca store)
+theo 2 FETCH_MODE: 'numpy' (fetch_df, string thanh object) va 'arrow' (fetch_arrow_table, string giu
+buffer Arrow). st.cache_data pickle ket qua va tra ve 1 ban unpickle cho moi lan goi, nen ca
+kich thuoc pickle (bo nho cache) va bo nho deep cua DataFrame (bo nho session) deu duoc in ra.
+
+    python benchmarks/bench_fetch.py --scale 16
+'''
+import argparse
+import pickle
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from core import aggregates, ingest, queries  # noqa: E402
+from core.connection import ConnectionPool  # noqa: E402
+
+SESSION_QUERIES = ['data_daily', 'daily_points', 'gstar_candidates', 'gstar_weekly', 'gstar_detail',
+                   'allocated_bonus', 'chot_khoan_thang', 'pbo_chot_thang', 'tier_tc']
+MODES = ['numpy', 'arrow']
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scale', type=int, default=1, help='nhan ban data_daily / dta_gstar len N lan')
+    args = parser.parse_args()
+
+    pool = ConnectionPool(':memory:', size=1)
+    with pool.connection() as con:
+        ingest.ingest(con, ROOT)
+        for table in ('data_daily', 'dta_gstar'):
+            con.execute(f'CREATE OR REPLACE TABLE {table} AS SELECT t.* FROM {table} t, range($n)', {'n': args.scale})
+        aggregates.refresh_thuong_monthly(con, 'bench_fetch')
+    from_date, to_date = date(2000, 1, 1), date(2100, 1, 1)
+
+    print(f"{'query':<18}{'rows':>9}  {'mode':<7}{'fetch (ms)':>12}{'frame (MB)':>12}{'pickle (MB)':>13}")
+    totals = {mode: [0.0, 0.0] for mode in MODES}
+    for name in SESSION_QUERIES:
+        for mode in MODES:
+            start = time.perf_counter()
+            df = queries.fetch_df(pool, name, from_date, to_date, mode=mode)
+            elapsed = time.perf_counter() - start
+            frame_mb = df.memory_usage(deep=True).sum() / 2 ** 20
+            pickle_mb = len(pickle.dumps(df)) / 2 ** 20
+            totals[mode][0] += frame_mb
+            totals[mode][1] += pickle_mb
+            print(f'{name:<18}{len(df):>9}  {mode:<7}{elapsed * 1e3:>12.1f}{frame_mb:>12.2f}{pickle_mb:>13.2f}')
+    for mode, (frame_mb, pickle_mb) in totals.items():
+        print(f"{'session total':<18}{'':>9}  {mode:<7}{'':>12}{frame_mb:>12.2f}{pickle_mb:>13.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+'''
+Tab Gstar: lay toan bo dong dta_gstar (SELECT *) roi group by theo ung vien / ung vien - tuan bang
+pandas (cach cu) so voi lay thang 2 bang tong hop tu DuckDB (query gstar_candidates / gstar_weekly).
+
+Gia lap du lieu toan quoc nhieu thang bang cach nhan ban dta_gstar --scale lan, moi ban la 1 nhom
+ung vien khac. In thoi gian, so dong va kich thuoc pickle (bo nho st.cache_data) cua moi cach,
+va kiem tra 2 cach cho cung ket qua.
+
+    python benchmarks/bench_gstar.py --scale 1 10 50
+'''
+import argparse
+import pickle
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from core import ingest, queries  # noqa: E402
+from core.connection import ConnectionPool  # noqa: E402
+
+KEYS = ['ma_ung_vien', 'doi_tuong', 'ten_ung_vien']
+SUMS = {'diem_danh_gia_sau_trong_so': 'sum', 'trong_so': 'sum', 'gio_cong_thuc_te': 'sum'}
+FROM_DATE, TO_DATE = date(2000, 1, 1), date(2100, 1, 1)
+
+
+def pandas_rollups(pool):
+    '''
+    Cach cu: SELECT * va 2 lan groupby trong pandas
+    '''
+    with pool.connection() as con:
+        data_gstar = queries.to_frame(con.execute('SELECT * FROM dta_gstar'))
+    rollups = []
+    for keys in (KEYS, KEYS + ['yw']):
+        df = data_gstar.groupby(keys, as_index=False).agg(SUMS)
+        df['avg_score'] = df['diem_danh_gia_sau_trong_so'] / df['trong_so']
+        rollups.append(df)
+    return data_gstar, rollups
+
+
+def sql_rollups(pool):
+    return [queries.fetch_df(pool, name, FROM_DATE, TO_DATE) for name in ('gstar_candidates', 'gstar_weekly')]
+
+
+def same(a, b):
+    try:
+        # cot string: pandas giu ArrowDtype khi groupby; sai so cong don so thuc do thu tu cong khac nhau
+        pd.testing.assert_frame_equal(a, b, check_dtype=False, check_exact=False)
+    except AssertionError:
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scale', type=int, nargs='+', default=[1, 10, 50])
+    args = parser.parse_args()
+
+    print(f"{'scale':>6}{'rows':>11}  {'cach':<8}{'time (ms)':>11}{'cache (MB)':>12}  same")
+    for scale in args.scale:
+        pool = ConnectionPool(':memory:', size=1)
+        with pool.connection() as con:
+            ingest.ingest(con, ROOT)
+            con.execute('''
+                CREATE OR REPLACE TABLE dta_gstar AS
+                SELECT t.* REPLACE (t.ma_ung_vien || '-' || r.range AS ma_ung_vien)
+                FROM dta_gstar t, range($n) r
+                ORDER BY t.store_vt, t.ngay_tuyen
+                ''', {'n': scale})
+            n_rows = con.execute('SELECT count(*) FROM dta_gstar').fetchone()[0]
+
+        start = time.perf_counter()
+        data_gstar, old = pandas_rollups(pool)
+        old_s = time.perf_counter() - start
+        start = time.perf_counter()
+        new = sql_rollups(pool)
+        new_s = time.perf_counter() - start
+
+        ok = all(same(a, b) for a, b in zip(old, new))
+        old_mb = sum(len(pickle.dumps(df)) for df in [data_gstar] + old) / 2 ** 20
+        new_mb = sum(len(pickle.dumps(df)) for df in new) / 2 ** 20
+        print(f'{scale:>6}{n_rows:>11,}  {"pandas":<8}{old_s * 1e3:>11.0f}{old_mb:>12.1f}')
+        print(f'{"":>6}{"":>11}  {"sql":<8}{new_s * 1e3:>11.0f}{new_mb:>12.1f}  {ok}')
+
+
+if __name__ == '__main__':
+    main()
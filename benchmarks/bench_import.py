@@ -0,0 +1,89 @@
+'''
+Thoi gian import (python -X importtime, process moi cho moi lan, lay trung vi cua --repeat lan) cua
+cac module trong core va export CLI, so voi ngan sach (ms). Kiem tra chinh la tap module duoc load:
+khong module nao trong danh sach load Streamlit, module nhe khong load pandas / numpy / plotly,
+`import core` khong load duckdb; ngan sach thoi gian chi bat cac thay doi lon.
+
+Tra ve exit code 1 neu co module vuot ngan sach hoac load module khong duoc phep.
+
+    python benchmarks/bench_import.py --repeat 5 --scale 1.0
+'''
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# module: ngan sach thoi gian import (ms, tinh ca cac module phu thuoc), ~2x trung vi do duoc (module
+# nhe: toi thieu vai ms vi sai so cua timer). Thoi gian import dao dong ~20-30% giua cac lan chay nen
+# dependency nang moi duoc bat qua FORBIDDEN, khong qua ngan sach
+IMPORT_BUDGET_MS = {
+    'core': 5,
+    'core.ingest': 15,
+    'core.partitions': 25,
+    'core.instrument': 15,
+    'core.connection': 80,
+    'core.queries': 1000,
+    'core.tiers': 1000,
+    'core.allocation': 1000,
+    'core.whatif': 1000,
+    'core.reports': 1000,
+    'core.styling': 1000,
+    'core.charts': 1300,
+    'export': 1200,
+    'partition_data': 120,
+}
+# module khong duoc load khi import
+FORBIDDEN = {name: {'streamlit', 'st_aggrid'} for name in IMPORT_BUDGET_MS}
+# cac module nhe (ingest / partition / log) khong can thu vien tinh toan
+for name in ('core', 'core.ingest', 'core.partitions', 'core.instrument', 'core.connection', 'partition_data'):
+    FORBIDDEN[name] |= {'pandas', 'numpy', 'pyarrow', 'plotly'}
+FORBIDDEN['core'] |= {'duckdb'}
+# chi core.charts duoc load plotly
+for name in ('core.queries', 'core.tiers', 'core.allocation', 'core.whatif', 'core.reports', 'core.styling', 'export'):
+    FORBIDDEN[name] |= {'plotly'}
+
+LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)')
+
+
+def import_time(module):
+    '''
+    Thoi gian import tich luy (us) cua `module` va tap module top-level da duoc load
+    '''
+    code = f'import sys, {module}; print(" ".join(sorted({{m.split(".")[0] for m in sys.modules}})))'
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    cumulative = 0
+    for match in LINE.finditer(result.stderr):
+        if match.group(4) == module and not match.group(3):
+            cumulative = int(match.group(2))
+    return cumulative, set(result.stdout.split())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--scale', type=float, default=1.0, help='nhan ngan sach (may cham hon / nhanh hon)')
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'module':<18}{'median (ms)':>13}{'budget (ms)':>13}  status")
+    for module, budget in IMPORT_BUDGET_MS.items():
+        runs = [import_time(module) for _ in range(args.repeat)]
+        median = statistics.median(us for us, _ in runs) / 1e3
+        loaded = FORBIDDEN[module] & set().union(*(modules for _, modules in runs))
+        status = 'ok'
+        if median > budget * args.scale:
+            status = 'OVER BUDGET'
+        if loaded:
+            status = f"loads {', '.join(sorted(loaded))}"
+        failed |= status != 'ok'
+        print(f'{module:<18}{median:>13.1f}{budget * args.scale:>13.0f}  {status}')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+'''
+Benchmark nap lai data_daily khi file nguon duoc ghi lai ca file: nap lai ca bang + tinh lai toan bo
+thuong_monthly so voi upsert theo cob_dt + chi tinh lai cac thang thay doi (ingest.py, aggregates.py).
+
+Lich su gia lap bang cach nhan ban data_luongtt.parquet lui ve truoc --years nam; file moi chi khac
+file cu o 1 ngay (ngay cuoi duoc tinh lai voi cob_dt moi). Kiem tra 2 cach cho cung ket qua, ke ca
+khi file moi co them cot (upsert phai nap lai ca bang thay vi loi binder).
+
+    python benchmarks/bench_ingest.py --years 1 5
+'''
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from core import aggregates, data_cache, ingest  # noqa: E402
+
+
+def make_history(data_dir, years):
+    '''
+    data_luongtt.parquet voi lich su `years` nam (ban goc lui lai tung 3 thang), cac file khac giu nguyen
+    '''
+    for name, (file, _) in ingest.SOURCES.items():
+        if name != 'data_daily':
+            shutil.copy(ROOT.joinpath(file), data_dir.joinpath(file))
+    shifts = ' UNION ALL '.join(
+        f"SELECT * REPLACE (report_date - INTERVAL {3 * i} MONTH AS report_date, "
+        f"strftime(report_date - INTERVAL {3 * i} MONTH, '%Y%m') AS ym) FROM read_parquet($src)"
+        for i in range(4 * years)
+    )
+    con = duckdb.connect()
+    con.execute(f"COPY ({shifts}) TO '{data_dir.joinpath('data_luongtt.parquet')}'",
+                {'src': str(ROOT.joinpath('data_luongtt.parquet'))})
+    return con.execute("SELECT count(*) FROM read_parquet($p)", {'p': str(data_dir.joinpath('data_luongtt.parquet'))}).fetchone()[0]
+
+
+def next_drop(data_dir, new_column=False):
+    '''
+    Ghi lai ca file, chi ngay cuoi co so lieu va cob_dt moi; new_column=True thi them 1 cot
+    '''
+    path = data_dir.joinpath('data_luongtt.parquet')
+    tmp = data_dir.joinpath('next.parquet')
+    extra = ', 1 AS cot_moi' if new_column else ''
+    con = duckdb.connect()
+    con.execute(f'''
+        COPY (
+            SELECT * REPLACE (
+                CASE WHEN report_date = max(report_date) OVER () THEN tc + 1 ELSE tc END AS tc,
+                CASE WHEN report_date = max(report_date) OVER () THEN cob_dt + INTERVAL 1 DAY ELSE cob_dt END AS cob_dt){extra}
+            FROM read_parquet('{path}')
+        ) TO '{tmp}'
+        ''')
+    tmp.replace(path)
+
+
+def same_table(a, b, table):
+    '''
+    2 database co cung noi dung bang `table` (sai so cong don so thuc do thu tu cong khac nhau)
+    '''
+    try:
+        pd.testing.assert_frame_equal(a.execute(f'SELECT * FROM {table} ORDER BY ALL').df(),
+                                      b.execute(f'SELECT * FROM {table} ORDER BY ALL').df(), check_exact=False)
+    except AssertionError:
+        return False
+    return True
+
+
+def refresh(con, data_dir, force):
+    start = time.perf_counter()
+    ingest.ingest(con, data_dir, force=force)
+    mode = aggregates.refresh_thuong_monthly(con, data_cache.file_version(data_dir.joinpath('data_luongtt.parquet')),
+                                             full=force)
+    return time.perf_counter() - start, mode
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--years', type=int, nargs='+', default=[1, 5])
+    args = parser.parse_args()
+
+    print(f"{'years':>6}{'rows':>10}{'full (ms)':>12}{'upsert (ms)':>13}  same")
+    for years in args.years:
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp)
+            n_rows = make_history(data_dir, years)
+            full, upsert = duckdb.connect(), duckdb.connect()
+            refresh(full, data_dir, force=True)
+            refresh(upsert, data_dir, force=False)
+            next_drop(data_dir)
+            full_s, _ = refresh(full, data_dir, force=True)
+            upsert_s, mode = refresh(upsert, data_dir, force=False)
+            same = all(same_table(full, upsert, t) for t in ('data_daily', 'thuong_monthly'))
+            print(f'{years:>6}{n_rows:>10,}{full_s * 1e3:>12.0f}{upsert_s * 1e3:>13.0f}  {same} ({mode})')
+            next_drop(data_dir, new_column=True)
+            full_s, _ = refresh(full, data_dir, force=True)
+            upsert_s, mode = refresh(upsert, data_dir, force=False)
+            same = all(same_table(full, upsert, t) for t in ('data_daily', 'thuong_monthly'))
+            print(f"{'+ cot':>6}{n_rows:>10,}{full_s * 1e3:>12.0f}{upsert_s * 1e3:>13.0f}  {same} ({mode})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+'''
+Benchmark thoi gian build figure va kich thuoc JSON cua cac chart lollipop
+theo 2 mode: 'per_row' (4 trace/dong) va 'vectorized' (so trace co dinh), kiem tra trong JSON
+x cua trace stem trung voi x cua trace marker (cung kieu truc)
+
+    python benchmarks/bench_lollipop.py
+'''
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from core.charts import chart_luong_tt, chart_luong_tt_bystore  # noqa: E402
+
+MODES = ['per_row', 'vectorized']
+rng = np.random.default_rng(0)
+
+
+def make_daily(n_days):
+    khoan = rng.uniform(2e6, 2e7, n_days)
+    actual = khoan * rng.uniform(0.7, 1.3, n_days)
+    df = pd.DataFrame({
+        'report_date': pd.date_range('2024-01-01', periods=n_days, freq='D'),
+        'luong_tt_daily': khoan,
+        'total_luongtt_act': actual,
+    })
+    df['chenh_lech_luong_khoan'] = df['luong_tt_daily'] - df['total_luongtt_act']
+    df['min_luong'] = df[['luong_tt_daily', 'total_luongtt_act']].min(axis=1)
+    df['abs_chenh_lech'] = df['chenh_lech_luong_khoan'].abs()
+    return df
+
+
+def make_stores(n_stores):
+    khoan = rng.uniform(1e8, 6e8, n_stores)
+    return pd.DataFrame({
+        'profit_center': [f'10GG{i:04d}' for i in range(n_stores)],
+        'store_vt': [f'GG Store {i:04d}' for i in range(n_stores)],
+        'luong_tt_daily_avg_mtd': khoan,
+        'total_luongtt_act': khoan * rng.uniform(0.7, 1.3, n_stores),
+        'tc': rng.uniform(1e3, 1e4, n_stores),
+        'tc_forecast': rng.uniform(1e3, 1e4, n_stores),
+    })
+
+
+def same_x(payload):
+    '''
+    x cua stem (bo NaN) va cua cac marker trong JSON gui len browser phai giong nhau
+    '''
+    lines = [t for t in payload['data'] if t.get('mode') == 'lines']
+    markers = [t for t in payload['data'] if t.get('mode') == 'markers']
+    stem_x = {v for t in lines for v in t['x'] if v is not None}
+    marker_x = {v for t in markers for v in t['x']}
+    return stem_x == marker_x
+
+
+def measure(build, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fig = build()
+        best = min(best, time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    payload = fig.to_json()
+    to_json = time.perf_counter() - t0
+    return len(fig.data), best, to_json, len(payload), same_x(json.loads(payload))
+
+
+def main():
+    print(f"{'chart':<24}{'size':>6}  {'mode':<11}{'traces':>7}{'build (ms)':>12}{'to_json (ms)':>14}{'json (KB)':>11}  same x")
+    cases = [('chart_luong_tt', n, lambda n=n: make_daily(n), chart_luong_tt) for n in (30, 90, 365)]
+    cases += [('chart_luong_tt_bystore', n, lambda n=n: make_stores(n), chart_luong_tt_bystore) for n in (10, 100, 500)]
+    for name, n, make, chart in cases:
+        df = make()
+        for mode in MODES:
+            n_traces, build, to_json, size, same = measure(lambda: chart(df, mode=mode))
+            print(f'{name:<24}{n:>6}  {mode:<11}{n_traces:>7}{build * 1e3:>12.1f}{to_json * 1e3:>14.1f}{size / 1024:>11.1f}  {same}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+'''
+Benchmark thoi gian build figure va kich thuoc JSON cua scatter gio cong - diem Gstar
+(char_gio_cong_daily_score) theo 3 mode: 'svg' (px.scatter SVG), 'webgl' (Scattergl, browser ve
+nhanh hon nhung van gui tat ca cac diem) va 'binned' (dem theo o 2 chieu o server, heatmap mat do).
+
+    python benchmarks/bench_scatter.py --rows 2000 20000 100000 500000
+'''
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from core.charts import char_gio_cong_daily_score  # noqa: E402
+
+# (gl_points, bin_points) truyen vao chart cho tung mode
+MODES = {'svg': (10 ** 12, 0), 'webgl': (0, 0), 'binned': (0, 1)}
+rng = np.random.default_rng(0)
+
+
+def make_gstar(n_rows):
+    '''
+    Ca lam Gstar gia lap: gio cong 0-24, diem danh gia 1-5 (phan lon la 5)
+    '''
+    ma = rng.integers(0, max(n_rows // 8, 1), n_rows)
+    return pd.DataFrame({
+        'ma_ung_vien': np.char.add('UV', ma.astype(str)),
+        'doi_tuong': np.where(ma % 3 == 0, 'GGG', 'Freelancer'),
+        'ten_ung_vien': np.char.add('Ung vien ', ma.astype(str)),
+        'gio_cong_thuc_te': rng.gamma(4, 1.5, n_rows).clip(0, 24),
+        'diem_danh_gia': rng.choice([1, 2, 3, 4, 5], n_rows, p=[0.01, 0.01, 0.03, 0.1, 0.85]),
+    })
+
+
+def measure(build):
+    t0 = time.perf_counter()
+    fig = build()
+    build_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    payload = fig.to_json()
+    return fig.data[0].type, build_s, time.perf_counter() - t0, len(payload)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=[2_000, 20_000, 100_000, 500_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}  {'mode':<8}{'trace':<11}{'build (ms)':>12}{'to_json (ms)':>14}{'json (KB)':>11}")
+    for n_rows in args.rows:
+        df = make_gstar(n_rows)
+        for mode, (gl_points, bin_points) in MODES.items():
+            trace, build, to_json, size = measure(
+                lambda: char_gio_cong_daily_score(df, gl_points=gl_points, bin_points=bin_points))
+            print(f'{n_rows:>8}  {mode:<8}{trace:<11}{build * 1e3:>12.1f}{to_json * 1e3:>14.1f}{size / 1024:>11.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+'''
+Thoi gian khoi dong dashboard tu 1 process Python moi (cold start), chay app.py bang AppTest:
+
+- login: tu luc bat dau process den khi form login render xong
+- dashboard: dang nhap bang form login (process moi, cold) den khi trang dau tien render xong
+
+Moi lan do chay trong process rieng voi `python -X importtime`, in ra thoi gian (median cua
+--repeat lan), cac module nang da bi load va cac import ton thoi gian nhat (cumulative).
+
+    python benchmarks/bench_startup.py --repeat 5 --top 10
+    python benchmarks/bench_startup.py --phase login --max-login-ms 1500
+'''
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# module nang khong can cho man hinh login
+HEAVY = ['pandas', 'numpy', 'pyarrow', 'duckdb', 'plotly.express', 'core.queries', 'core.charts', 'dashboard']
+
+LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)')
+
+CHILD = '''
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=300)
+at.secrets['credentials'] = {{'admin': {{'username': 'admin', 'password': 'x', 'displayname': 'Admin'}}}}
+at.run()
+login_ms = (time.perf_counter() - start) * 1e3
+result = {{'login_ms': login_ms, 'login_modules': sorted(sys.modules)}}
+if {phase!r} == 'dashboard':
+    at.sidebar.text_input[0].input('admin')
+    at.sidebar.text_input[1].input('x')
+    at.sidebar.button[0].click().run()
+    result['dashboard_ms'] = (time.perf_counter() - start) * 1e3
+errors = [e.message for e in at.exception]
+result['errors'] = errors
+print(json.dumps(result))
+'''
+
+
+def run_once(phase):
+    '''
+    1 lan do trong process moi: (ket qua JSON cua process con, {module: cumulative us})
+    '''
+    code = CHILD.format(app=str(ROOT.joinpath('app.py')), phase=phase)
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                          capture_output=True, text=True, check=True)
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result['process_ms'] = (time.perf_counter() - start) * 1e3
+    imports = {}
+    for match in LINE.finditer(proc.stderr):
+        if not match.group(3):
+            imports[match.group(4)] = int(match.group(2))
+    return result, imports
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--phase', choices=['login', 'dashboard'], nargs='+', default=['login', 'dashboard'])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--top', type=int, default=10, help='so import top-level ton thoi gian nhat can in')
+    parser.add_argument('--max-login-ms', type=float, help='exit 1 neu login (median) cham hon muc nay')
+    args = parser.parse_args()
+
+    failed = False
+    for phase in args.phase:
+        runs = [run_once(phase) for _ in range(args.repeat)]
+        for result, _ in runs:
+            if result['errors']:
+                print('\n'.join(result['errors']))
+                return 1
+        key = f'{phase}_ms'
+        median = statistics.median(r[key] for r, _ in runs)
+        process = statistics.median(r['process_ms'] for r, _ in runs)
+        print(f'== {phase}: {median:,.0f} ms tu luc import (process {process:,.0f} ms, median {args.repeat} lan)')
+        if phase == 'login':
+            loaded = [m for m in HEAVY if m in runs[0][0]['login_modules']]
+            print(f"   module nang da load truoc form login: {', '.join(loaded) or '(khong co)'}")
+            if args.max_login_ms and median > args.max_login_ms:
+                print(f'   CHAM HON {args.max_login_ms:,.0f} ms')
+                failed = True
+        imports = runs[0][1]
+        print(f"   {'import (top-level)':<44}{'cumulative (ms)':>16}")
+        for module, us in sorted(imports.items(), key=lambda item: -item[1])[:args.top]:
+            print(f'   {module:<44}{us / 1e3:>16.1f}')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+'''
+Micro-benchmark style bang: cac ham style cu goi cho tung dong / tung o (highlight_text,
+highlight_row, highlight_chenh_lech, truoc day trong core/reports.py) so voi ma tran CSS tinh 1 lan
+bang np.where (core/styling.py).
+
+Do 2 phan: tao CSS cho ca bang (callback qua DataFrame.apply / map nhu Styler lam, hoac np.where) va
+ca Styler._compute() (buoc Streamlit goi khi render Styler, gom ca buoc pandas doc CSS cua tung o),
+kiem tra 2 cach cho cung CSS.
+
+    python benchmarks/bench_styling.py --rows 10000 100000
+'''
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from core import reports, styling  # noqa: E402
+
+rng = np.random.default_rng(0)
+
+
+def make_daily(n_rows):
+    '''
+    Bang giong daily_table: cac cot so DAILY_FORMAT_COLUMNS, chenh lech am / duong / 0
+    '''
+    data = pd.DataFrame({
+        'Brand': rng.choice(['GG', 'KPUB', 'MW', 'CD'], n_rows),
+        'Store': np.char.add('Store ', rng.integers(0, 500, n_rows).astype(str)),
+        'Date': '2024-12-01',
+    })
+    for column in reports.DAILY_FORMAT_COLUMNS:
+        data[column] = rng.normal(0, 1e6, n_rows).round(-3)
+    data.loc[rng.random(n_rows) < 0.05, reports.DAILY_COLOR_COLUMN] = 0
+    data['chenh_lech_luong_khoan'] = data[reports.DAILY_COLOR_COLUMN]
+    return data
+
+
+# cac ham style cu, goi cho tung o / tung dong
+def highlight_chenh_lech(val):
+    color = 'red' if val < 0 else 'green' if val > 0 else 'black'
+    return f'color: {color}'
+
+
+def highlight_row(row):
+    color = 'background-color: #FF5353' if row['chenh_lech_luong_khoan'] < 0 else (
+            'background-color: #67FF53' if row['chenh_lech_luong_khoan'] > 0 else '')
+    return [color] * len(row)
+
+
+def highlight_text(row):
+    color = '#FF5353' if row['Chênh lệch Khoán - Thực tế hàng ngày'] < 0 else (
+            '#3CB32D' if row['Chênh lệch Khoán - Thực tế hàng ngày'] > 0 else 'black')
+    return [f'color: {color}' for _ in row]
+
+
+def text_css(d):
+    return styling.row_css(d, reports.DAILY_COLOR_COLUMN)
+
+
+def row_css(d):
+    return styling.row_css(d, 'chenh_lech_luong_khoan', positive='#67FF53', zero='', prop='background-color')
+
+
+def cell_css(d):
+    return styling.cell_css(d, reports.DAILY_FORMAT_COLUMNS, negative='red', positive='green')
+
+
+# (ten, CSS bang callback, Styler cu, CSS bang np.where, Styler moi)
+CASES = [
+    ('highlight_text',
+     lambda d: d.apply(highlight_text, axis=1, result_type='expand'),
+     lambda d: d.style.apply(highlight_text, axis=1),
+     text_css,
+     lambda d: styling.style(d, css=text_css(d))),
+    ('highlight_row',
+     lambda d: d.apply(highlight_row, axis=1, result_type='expand'),
+     lambda d: d.style.apply(highlight_row, axis=1),
+     row_css,
+     lambda d: styling.style(d, css=row_css(d))),
+    ('highlight_chenh_lech',
+     lambda d: d[reports.DAILY_FORMAT_COLUMNS].map(highlight_chenh_lech),
+     lambda d: d.style.map(highlight_chenh_lech, subset=reports.DAILY_FORMAT_COLUMNS),
+     cell_css,
+     lambda d: styling.style(d, css=cell_css(d))),
+]
+
+
+def timed(func, data):
+    start = time.perf_counter()
+    result = func(data)
+    return time.perf_counter() - start, result
+
+
+def compute(build, data):
+    start = time.perf_counter()
+    styler = build(data)
+    styler._compute()
+    return time.perf_counter() - start, styler.ctx
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}  {'callback':<22}{'css: callback':>14}{'np.where':>10}"
+          f"{'styler: callback':>18}{'np.where':>10}  same   (ms)")
+    for n_rows in args.rows:
+        data = make_daily(n_rows)
+        for name, old_css, old_styler, new_css, new_styler in CASES:
+            old_css_s, _ = timed(old_css, data)
+            new_css_s, _ = timed(new_css, data)
+            old_s, old_ctx = compute(old_styler, data)
+            new_s, new_ctx = compute(new_styler, data)
+            same = {k: v for k, v in old_ctx.items() if v} == {k: v for k, v in new_ctx.items() if v}
+            print(f'{n_rows:>8}  {name:<22}{old_css_s * 1e3:>14.0f}{new_css_s * 1e3:>10.1f}'
+                  f'{old_s * 1e3:>18.0f}{new_s * 1e3:>10.0f}  {same}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+'''
+Kiem tra va do thoi gian engine tinh luong khoan theo tier (tiers.py):
+so sanh voi luong_tt_daily / luong_khoan_daily_rfc trong data_daily va luong_khoan trong
+dta_chot_khoan_thang, roi do thoi gian tinh cho N store-ngay.
+
+Moi (store, ngay) / (store, thang) phai khop voi upstream o moi thang (assert). Thang 12 tc_from_daily
+cua tier = tc cua tier truoc nen TC nam tren bien thuoc ca 2 tier, file upstream co 2 dong cho ngay
+do (1 dong moi tier): chi can 1 trong cac dong cua key khop.
+
+    python benchmarks/bench_tiers.py --rows 10000 100000 1000000
+'''
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from core import ingest, tiers  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    con = duckdb.connect()
+    ingest.ingest(con, ROOT)
+    tier_tc = con.execute('SELECT * FROM tc_tier').df()
+    daily = con.execute('''
+        SELECT store_vt, ym, report_date, tc, tc_forecast, luong_tt_daily, luong_khoan_daily_rfc FROM data_daily
+        ''').df()
+    monthly = con.execute('SELECT store_vt, ym, tc, no_of_days, luong_khoan FROM dta_chot_khoan_thang').df()
+
+    start = time.perf_counter()
+    index = tiers.build_tier_index(tier_tc)
+    print(f'build_tier_index: {len(tier_tc)} dong tier, {(time.perf_counter() - start) * 1e3:.1f} ms')
+
+    # ty le dong / key (keys + thang) khop voi du lieu upstream (sai so < 1 dong), theo thang
+    checks = [
+        ('daily tc', daily, ['store_vt', 'report_date'],
+         tiers.luong_khoan_daily(index, daily['store_vt'], daily['ym'], daily['tc'])['luong_khoan'],
+         daily['luong_tt_daily']),
+        ('daily tc_forecast', daily, ['store_vt', 'report_date'],
+         tiers.luong_khoan_daily(index, daily['store_vt'], daily['ym'], daily['tc_forecast'])['luong_khoan'],
+         daily['luong_khoan_daily_rfc']),
+        ('monthly', monthly, ['store_vt'],
+         tiers.luong_khoan_monthly(index, monthly['store_vt'], monthly['ym'], monthly['tc'], monthly['no_of_days'])['luong_khoan'],
+         monthly['luong_khoan']),
+    ]
+    failed = []
+    for name, df, keys, calc, expected in checks:
+        valid = (expected.notna() & calc.notna()).to_numpy()
+        rows = df.loc[valid, keys + ['ym']].assign(match=(calc - expected).abs().to_numpy()[valid] < 1)
+        by_key = rows.groupby(keys + ['ym'])['match'].any().groupby(level='ym').mean()
+        by_row = rows.groupby('ym')['match'].mean()
+        print(f'{name:<18}' + '  '.join(f'{ym}: {by_row[ym]:.1%} dong, {by_key[ym]:.1%} key' for ym in by_row.index))
+        failed += [f'{name} {ym}' for ym, rate in by_key.items() if rate < 1]
+    assert not failed, f'luong khoan khong khop upstream: {failed}'
+
+    rng = np.random.default_rng(0)
+    for n in args.rows:
+        pick = rng.integers(0, len(daily), n)
+        stores = daily['store_vt'].to_numpy()[pick]
+        yms = daily['ym'].to_numpy()[pick]
+        tc = rng.uniform(0, 600, n)
+        start = time.perf_counter()
+        tiers.luong_khoan_daily(index, stores, yms, tc)
+        print(f'luong_khoan_daily {n:>9} store-ngay: {(time.perf_counter() - start) * 1e3:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+'''
+Benchmark thoi gian build figure va kich thuoc JSON cua chart violin (chart_dayofweek, chart_store)
+theo 2 mode: 'full' (px.violin voi tat ca cac diem) va 'summary' (KDE / quantile tinh san + diem lay mau).
+Them 1 store chi co 1 dong va 1 store gia tri khong doi (KDE suy bien), kiem tra x / y cua cac trace
+cung do dai.
+
+    python benchmarks/bench_violin.py
+'''
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from core.charts import chart_dayofweek, chart_store  # noqa: E402
+
+# max_points truyen vao chart cho tung mode
+MODES = {'full': 10 ** 12, 'summary': 1}
+DAYS = ['1.Sun', '2.Mon', '3.Tue', '4.Wed', '5.Thu', '6.Fri', '7.Sat']
+rng = np.random.default_rng(0)
+
+
+def make_box_data(n_rows, n_stores):
+    '''
+    Diem luong theo store / ngay; store cuoi chi co 1 dong, store ke cuoi cac dong giong het nhau
+    '''
+    stores = np.array([f'GG Store {i:04d}' for i in range(n_stores)])
+    idx = rng.integers(0, n_stores - 1, n_rows)
+    idx[0] = n_stores - 1
+    khoan = rng.uniform(2e6, 2e7, n_rows)
+    actual = khoan * rng.uniform(0.7, 1.3, n_rows)
+    khoan[idx == n_stores - 2] = 5e6
+    actual[idx == n_stores - 2] = 4e6
+    return pd.DataFrame({
+        'Date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, n_rows), unit='D'),
+        'Store': stores[idx],
+        'profit_center': np.char.add('10GG', idx.astype(str)),
+        'Chênh lệch': khoan - actual,
+        'Lương thực tế': actual,
+        'Lương khoán theo TC từng ngày': khoan,
+        'TC forecast': rng.uniform(100, 1000, n_rows),
+        'TC Actual': rng.uniform(100, 1000, n_rows),
+        'Ngày trong tuần': rng.choice(DAYS, n_rows),
+    })
+
+
+def measure(build):
+    t0 = time.perf_counter()
+    fig = build()
+    build_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    payload = fig.to_json()
+    same_len = all(len(t.x) == len(t.y) for t in fig.data if t.x is not None and t.y is not None)
+    return len(fig.data), build_s, time.perf_counter() - t0, len(payload), same_len
+
+
+def main():
+    print(f"{'chart':<18}{'rows':>8}  {'mode':<9}{'traces':>7}{'build (ms)':>12}{'to_json (ms)':>14}{'json (KB)':>11}  x/y ok")
+    for n_rows, n_stores in ((2_000, 10), (20_000, 50), (100_000, 200)):
+        df = make_box_data(n_rows, n_stores)
+        for chart in (chart_dayofweek, chart_store):
+            for mode, max_points in MODES.items():
+                n_traces, build, to_json, size, same_len = measure(lambda: chart(df, max_points=max_points))
+                print(f'{chart.__name__:<18}{n_rows:>8}  {mode:<9}{n_traces:>7}{build * 1e3:>12.1f}{to_json * 1e3:>14.1f}'
+                      f'{size / 1024:>11.1f}  {same_len}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+'''
+Benchmark thoi gian build figure va kich thuoc JSON cua chart diem Gstar theo tuan
+(chart_weekly_gstar_score) theo 2 mode: 'scatter' (1 diem + text cho moi ung vien - tuan, cao
+40px moi ung vien) va 'heatmap' (pivot NumPy, 1 trang WEEKLY_PAGE_SIZE ung vien), khi so ung vien tang.
+
+    python benchmarks/bench_weekly.py
+'''
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from core.charts import chart_weekly_gstar_score  # noqa: E402
+
+rng = np.random.default_rng(0)
+
+
+def make_weekly(n_candidates, n_weeks=13):
+    '''
+    Bang diem theo ung vien - tuan, moi ung vien co diem o khoang 60% so tuan
+    '''
+    cand = np.repeat(np.arange(n_candidates), n_weeks)
+    week = np.tile(np.arange(n_weeks), n_candidates)
+    keep = rng.random(len(cand)) < 0.6
+    cand, week = cand[keep], week[keep]
+    return pd.DataFrame({
+        'ma_ung_vien': np.char.add('UV', cand.astype(str)),
+        'doi_tuong': np.where(cand % 3 == 0, 'GGG', 'Freelancer'),
+        'ten_ung_vien': np.char.add('Ung vien ', cand.astype(str)),
+        'yw': np.char.add('2024-W', (week + 40).astype(str)),
+        'gio_cong_thuc_te': rng.uniform(4, 48, len(cand)),
+        'avg_score': rng.uniform(1, 5, len(cand)),
+    })
+
+
+def measure(build):
+    t0 = time.perf_counter()
+    fig = build()
+    build_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    payload = fig.to_json()
+    return build_s, time.perf_counter() - t0, len(payload), fig.layout.height
+
+
+def main():
+    print(f"{'candidates':>10}{'rows':>9}  {'mode':<9}{'build (ms)':>12}{'to_json (ms)':>14}{'json (KB)':>11}{'height':>9}")
+    for n_candidates in (200, 2_000, 20_000):
+        df = make_weekly(n_candidates)
+        for mode in ('scatter', 'heatmap'):
+            build, to_json, size, height = measure(lambda: chart_weekly_gstar_score(df, mode=mode))
+            print(f'{n_candidates:>10}{len(df):>9}  {mode:<9}{build * 1e3:>12.1f}{to_json * 1e3:>14.1f}{size / 1024:>11.1f}{height:>9}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+'''
+Load test: gia lap N session dashboard chay dong thoi, moi session chay lan luot cac query
+cua 1 lan load trang (data_daily, gstar, allocated_bonus, chot thang, pbo chot thang, tier tc)
+voi khoang ngay va danh sach store ngau nhien, khong qua cache cua Streamlit.
+
+So sanh pool 1 connection (tuong duong 1 connection dung chung) voi pool nhieu connection.
+
+    python benchmarks/load_test.py --sessions 50 --pages 3 --pool-sizes 1 4 8
+'''
+import argparse
+import random
+import statistics
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from core import aggregates, ingest, queries  # noqa: E402
+from core.connection import ConnectionPool  # noqa: E402
+
+PAGE_QUERIES = ['data_daily', 'gstar_candidates', 'allocated_bonus', 'chot_khoan_thang', 'pbo_chot_thang', 'tier_tc']
+
+
+def session(pool, all_stores, max_date, pages, seed, latencies):
+    rng = random.Random(seed)
+    for _ in range(pages):
+        to_date = max_date - timedelta(days=rng.randint(0, 30))
+        from_date = to_date - timedelta(days=rng.randint(7, 60))
+        stores = queries.canonical_stores(rng.sample(all_stores, rng.randint(1, len(all_stores))))
+        start = time.perf_counter()
+        for name in PAGE_QUERIES:
+            queries.fetch_df(pool, name, from_date, to_date, stores)
+        latencies.append(time.perf_counter() - start)
+
+
+def run(pool_size, sessions, pages, threads, memory_limit):
+    pool = ConnectionPool(':memory:', size=pool_size, threads=threads, memory_limit=memory_limit)
+    with pool.connection() as con:
+        ingest.ingest(con, ROOT)
+        aggregates.refresh_thuong_monthly(con, 'load_test')
+        aggregates.refresh_store_access(con, 'load_test', ['admin'])
+    all_stores = list(queries.fetch_df(pool, 'store', username='admin')['store_vt'])
+    max_date = queries.fetch_df(pool, 'max_date')['max_date'][0]
+    max_date = date(max_date.year, max_date.month, max_date.day)
+
+    latencies = []
+    workers = [
+        threading.Thread(target=session, args=(pool, all_stores, max_date, pages, i, latencies))
+        for i in range(sessions)
+    ]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    stats = pool.stats()
+    pool.close()
+
+    latencies.sort()
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+    print(f'{pool_size:>5}{len(latencies):>7}{elapsed:>10.2f}{len(latencies) / elapsed:>11.1f}'
+          f'{statistics.median(latencies) * 1e3:>10.0f}{p95 * 1e3:>10.0f}'
+          f"{stats['avg_wait_ms']:>13.1f}{stats['max_wait_ms']:>13.1f}{stats['waited']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=50)
+    parser.add_argument('--pages', type=int, default=3, help='so lan load trang cua moi session')
+    parser.add_argument('--pool-sizes', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--threads', type=int, default=None, help='DuckDB threads')
+    parser.add_argument('--memory-limit', default=None, help="DuckDB memory_limit, vd '2GB'")
+    args = parser.parse_args()
+
+    print(f'{args.sessions} sessions x {args.pages} pages, {len(PAGE_QUERIES)} queries/page')
+    print(f"{'pool':>5}{'pages':>7}{'time (s)':>10}{'pages/s':>11}{'p50 (ms)':>10}{'p95 (ms)':>10}"
+          f"{'avg wait ms':>13}{'max wait ms':>13}{'waited':>8}")
+    for size in args.pool_sizes:
+        run(size, args.sessions, args.pages, args.threads, args.memory_limit)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+'''
+Thu vien dung chung cua dashboard: truy cap du lieu (connection, queries, ingest, aggregates),
+tinh toan (tiers, whatif, allocation, reports), style bang (styling), ve chart (charts) va do thoi gian (instrument).
+
+Import `core` khong mo database, khong doc st.secrets va khong load Streamlit; cac module con
+(va pandas / plotly / duckdb ma chung can) chi duoc import khi dung lan dau, vd `core.charts`
+hoac `from core import queries`. Giao dien Streamlit (app.py) va export CLI (export.py) nam ngoai.
+'''
+import importlib
+
+__all__ = [
+    'aggregates',
+    'allocation',
+    'charts',
+    'connection',
+    'data_cache',
+    'ingest',
+    'instrument',
+    'partitions',
+    'queries',
+    'reports',
+    'styling',
+    'tiers',
+    'whatif',
+]
+
+
+def __getattr__(name):
+    if name in __all__:
+        module = importlib.import_module(f'.{name}', __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
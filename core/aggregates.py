@@ -0,0 +1,176 @@
+'''
+Bang tong hop duoc tinh san va luu trong database, build lai 1 lan moi khi du lieu nguon thay doi.
+
+thuong_monthly: tong luong khoan / luong thuc te theo (profit_center, thang), dung cho phan bo
+chenh lech khoan (get_allocated_bonus) thay vi group by lai toan bo data_daily moi lan query.
+
+store_access: user -> cac store duoc xem (index phan quyen), build tu data_daily va danh sach user
+trong secrets; danh sach store cua user va bo loc store cua moi query deu join vao bang nay.
+'''
+import threading
+
+THUONG_MONTHLY_DDL = '''
+    CREATE TABLE IF NOT EXISTS thuong_monthly (
+        profit_center VARCHAR,
+        som DATE,
+        luong_tt_daily DOUBLE,
+        total_luongtt_act DOUBLE,
+        var_luongtt DOUBLE
+    )
+    '''
+THUONG_MONTHLY_INDEX = 'CREATE INDEX IF NOT EXISTS thuong_monthly_pc_som ON thuong_monthly (profit_center, som)'
+
+THUONG_MONTHLY_INSERT = '''
+    INSERT INTO thuong_monthly
+    SELECT
+        profit_center
+        , date_trunc('month', report_date) som
+        , sum(luong_tt_daily) luong_tt_daily
+        , sum(total_luongtt_act) total_luongtt_act
+        , greatest(0, sum(luong_tt_daily) - sum(total_luongtt_act)) var_luongtt
+    FROM data_daily
+    WHERE {month_filter}
+    GROUP BY
+        profit_center
+        , date_trunc('month', report_date)
+    '''
+
+# Chi tinh lai cac thang co du lieu thay doi (ingest_changes); report_date between de bo qua
+# cac row group ngoai khoang thang
+MONTH_FILTER = '''
+    report_date between $first_som::date and $last_som::date + INTERVAL 1 MONTH
+    AND date_trunc('month', report_date)::date IN (SELECT unnest($months))
+    '''
+
+# Lich su refresh cua cac bang tong hop: version cua file nguon, ngay du lieu moi nhat da tong hop
+# va seq cuoi cung trong ingest_changes da xu ly
+REFRESH_LOG_DDL = [
+    '''
+    CREATE TABLE IF NOT EXISTS agg_refresh_log (
+        name VARCHAR PRIMARY KEY,
+        version VARCHAR,
+        max_report_date DATE,
+        refreshed_at TIMESTAMP
+    )
+    ''',
+    'ALTER TABLE agg_refresh_log ADD COLUMN IF NOT EXISTS change_seq BIGINT',
+]
+
+# Quyen xem store theo user: admin xem tat ca, hr_ss xem mien Nam, con lai theo 4 so cuoi profit center
+ACCESS_RULES = {
+    'admin': 'true',
+    'hr_ss': "s.mien = 'South'",
+}
+DEFAULT_ACCESS_RULE = 'right(s.profit_center, 4) = u.username'
+
+STORE_ACCESS_BUILD = '''
+    CREATE OR REPLACE TABLE store_access AS
+    WITH users AS (
+        SELECT DISTINCT unnest($usernames::VARCHAR[]) username
+    ), stores AS (
+        SELECT DISTINCT profit_center, store_vt, mien FROM data_daily
+    )
+    SELECT u.username, s.profit_center, s.store_vt, s.mien
+    FROM users u
+    JOIN stores s ON {rule}
+    ORDER BY u.username, s.store_vt
+    '''
+
+_lock = threading.Lock()
+
+
+def _refresh_state(db, name):
+    for ddl in REFRESH_LOG_DDL:
+        db.execute(ddl)
+    return db.execute('SELECT version, max_report_date, change_seq FROM agg_refresh_log WHERE name = $name',
+                      {'name': name}).fetchone()
+
+
+def _log_refresh(db, name, version, max_report_date, change_seq=None):
+    db.execute('''
+        INSERT OR REPLACE INTO agg_refresh_log (name, version, max_report_date, refreshed_at, change_seq)
+        VALUES ($name, $version, $max_report_date, now()::timestamp, $change_seq)
+        ''', {'name': name, 'version': version, 'max_report_date': max_report_date, 'change_seq': change_seq})
+
+
+def _changed_months(db, source, after_seq):
+    '''
+    Cac thang co du lieu thay doi cua bang `source` sau seq `after_seq` trong ingest_changes;
+    None trong ket qua = ca bang da duoc nap lai (hoac chua biet seq), can build lai toan bo
+    '''
+    if after_seq is None:
+        return [None]
+    rows = db.execute('SELECT DISTINCT som FROM ingest_changes WHERE name = $name AND seq > $seq',
+                      {'name': source, 'seq': after_seq}).fetchall()
+    return [row[0] for row in rows]
+
+
+def refresh_thuong_monthly(db, version, full=False):
+    '''
+    Cap nhat bang thuong_monthly neu version cua data_daily thay doi.
+
+    Chi tinh lai cac thang ma ingest ghi nhan co du lieu thay doi (ingest_changes) tu lan refresh
+    truoc; build lai toan bo khi chua co bang, khi data_daily duoc nap lai ca bang hoac khi
+    full=True. Tra ve 'fresh', 'incremental' hoac 'full'.
+    '''
+    version = str(version)
+    with _lock:
+        db.execute(THUONG_MONTHLY_DDL)
+        db.execute(THUONG_MONTHLY_INDEX)
+        state = _refresh_state(db, 'thuong_monthly')
+        if state is not None and state[0] == version and not full:
+            return 'fresh'
+
+        last_seq = db.execute("SELECT max(seq) FROM ingest_changes WHERE name = 'data_daily'").fetchone()[0]
+        months = _changed_months(db, 'data_daily', None if full or state is None else state[2])
+
+        db.execute('BEGIN TRANSACTION')
+        try:
+            if None in months:
+                mode = 'full'
+                db.execute('DELETE FROM thuong_monthly')
+                db.execute(THUONG_MONTHLY_INSERT.format(month_filter='true'))
+            else:
+                mode = 'incremental'
+                if months:
+                    db.execute('DELETE FROM thuong_monthly WHERE som IN (SELECT unnest($months))', {'months': months})
+                    db.execute(THUONG_MONTHLY_INSERT.format(month_filter=MONTH_FILTER),
+                               {'months': months, 'first_som': min(months), 'last_som': max(months)})
+            max_report_date = db.execute('SELECT max(report_date)::date FROM data_daily').fetchone()[0]
+            _log_refresh(db, 'thuong_monthly', version, max_report_date, last_seq)
+            db.execute('COMMIT')
+        except Exception:
+            db.execute('ROLLBACK')
+            raise
+        return mode
+
+
+def access_rule():
+    '''
+    Dieu kien join user (u) - store (s) theo ACCESS_RULES
+    '''
+    cases = ' '.join(f"WHEN '{name}' THEN {rule}" for name, rule in ACCESS_RULES.items())
+    return f'CASE u.username {cases} ELSE {DEFAULT_ACCESS_RULE} END'
+
+
+def refresh_store_access(db, version, usernames, full=False):
+    '''
+    Build lai bang store_access khi version cua data_daily hoac danh sach user thay doi.
+    Tra ve 'fresh' hoac 'full'.
+    '''
+    usernames = sorted(set(usernames))
+    version = str((version, usernames))
+    with _lock:
+        state = _refresh_state(db, 'store_access')
+        if state is not None and state[0] == version and not full:
+            return 'fresh'
+
+        db.execute('BEGIN TRANSACTION')
+        try:
+            db.execute(STORE_ACCESS_BUILD.format(rule=access_rule()), {'usernames': usernames})
+            _log_refresh(db, 'store_access', version, None)
+            db.execute('COMMIT')
+        except Exception:
+            db.execute('ROLLBACK')
+            raise
+        return 'full'
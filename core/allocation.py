@@ -0,0 +1,64 @@
+'''
+Phan bo chenh lech khoan (> 0) cua moi store-thang cho nhan vien theo gio cong sau he so.
+
+    whr_sau_he_so = whr * he_so
+    whr_ratio = whr_sau_he_so / tong whr_sau_he_so cua store-thang
+    allocated_bonus = whr_ratio * chenh lech khoan cua store-thang
+
+Tat ca store-thang duoc tinh trong 1 lan (np.bincount theo ma nhom, khong groupby().apply).
+So tien phan bo duoc lam tron theo don vi ROUND_UNIT bang phuong phap largest remainder:
+moi nguoi nhan phan nguyen, phan con thieu chia cho nhung nguoi co phan le lon nhat, nen
+tong phan bo cua moi store-thang dung bang tong da lam tron.
+'''
+import numpy as np
+import pandas as pd
+
+# don vi lam tron so tien phan bo (VND)
+ROUND_UNIT = 1
+GROUP_COLUMNS = ['profit_center', 'start_of_month']
+
+
+def largest_remainder(shares, codes, totals):
+    '''
+    Lam tron `shares` (so don vi, so thuc) thanh so nguyen sao cho tong theo nhom `codes`
+    bang `totals` (so nguyen, 1 gia tri / nhom)
+    '''
+    floors = np.floor(shares)
+    remainders = shares - floors
+    deficit = totals - np.bincount(codes, weights=floors, minlength=len(totals)).round().astype(np.int64)
+    # thu tu trong nhom theo phan le giam dan (lexsort on dinh: bang nhau thi giu thu tu dong)
+    order = np.lexsort((-remainders, codes))
+    group_start = np.searchsorted(codes[order], np.arange(len(totals)))
+    rank = np.empty(len(shares), dtype=np.int64)
+    rank[order] = np.arange(len(shares)) - group_start[codes[order]]
+    return floors + (rank < deficit[codes])
+
+
+def allocate(df, amount='var_luongtt', group_columns=None, unit=ROUND_UNIT):
+    '''
+    Them cac cot whr_sau_he_so, whr_ratio va allocated_bonus vao `df` (moi dong 1 nhan vien -
+    store-thang, cot `amount` la so tien can phan bo cua store-thang)
+    '''
+    group_columns = group_columns or GROUP_COLUMNS
+    df = df.copy()
+    codes = df.groupby(group_columns, sort=False, dropna=False).ngroup().to_numpy()
+    n_groups = codes.max(initial=-1) + 1
+    weight = df['whr'].to_numpy(dtype=float) * df['he_so'].to_numpy(dtype=float)
+    weight_total = np.bincount(codes, weights=np.nan_to_num(weight), minlength=n_groups)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = weight / weight_total[codes]
+
+    # so tien cua nhom (giong nhau tren moi dong cua nhom), lam tron theo don vi
+    group_amount = np.full(n_groups, np.nan)
+    group_amount[codes] = df[amount].to_numpy(dtype=float)
+    valid_group = np.isfinite(group_amount) & (weight_total > 0)
+    totals = np.where(valid_group, np.round(np.nan_to_num(group_amount) / unit), 0).astype(np.int64)
+
+    valid = valid_group[codes] & np.isfinite(ratio)
+    shares = np.where(valid, ratio * totals[codes], 0.0)
+    units = largest_remainder(shares, codes, totals)
+
+    df['whr_sau_he_so'] = weight
+    df['whr_ratio'] = ratio
+    df['allocated_bonus'] = np.where(valid, units * unit, np.nan)
+    return df
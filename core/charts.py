@@ -0,0 +1,930 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from . import instrument
+
+# 'vectorized': moi chart chi co so trace co dinh (1 trace line + 1 trace marker moi series)
+# 'per_row': cach ve cu, 4 trace cho moi dong du lieu
+LOLLIPOP_MODE = 'vectorized'
+
+# Violin: tren so dong nay thi tinh KDE / quantile o server va chi gui mau cac diem len browser
+VIOLIN_MAX_POINTS = 5000
+# so diem toi da (khong tinh outlier) cho moi nhom / cho ca chart khi lay mau
+VIOLIN_SAMPLE_PER_GROUP = 300
+VIOLIN_SAMPLE_TOTAL = 3000
+
+# 'heatmap': diem theo tuan ve bang go.Heatmap, moi trang WEEKLY_PAGE_SIZE ung vien
+# 'scatter': cach ve cu, 1 diem + text cho moi ung vien - tuan, chart cao 40px moi ung vien
+WEEKLY_MODE = 'heatmap'
+WEEKLY_PAGE_SIZE = 50
+
+# Scatter gio cong - diem Gstar: tren SCATTER_GL_POINTS diem thi ve bang WebGL (Scattergl) thay vi SVG,
+# tren SCATTER_BIN_POINTS diem thi dem so diem theo o 2 chieu o server va ve heatmap mat do (None: khong bin)
+SCATTER_GL_POINTS = 1000
+SCATTER_BIN_POINTS = 50000
+SCATTER_BINS = (60, 40)
+
+
+def _stem_segments(x, y):
+    '''
+    Noi cac doan thang (x, 0) -> (x, y) thanh 1 mang, ngan cach bang NaN
+    '''
+    n = len(x)
+    xs = np.empty(3 * n, dtype=object)
+    xs[0::3] = x
+    xs[1::3] = x
+    xs[2::3] = None
+    ys = np.empty(3 * n, dtype=float)
+    ys[0::3] = 0
+    ys[1::3] = y
+    ys[2::3] = np.nan
+    return xs, ys
+
+
+def add_lollipop(fig, x, y_khoan, y_actual, x_label='Date', mode=None):
+    '''
+    Ve lollipop cho Luong khoan (orange) va Luong thuc te (blue) tren cung truc x
+    '''
+    mode = mode or LOLLIPOP_MODE
+    # mang object (Timestamp, str ...): datetime64 gan vao mang object cua _stem_segments se thanh so nano giay
+    x = pd.Series(x).astype(object).to_numpy()
+    y_khoan = np.asarray(y_khoan, dtype=float)
+    y_actual = np.asarray(y_actual, dtype=float)
+
+    if mode == 'per_row':
+        for idx in range(len(x)):
+            for y in (y_khoan[idx], y_actual[idx]):
+                fig.add_trace(go.Scatter(
+                    x=[x[idx], x[idx]],
+                    y=[0, y],
+                    mode='lines',
+                    line=dict(color='grey', width=0.5),
+                    showlegend=False
+                ))
+            fig.add_trace(go.Scatter(
+                x=[x[idx]],
+                y=[y_actual[idx]],
+                mode='markers',
+                marker=dict(color='blue', size=10),
+                hovertemplate=(
+                    f"{x_label}: %{{x}}<br>"
+                    "Actual: %{y:,.0f}<br>"
+                ),
+                name='Actual' if idx == 0 else None
+            ))
+            fig.add_trace(go.Scatter(
+                x=[x[idx]],
+                y=[y_khoan[idx]],
+                mode='markers',
+                marker=dict(color='orange', size=10),
+                hovertemplate=(
+                    f"{x_label}: %{{x}}<br>"
+                    "Khoán: %{y:,.0f}<br>"
+                ),
+                name='Khoán' if idx == 0 else None
+            ))
+        return fig
+
+    # Tat ca cac thanh (stem) cua ca 2 series nam trong 1 trace, ngan cach bang NaN
+    xs_khoan, ys_khoan = _stem_segments(x, y_khoan)
+    xs_actual, ys_actual = _stem_segments(x, y_actual)
+    fig.add_trace(go.Scatter(
+        x=np.concatenate([xs_khoan, xs_actual]),
+        y=np.concatenate([ys_khoan, ys_actual]),
+        mode='lines',
+        line=dict(color='grey', width=0.5),
+        connectgaps=False,
+        hoverinfo='skip',
+        showlegend=False
+    ))
+    # Point for 'total_luongtt_act'
+    fig.add_trace(go.Scatter(
+        x=x,
+        y=y_actual,
+        mode='markers',
+        marker=dict(color='blue', size=10),
+        hovertemplate=(
+            f"{x_label}: %{{x}}<br>"
+            "Actual: %{y:,.0f}<br>"
+        ),
+        name='Actual'
+    ))
+    # Point for 'luong_tt_daily'
+    fig.add_trace(go.Scatter(
+        x=x,
+        y=y_khoan,
+        mode='markers',
+        marker=dict(color='orange', size=10),
+        hovertemplate=(
+            f"{x_label}: %{{x}}<br>"
+            "Khoán: %{y:,.0f}<br>"
+        ),
+        name='Khoán'
+    ))
+    return fig
+
+
+@instrument.timed
+def chart_luong_tt(data_daily, mode=None):
+    '''
+    Chat the hien chenh lech giua Luong TT thuc te voi Luong khoan tinh theo daily TC
+    '''
+    # Define colors for 'chenh_lech_luong_khoan'
+    colors = np.where(data_daily['total_luongtt_act'] == 0, '#A9A9A9',
+                      np.where(data_daily['chenh_lech_luong_khoan'] <= 0, '#F90202', '#87FE1A'))
+    # Create a stacked bar chart using Plotly
+    fig = go.Figure()
+
+    # Lollipop chart for 'luong_tt_daily' and 'total_luongtt_act'
+    add_lollipop(fig, data_daily['report_date'], data_daily['luong_tt_daily'], data_daily['total_luongtt_act'],
+                 x_label='Date', mode=mode)
+
+    fig.add_trace(go.Bar(
+        x=data_daily['report_date'],
+        y=data_daily['abs_chenh_lech'],
+        name='Chenh Lech',
+        marker_color=colors,
+        opacity=0.8,
+        base=data_daily['min_luong'],  # Stack on top of 'min_luong'
+        text=data_daily['chenh_lech_luong_khoan']/1e6,  # Add data labels for 'abs_chenh_lech'
+        texttemplate='%{text:,.2f}M',  # Format with comma as thousand separator and no decimals
+        textposition='outside',
+        hovertemplate=(
+            "Date: %{x}<br>"
+            "Actual: %{customdata[0]:,.0f}<br>"
+            "Khoán: %{customdata[1]:,.0f}<br>"
+            "Chênh lệch: %{customdata[2]:,.0f}<extra></extra>"
+        ),
+        customdata=data_daily[['total_luongtt_act', 'luong_tt_daily', 'chenh_lech_luong_khoan']]
+    ))
+
+    # Update layout
+    fig.update_layout(
+        title='Chênh lệch Khoán - Thực tế hàng ngày',
+        barmode='stack',
+        showlegend=False,
+        yaxis=dict(showgrid=False),  # Hide vertical grid lines
+    )
+    return fig
+
+
+@instrument.timed
+def chart_luong_tt_bystore(data_daily, mode=None):
+    '''
+    Chat the hien chenh lech giua Luong TT thuc te voi Luong khoan tinh theo daily TC - tong hop theo store
+    '''
+    data_daily = data_daily.groupby(['profit_center', 'store_vt'], as_index=False).agg({
+        "luong_tt_daily_avg_mtd": "sum",
+        "total_luongtt_act": "sum",
+        "tc": "sum",
+        "tc_forecast": "sum",
+    })
+    data_daily['chenh_lech_luong_khoan'] = data_daily['luong_tt_daily_avg_mtd'] - data_daily['total_luongtt_act']
+    data_daily['min_luong'] = data_daily[['luong_tt_daily_avg_mtd', 'total_luongtt_act']].min(axis=1)
+    data_daily['abs_chenh_lech'] = data_daily['chenh_lech_luong_khoan'].abs()
+
+    # Define colors for 'chenh_lech_luong_khoan'
+    colors = np.where(data_daily['chenh_lech_luong_khoan'] > 0, '#87FE1A', '#F90202')
+
+    # Create a stacked bar chart using Plotly
+    fig = go.Figure()
+
+    # Lollipop chart for 'luong_tt_daily_avg_mtd' and 'total_luongtt_act'
+    add_lollipop(fig, data_daily['store_vt'], data_daily['luong_tt_daily_avg_mtd'], data_daily['total_luongtt_act'],
+                 x_label='Store', mode=mode)
+
+    fig.add_trace(go.Bar(
+        x=data_daily['store_vt'],
+        y=data_daily['abs_chenh_lech'],
+        name='Chenh Lech',
+        marker_color=colors,
+        opacity=0.8,
+        base=data_daily['min_luong'],  # Stack on top of 'min_luong'
+        text=data_daily['chenh_lech_luong_khoan']/1e6,  # Add data labels for 'abs_chenh_lech'
+        texttemplate='%{text:,.2f}M',  # Format with comma as thousand separator and no decimals
+        textposition='outside',
+        hovertemplate=(
+            "Store: %{x}<br>"
+            "Actual: %{customdata[0]:,.0f}<br>"
+            "Khoán: %{customdata[1]:,.0f}<br>"
+            "Chênh lệch: %{customdata[2]:,.0f}<br>"
+            "TC Actual: %{customdata[3]:,.0f}<br>"
+            "TC RFC: %{customdata[4]:,.0f}<br>"
+        ),
+        customdata=data_daily[['total_luongtt_act', 'luong_tt_daily_avg_mtd', 'chenh_lech_luong_khoan', 'tc', 'tc_forecast']]
+    ))
+
+    # Update layout
+    fig.update_layout(
+        title='Chênh lệch Khoán - Thực tế theo Store',
+        barmode='stack',
+        showlegend=False,
+        yaxis=dict(showgrid=False),  # Hide vertical grid lines
+    )
+    return fig
+
+
+@instrument.timed
+def chart_luong_tt_bystore_chot_thang(data_chot_khoan_thang, mode=None):
+    '''
+    Chat the hien chenh lech giua Luong TT thuc te voi Luong khoan chot thang theo store
+    '''
+    data_chot_khoan_thang = data_chot_khoan_thang.sort_values(by='profit_center')
+
+    data_chot_khoan_thang.rename(columns={'luong_khoan_allocated':'luong_tt_daily',
+                                            'pnl_luong_tt_allocated':'total_luongtt_act',
+                                            },
+                                            inplace=True,
+                                            )
+    data_chot_khoan_thang['chenh_lech_luong_khoan'] = data_chot_khoan_thang['luong_tt_daily'] - data_chot_khoan_thang['total_luongtt_act']
+    data_chot_khoan_thang['min_luong'] = data_chot_khoan_thang[['luong_tt_daily', 'total_luongtt_act']].min(axis=1)
+    data_chot_khoan_thang['abs_chenh_lech'] = data_chot_khoan_thang['chenh_lech_luong_khoan'].abs()
+
+    # Define colors for 'chenh_lech_luong_khoan'
+    colors = np.where(data_chot_khoan_thang['chenh_lech_luong_khoan'] > 0, '#87FE1A', '#F90202')
+
+    # Create a stacked bar chart using Plotly
+    fig = go.Figure()
+
+    # Lollipop chart for 'luong_tt_daily' and 'total_luongtt_act'
+    add_lollipop(fig, data_chot_khoan_thang['store_vt'], data_chot_khoan_thang['luong_tt_daily'],
+                 data_chot_khoan_thang['total_luongtt_act'], x_label='Store', mode=mode)
+
+    fig.add_trace(go.Bar(
+        x=data_chot_khoan_thang['store_vt'],
+        y=data_chot_khoan_thang['abs_chenh_lech'],
+        name='Chenh Lech',
+        marker_color=colors,
+        opacity=0.8,
+        base=data_chot_khoan_thang['min_luong'],  # Stack on top of 'min_luong'
+        text=data_chot_khoan_thang['chenh_lech_luong_khoan']/1e6,  # Add data labels for 'abs_chenh_lech'
+        texttemplate='%{text:,.2f}M',  # Format with comma as thousand separator and no decimals
+        textposition='outside',
+        hovertemplate=(
+            "Store: %{x}<br>"
+            "Actual: %{customdata[0]:,.0f}<br>"
+            "Khoán: %{customdata[1]:,.0f}<br>"
+            "Chênh lệch: %{customdata[2]:,.0f}<br>"
+        ),
+        customdata=data_chot_khoan_thang[['total_luongtt_act', 'luong_tt_daily', 'chenh_lech_luong_khoan']]
+    ))
+
+    # Update layout
+    fig.update_layout(
+        title='Chênh lệch Khoán - Thực tế theo Store',
+        barmode='stack',
+        showlegend=False,
+        yaxis=dict(showgrid=False),  # Hide vertical grid lines
+    )
+    return fig
+
+
+def _kde(values, grid_size=64):
+    '''
+    KDE gaussian (bandwidth Scott) tinh tren histogram min roi convolve, O(n) theo so diem
+    '''
+    lo, hi = values.min(), values.max()
+    std = values.std()
+    bw = 1.06 * std * len(values) ** (-1 / 5) if std > 0 else max(abs(lo), 1.0) * 0.05
+    lo, hi = lo - 2 * bw, hi + 2 * bw
+    counts, edges = np.histogram(values, bins=grid_size, range=(lo, hi))
+    step = edges[1] - edges[0]
+    # 1 diem / gia tri khong doi: bw lon so voi khoang gia tri, kernel dai hon grid thi convolve
+    # tra ve mang dai hon grid -> gioi han do rong kernel trong grid
+    half = min(int(np.ceil(3 * bw / step)), (grid_size - 1) // 2)
+    offsets = np.arange(-half, half + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bw) ** 2)
+    density = np.convolve(counts, kernel, mode='same')
+    return (edges[:-1] + edges[1:]) / 2, density
+
+
+def violin_summary(values):
+    '''
+    Thong ke cho 1 nhom: quantile, fence 1.5*IQR, mean va duong KDE
+    '''
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    grid, density = _kde(values)
+    return {
+        'q1': q1, 'median': median, 'q3': q3, 'mean': values.mean(),
+        'lowerfence': inside.min(), 'upperfence': inside.max(),
+        'grid': grid, 'density': density,
+    }
+
+
+def sample_points(codes, values, summaries, cap=None, seed=0):
+    '''
+    Lay mau phan tang theo nhom (codes = so thu tu nhom cua tung dong): giu toan bo outlier,
+    cac diem con lai toi da `cap` diem moi nhom. Tra ve vi tri cac dong duoc chon.
+    '''
+    cap = cap or max(10, min(VIOLIN_SAMPLE_PER_GROUP, VIOLIN_SAMPLE_TOTAL // max(len(summaries), 1)))
+    lower = np.array([s['lowerfence'] for s in summaries])[codes]
+    upper = np.array([s['upperfence'] for s in summaries])[codes]
+    outlier = (values < lower) | (values > upper)
+    rng = np.random.default_rng(seed)
+    rest = rng.permutation(np.flatnonzero(~outlier))
+    # thu tu cua tung dong trong nhom sau khi xao tron
+    order = pd.Series(codes[rest]).groupby(codes[rest]).cumcount().to_numpy()
+    return np.concatenate([np.flatnonzero(outlier), rest[order < cap]])
+
+
+def summary_violin(df, x, y, hover_data, category_order=None, title=None, cap=None):
+    '''
+    Violin ve tu thong ke tinh san (KDE, quantile) thay vi gui tat ca cac diem len browser:
+    1 trace hinh violin, 1 trace box (q1/median/q3/fence) va 1 trace diem da lay mau
+    '''
+    df = df[df[y].notna()]
+    groups = pd.Categorical(df[x], categories=category_order) if category_order else pd.Categorical(df[x])
+    groups = groups.remove_unused_categories()
+    categories = list(groups.categories)
+    codes = groups.codes
+    df, codes = df[codes >= 0], codes[codes >= 0]
+    values = df[y].to_numpy(dtype=float)
+    # sap xep theo nhom 1 lan roi cat theo bien, thay vi loc lai ca mang cho tung nhom
+    sort = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[sort], np.arange(len(categories) + 1))
+    summaries = [violin_summary(values[sort[bounds[i]:bounds[i + 1]]]) for i in range(len(categories))]
+    palette = np.array(px.colors.qualitative.Plotly)
+
+    # hinh violin cua tat ca cac nhom trong 1 trace, ngan cach bang NaN
+    vx, vy = [], []
+    for pos, s in enumerate(summaries):
+        half_width = 0.4 * s['density'] / s['density'].max()
+        vx.append(np.concatenate([pos - half_width, pos + half_width[::-1], [np.nan]]))
+        vy.append(np.concatenate([s['grid'], s['grid'][::-1], [np.nan]]))
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=np.concatenate(vx).round(3), y=np.concatenate(vy).round(),
+        mode='lines',
+        fill='toself',
+        fillcolor='rgba(99, 110, 250, 0.25)',
+        line=dict(color='rgba(99, 110, 250, 0.8)', width=1),
+        hoverinfo='skip',
+    ))
+    fig.add_trace(go.Box(
+        x=np.arange(len(categories)),
+        q1=[s['q1'] for s in summaries],
+        median=[s['median'] for s in summaries],
+        q3=[s['q3'] for s in summaries],
+        lowerfence=[s['lowerfence'] for s in summaries],
+        upperfence=[s['upperfence'] for s in summaries],
+        mean=[s['mean'] for s in summaries],
+        width=0.12,
+        fillcolor='rgba(255, 255, 255, 0.6)',
+        line=dict(color='black', width=1),
+        name=y,
+    ))
+
+    rows = sample_points(codes, values, summaries, cap=cap)
+    points = df.iloc[rows]
+    hovertemplate = '<br>'.join(
+        f'{col}=%{{customdata[{i}]}}' if fmt is True else f'{col}=%{{customdata[{i}]{fmt}}}'
+        for i, (col, fmt) in enumerate(hover_data.items())
+    ) + '<extra></extra>'
+    jitter = np.random.default_rng(1).uniform(-0.3, 0.3, len(rows))
+    fig.add_trace(go.Scatter(
+        x=(codes[rows] + jitter).round(3),
+        y=values[rows],
+        mode='markers',
+        marker=dict(color=palette[codes[rows] % len(palette)], size=4, opacity=0.7),
+        customdata=points[list(hover_data)],
+        hovertemplate=hovertemplate,
+    ))
+
+    fig.update_layout(
+        title=title,
+        showlegend=False,
+        xaxis=dict(tickmode='array', tickvals=list(range(len(categories))), ticktext=categories, title=x),
+        yaxis=dict(title=y),
+    )
+    fig.add_annotation(
+        text=f'{len(rows):,}/{len(df):,} điểm (mẫu)',
+        xref='paper', yref='paper', x=1, y=1.05, showarrow=False, font=dict(size=10),
+    )
+    return fig
+
+
+@instrument.timed
+def chart_dayofweek(box_data, max_points=None):
+    '''
+    Violin chenh lech khoan - thuc te theo ngay trong tuan
+    '''
+    day_order = [ '1.Sun', '2.Mon', '3.Tue', '4.Wed', '5.Thu', '6.Fri', '7.Sat',]
+    hover_data = {
+        'Date': True,
+        'Store':True, 
+        'profit_center': True,
+        'Chênh lệch': ':,.0f',  # Format with comma and one decimal place
+        'Lương thực tế': ':,.0f', 
+        'Lương khoán theo TC từng ngày': ':,.0f', 
+        'TC forecast':':,.0f', 
+        'TC Actual':':,.0f', 
+    }
+    title = 'Chênh lệch Khoán - Thực tế hàng ngày theo ngày trong tuần'
+    box_data = box_data[box_data['TC Actual']>0]
+    if len(box_data) > (max_points or VIOLIN_MAX_POINTS):
+        return summary_violin(box_data, x='Ngày trong tuần', y='Chênh lệch', hover_data=hover_data,
+                              category_order=day_order, title=title)
+
+    fig1 = px.violin(box_data, 
+                    y='Chênh lệch', 
+                    x='Ngày trong tuần', 
+                    points='all', box=True,
+                    color='Ngày trong tuần',
+                    hover_data=hover_data,
+                    category_orders={'Ngày trong tuần': day_order},  # Specify order for 'Ngày trong tuần'
+                    )
+    # Update layout for better visualization (optional)
+    fig1.update_traces(marker=dict(opacity=0.7),
+                    meanline_visible=True,
+                    )  # Adjust marker opacity if needed
+    fig1.update_layout(
+        title=title,
+        showlegend=False
+    )
+    return fig1
+
+
+@instrument.timed
+def chart_store(box_data, max_points=None):
+    '''
+    Violin chenh lech khoan - thuc te theo tung nha hang
+    '''
+    hover_data = {
+        'Date': True,
+        'Ngày trong tuần': True,
+        'Store':True, 
+        'profit_center': True,
+        'Chênh lệch': ':,.0f',  # Format with comma and one decimal place
+        'Lương thực tế': ':,.0f', 
+        'Lương khoán theo TC từng ngày': ':,.0f', 
+        'TC forecast':':,.0f', 
+        'TC Actual':':,.0f', 
+    }
+    title = 'Chênh lệch Khoán - Thực tế hàng ngày theo từng nhà'
+    box_data = box_data[box_data['TC Actual']>0]
+    if len(box_data) > (max_points or VIOLIN_MAX_POINTS):
+        return summary_violin(box_data, x='Store', y='Chênh lệch', hover_data=hover_data, title=title)
+
+    fig2 = px.violin(box_data, y='Chênh lệch', x='Store', 
+                    points='all', box=True,
+                    color='Store',
+                    hover_data=hover_data,
+                    )
+    # Update layout for better visualization (optional)
+    fig2.update_traces(marker=dict(opacity=0.7),
+                    meanline_visible=True,
+                    )  # Adjust marker opacity if needed
+    fig2.update_layout(
+        title=title,
+        showlegend=False
+    )
+    return fig2
+
+
+@instrument.timed
+def chart_tc(data_daily):
+    '''
+    Ve chart cho TC actual vs TC forecast
+    '''
+    # Create a bar chart for 'tc_forecast' and 'tc'
+    fig = go.Figure()
+
+    # Add 'tc_forecast' as a bar
+    fig.add_trace(go.Bar(
+        x=data_daily['report_date'],
+        y=data_daily['tc_forecast'],
+        name='TC Forecast',
+        marker_color='blue',
+        text=data_daily['tc_forecast'],  # Add data labels for 'abs_chenh_lech'
+        texttemplate='%{text:,.0f}',  # Format with comma as thousand separator and no decimals
+        textposition='outside',
+    ))
+
+    # Add 'tc' as a bar
+    fig.add_trace(go.Bar(
+        x=data_daily['report_date'],
+        y=data_daily['tc'],
+        name='TC Actual',
+        marker_color='orange',
+        text=data_daily['tc'],  # Add data labels for 'abs_chenh_lech'
+        texttemplate='%{text:,.0f}',  # Format with comma as thousand separator and no decimals
+        textposition='outside',
+    ))
+
+    # Update layout
+    fig.update_layout(
+        title='TC Forecast and TC Actual',
+        # xaxis_title='Report Date',
+        # yaxis_title='Values',
+        barmode='group',  # Display bars side by side
+        showlegend=True,
+        legend=dict(
+            orientation='h',  
+            x=0,  # Position legend at the left
+            y=1.15,  # Position legend at the top
+            xanchor='left',
+            yanchor='top'
+        ),
+        yaxis=dict(showgrid=False, visible=False),  # Hide vertical grid lines
+    )
+
+    return fig
+
+
+@instrument.timed
+def chart_whr(data_daily):
+    # Create the figure
+    fig = go.Figure()
+
+    # Add line for 'baseline_rfc'
+    fig.add_trace(go.Scatter(
+        x=data_daily['report_date'],
+        y=data_daily['baseline_rfc'],
+        mode='lines',
+        name='Baseline TC RFC',
+        line_shape='hvh',
+        line=dict(color='red', width=2)
+    ))
+    
+    # Add line for 'baseline_rfc'
+    fig.add_trace(go.Scatter(
+        x=data_daily['report_date'],
+        y=data_daily['baseline_act'],
+        mode='lines',
+        name='Baseline TC Act',
+        line_shape='hvh',
+        line=dict(color='blue', width=2)
+    ))
+
+    # Add stacked bar for 'whr_act'
+    fig.add_trace(go.Bar(
+        x=data_daily['report_date'],
+        y=data_daily['whr_act'],
+        name='WHR GGG',
+        marker_color='#C3DDEA'
+    ))
+
+    # Add stacked bar for 'whr_gstar'
+    fig.add_trace(go.Bar(
+        x=data_daily['report_date'],
+        y=data_daily['whr_gstar'],
+        name='WHR Gstar',
+        marker_color='orange',
+        # hovertemplate=(
+        #     "Report Date: %{x}<br>"
+        #     "Gstar: %{y}<br>"
+        #     "Gstar/Baseline RFC: %{customdata[0]:.2f}%<br>"
+        #     "Gstar/Act: %{customdata[1]:.2f}%<br>"
+        # ),
+        # customdata=data_daily[['pct_whr_gstar_to_baseline', 'pct_whr_gstar_to_total_whr']]
+    ))
+
+    # Update layout for the stacked bar and line combination
+    fig.update_layout(
+        title='Giờ công',
+        # xaxis_title='Report Date',
+        # yaxis_title='Values',
+        legend=dict(
+                orientation='h',  
+                x=0,  # Position legend at the left
+                y=1.05,  # Position legend at the top
+                xanchor='left',
+                yanchor='bottom'
+            ),
+        barmode='stack',  # Stacking bars for 'whr_act' and 'whr_gstar'
+        hovermode='x unified',  # Unified x-axis hover
+        showlegend=True
+    )
+    return fig 
+
+
+def _render_mode(n_points, gl_points=None):
+    return 'webgl' if n_points > (SCATTER_GL_POINTS if gl_points is None else gl_points) else 'svg'
+
+
+def _binned(n_points, bin_points=None):
+    bin_points = SCATTER_BIN_POINTS if bin_points is None else bin_points
+    return bool(bin_points) and n_points > bin_points
+
+
+def _bin_edges(values, n_bins):
+    '''
+    Bien cac o: diem nguyen it gia tri (vd diem danh gia 1-5) thi moi gia tri 1 o; khong co gia tri thi khong co o
+    '''
+    if values.size == 0:
+        return np.array([], dtype=float)
+    levels = np.unique(values)
+    if len(levels) <= n_bins and np.array_equal(levels, np.round(levels)):
+        return np.arange(levels[0] - 0.5, levels[-1] + 1.5)
+    return np.histogram_bin_edges(values, bins=n_bins)
+
+
+@instrument.timed
+def chart_score_density(df, x, y, color, title=None, bins=None):
+    '''
+    Heatmap mat do thay cho scatter rat nhieu diem: dem so diem moi o (x, y) bang np.histogram2d
+    o server, mau theo log10(so diem), hover ghi so diem cua tung nhom `color` trong o
+    '''
+    df = df[df[x].notna() & df[y].notna()]
+    xs, ys = df[x].to_numpy(dtype=float), df[y].to_numpy(dtype=float)
+    x_bins, y_bins = bins or SCATTER_BINS
+    x_edges, y_edges = _bin_edges(xs, x_bins), _bin_edges(ys, y_bins)
+    if not x_edges.size or not y_edges.size:
+        # bo loc khong con diem nao: chart trong, khong ve trace
+        fig = go.Figure()
+        fig.update_layout(title=title, xaxis_title=x, yaxis_title=y)
+        return fig
+    groups = pd.Categorical(df[color])
+    # so diem: nhom x o y x o x
+    counts = np.stack([
+        np.histogram2d(xs[groups.codes == i], ys[groups.codes == i], bins=[x_edges, y_edges])[0]
+        for i in range(len(groups.categories))
+    ])
+    total = counts.sum(axis=0).T
+    z = np.where(total > 0, np.log10(np.maximum(total, 1)), np.nan)
+    ticks = np.arange(0, int(np.nanmax(z, initial=0)) + 1)
+    hover = '<br>'.join(f'{name}: %{{customdata[{i}]:,.0f}}' for i, name in enumerate(groups.categories))
+    fig = go.Figure(go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        z=z,
+        customdata=np.moveaxis(counts, 0, -1).transpose(1, 0, 2),
+        colorscale='Viridis',
+        colorbar=dict(title='Số điểm', tickvals=ticks, ticktext=[f'{10 ** t:,}' for t in ticks]),
+        hovertemplate=f'{x}: %{{x:.1f}}<br>{y}: %{{y:.1f}}<br>{hover}<extra></extra>',
+        hoverongaps=False,
+    ))
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=y)
+    return fig
+
+
+@instrument.timed
+def char_gio_cong_avg_score(gstar_avg_ungvien, gl_points=None, bin_points=None):
+    if _binned(len(gstar_avg_ungvien), bin_points):
+        return chart_score_density(gstar_avg_ungvien, 'gio_cong_thuc_te', 'avg_score', 'doi_tuong',
+                                   title='Giờ công thực tế - Điểm trung bình')
+
+    # Define custom colors for each 'doi_tuong' category
+    color_map = {
+        "GGG": "blue",   # Replace 'Category1' with the actual value in 'doi_tuong'
+        "Freelancer": "orange",  # Replace 'Category2' with the actual value in 'doi_tuong'
+        # Add more mappings as needed
+    }
+
+    fig = px.scatter(gstar_avg_ungvien, 
+                        y='avg_score', 
+                        x='gio_cong_thuc_te',
+                        color='doi_tuong',
+                        title='Giờ công thực tế - Điểm trung bình',
+                        render_mode=_render_mode(len(gstar_avg_ungvien), gl_points),
+                        hover_data={
+                            "ma_ung_vien":True,
+                            "ten_ung_vien":True,
+                            "doi_tuong":True,
+                        },
+                        color_discrete_map=color_map,
+                        opacity=0.7  # Adjust the opacity level here
+                        )
+    
+    return fig
+
+
+@instrument.timed
+def chart_violin_avgscore(gstar_avg_ungvien):
+
+    # Define custom colors for each 'doi_tuong' category
+    color_map = {
+        "GGG": "blue",   # Replace 'Category1' with the actual value in 'doi_tuong'
+        "Freelancer": "orange",  # Replace 'Category2' with the actual value in 'doi_tuong'
+        # Add more mappings as needed
+    }
+
+    fig = px.violin(gstar_avg_ungvien,
+                    y='avg_score',
+                    points='all', 
+                    box=True,
+                    color='doi_tuong',
+                    hover_data={
+                        'ma_ung_vien':True,
+                        'doi_tuong':True,
+                        'ten_ung_vien':True,
+                    },
+                    color_discrete_map=color_map
+                )
+    # Update layout for better visualization (optional)
+    fig.update_traces(marker=dict(opacity=0.7),
+                    meanline_visible=True,
+                    )  # Adjust marker opacity if needed
+    fig.update_layout(
+        title='Phân bố điểm trung bình',
+        # showlegend=False
+    )
+    return fig
+
+
+def _weekly_scatter(gstar_avg_ungvien_weekly):
+    '''
+    Cach ve cu: 1 diem co text cho moi ung vien - tuan, cao 40px moi ung vien
+    '''
+    # Fill NaN values in 'avg_score' with a default value (e.g., 0)
+    # gstar_avg_ungvien_weekly['avg_score'] = gstar_avg_ungvien_weekly['avg_score'].fillna(0)
+    # Get unique 'yw' values
+    unique_yw = gstar_avg_ungvien_weekly['yw'].unique()
+
+    # Create a DataFrame with dummy data for each unique 'yw'
+    dummy_data = pd.DataFrame({
+        'yw': unique_yw,
+        'ma_ung_vien': '',           # Empty string for ma_ung_vien
+        'doi_tuong': '',             # Empty string for doi_tuong
+        'ten_ung_vien': '',          # Empty string for ten_ung_vien
+        'avg_score': 0               # avg_score set to 0
+    })
+
+    # Concatenate the dummy data to the original DataFrame
+    gstar_avg_ungvien_weekly_with_dummy = pd.concat([gstar_avg_ungvien_weekly, dummy_data], ignore_index=True)
+
+    # Create a combined label for the y-axis
+    gstar_avg_ungvien_weekly_with_dummy['combined_label'] = (
+        gstar_avg_ungvien_weekly_with_dummy['ma_ung_vien'].astype(str) + ' - ' +
+        gstar_avg_ungvien_weekly_with_dummy['ten_ung_vien']
+    )
+
+    # Format avg_score to one decimal place for display as text
+    gstar_avg_ungvien_weekly_with_dummy['avg_score_text'] = gstar_avg_ungvien_weekly_with_dummy['avg_score'].map(lambda x: f"{x:.1f}")
+
+
+
+    fig = px.scatter(
+        gstar_avg_ungvien_weekly_with_dummy,
+        x='yw',
+        y='combined_label',
+        size='avg_score',          # Dot size represents avg_score
+        color='avg_score',          # Color scale based on avg_score
+        color_continuous_scale='Viridis',  # Choose a color scale, e.g., Viridis
+        title="Weekly Average Score Scatter Plot with Color Scale for avg_score",
+        labels={'yw': 'Week', 'combined_label': 'Candidate Info'},
+        hover_data={'ma_ung_vien': True, 'doi_tuong': True, 'ten_ung_vien': True, 'avg_score': True},
+        text='avg_score_text'
+    )
+
+    # Update layout for better visualization
+    fig.update_layout(
+        title="Weekly Average Score",
+        # xaxis_title="Week (yw)",
+        # yaxis_title="Candidate Info (ma_ung_vien - doi_tuong - ten_ung_vien)",
+        height=max(400,40*gstar_avg_ungvien_weekly['ma_ung_vien'].nunique()),  # Adjust height for better readability
+        # annotations=annotations
+    )
+    return fig
+
+
+@instrument.timed
+def weekly_pivot(gstar_avg_ungvien_weekly):
+    '''
+    Pivot bang diem theo ung vien - tuan thanh ma tran (NumPy): nhan ung vien, cac tuan (sort),
+    avg_score va gio cong (ung vien x tuan, NaN khi tuan do khong co) va tong gio cong moi ung vien
+    '''
+    weekly = gstar_avg_ungvien_weekly
+    labels = (weekly['ma_ung_vien'].astype(str) + ' - ' + weekly['ten_ung_vien'].astype(str)
+              + ' (' + weekly['doi_tuong'].astype(str) + ')')
+    rows, labels = pd.factorize(labels)
+    cols, weeks = pd.factorize(weekly['yw'], sort=True)
+    score = np.full((len(labels), len(weeks)), np.nan)
+    score[rows, cols] = weekly['avg_score'].to_numpy(dtype=float, na_value=np.nan)
+    hours = np.full((len(labels), len(weeks)), np.nan)
+    hours[rows, cols] = weekly['gio_cong_thuc_te'].to_numpy(dtype=float, na_value=np.nan)
+    return {
+        'labels': np.asarray(labels, dtype=object), 'weeks': np.asarray(weeks, dtype=object),
+        'score': score, 'hours': hours, 'total_hours': np.nansum(hours, axis=1),
+        'search_keys': _search_key(pd.Series(labels, dtype=object)).to_numpy(),
+    }
+
+
+def _search_key(values):
+    # chu thuong, bo dau tieng Viet: 'Nguyễn Văn Đức' -> 'nguyen van duc'
+    values = values.str.lower().str.replace('đ', 'd', regex=False).str.normalize('NFD')
+    return values.str.replace(r'[\u0300-\u036f]', '', regex=True)
+
+
+def candidate_order(pivot, search=None):
+    '''
+    Vi tri cac ung vien (dong cua pivot) theo tong gio cong giam dan, chi lay ung vien co ma / ten
+    chua `search` (khong phan biet hoa thuong, co dau hay khong dau)
+    '''
+    order = np.argsort(-pivot['total_hours'], kind='stable')
+    if search:
+        key = _search_key(pd.Series([search])).iloc[0]
+        match = pd.Series(pivot['search_keys']).str.contains(key, regex=False).to_numpy()
+        order = order[match[order]]
+    return order
+
+
+@instrument.timed
+def chart_weekly_heatmap(pivot, rows):
+    '''
+    Heatmap diem trung binh theo tuan cua cac ung vien `rows` (1 trace, kich thuoc theo so dong duoc chon)
+    '''
+    fig = go.Figure(go.Heatmap(
+        z=pivot['score'][rows],
+        x=pivot['weeks'],
+        y=pivot['labels'][rows],
+        customdata=pivot['hours'][rows],
+        colorscale='Viridis',
+        texttemplate='%{z:.1f}',
+        hovertemplate='%{y}<br>Tuần %{x}<br>Điểm TB: %{z:.1f}<br>Giờ công: %{customdata:,.1f}<extra></extra>',
+        hoverongaps=False,
+        xgap=1,
+        ygap=1,
+        colorbar=dict(title='avg_score'),
+    ))
+    fig.update_layout(
+        title="Weekly Average Score",
+        height=max(400, 24 * len(rows) + 150),
+        xaxis=dict(type='category', title='Week'),
+        # ung vien nhieu gio cong nhat o tren cung
+        yaxis=dict(type='category', autorange='reversed'),
+    )
+    return fig
+
+
+@instrument.timed
+def chart_weekly_gstar_score(gstar_avg_ungvien_weekly, search=None, page=0, page_size=None, mode=None):
+    '''
+    Diem trung binh theo tuan: heatmap 1 trang `page_size` ung vien (sap theo tong gio cong, loc theo
+    `search`), nen kich thuoc figure khong phu thuoc so ung vien; mode 'scatter' la cach ve cu
+    '''
+    if (mode or WEEKLY_MODE) == 'scatter':
+        return _weekly_scatter(gstar_avg_ungvien_weekly)
+    page_size = page_size or WEEKLY_PAGE_SIZE
+    pivot = weekly_pivot(gstar_avg_ungvien_weekly)
+    order = candidate_order(pivot, search)
+    return chart_weekly_heatmap(pivot, order[page * page_size:(page + 1) * page_size])
+
+
+@instrument.timed
+def char_gio_cong_daily_score(data_gstar, gl_points=None, bin_points=None):
+    if _binned(len(data_gstar), bin_points):
+        return chart_score_density(data_gstar, 'gio_cong_thuc_te', 'diem_danh_gia', 'doi_tuong',
+                                   title='Giờ công thực tế - Điểm đánh giá')
+
+    # Define custom colors for each 'doi_tuong' category
+    color_map = {
+        "GGG": "blue",   # Replace 'Category1' with the actual value in 'doi_tuong'
+        "Freelancer": "orange",  # Replace 'Category2' with the actual value in 'doi_tuong'
+        # Add more mappings as needed
+    }
+
+    fig = px.scatter(data_gstar, 
+                        y='diem_danh_gia', 
+                        x='gio_cong_thuc_te',
+                        color='doi_tuong',
+                        title='Giờ công thực tế - Điểm đánh giá',
+                        render_mode=_render_mode(len(data_gstar), gl_points),
+                        hover_data={
+                            "ma_ung_vien":True,
+                            "ten_ung_vien":True,
+                            "doi_tuong":True,
+                        },
+                        color_discrete_map=color_map,
+                        opacity=0.7  # Adjust the opacity level here
+                        )
+    
+    return fig
+
+
+@instrument.timed
+def chart_violin_dailyscore(data_gstar):
+
+    # Define custom colors for each 'doi_tuong' category
+    color_map = {
+        "GGG": "blue",   # Replace 'Category1' with the actual value in 'doi_tuong'
+        "Freelancer": "orange",  # Replace 'Category2' with the actual value in 'doi_tuong'
+        # Add more mappings as needed
+    }
+
+    fig = px.violin(data_gstar,
+                    y='diem_danh_gia',
+                    points='all', 
+                    box=True,
+                    color='doi_tuong',
+                    hover_data={
+                        'ma_ung_vien':True,
+                        'doi_tuong':True,
+                        'ten_ung_vien':True,
+                    },
+                    color_discrete_map=color_map
+                )
+    # Update layout for better visualization (optional)
+    fig.update_traces(marker=dict(opacity=0.7),
+                    meanline_visible=True,
+                    )  # Adjust marker opacity if needed
+    fig.update_layout(
+        title='Phân bố điểm thực tế',
+        # showlegend=False
+    )
+    return fig
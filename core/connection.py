@@ -0,0 +1,95 @@
+'''
+Pool ket noi DuckDB dung chung cho cac session Streamlit.
+
+Moi session Streamlit chay tren 1 thread rieng, 1 connection DuckDB khong duoc dung dong thoi
+tu nhieu thread. Pool giu san `size` connection (cursor cua cung 1 database), moi query muon
+1 connection roi tra lai, va ghi lai thoi gian phai cho khi pool het connection.
+'''
+import contextlib
+import queue
+import threading
+import time
+
+import duckdb
+
+POOL_SIZE = 4
+
+
+class ConnectionPool:
+    '''
+    Pool co dinh `size` connection toi cung 1 database DuckDB.
+
+    threads / memory_limit: cau hinh DuckDB cho ca database (None = mac dinh cua DuckDB).
+    read_only: mo file database chi doc (nhieu process co the cung mo).
+    init: ham goi 1 lan tren moi connection moi (vd tao temp view).
+    '''
+
+    def __init__(self, database=':memory:', size=POOL_SIZE, threads=None, memory_limit=None, init=None,
+                 read_only=False):
+        config = {}
+        if threads:
+            config['threads'] = int(threads)
+        if memory_limit:
+            config['memory_limit'] = str(memory_limit)
+        self.database = str(database)
+        self.size = size
+        self._root = duckdb.connect(self.database, read_only=read_only, config=config)
+        self._idle = queue.Queue()
+        for _ in range(size):
+            con = self._root.cursor()
+            if init is not None:
+                init(con)
+            self._idle.put(con)
+        self._lock = threading.Lock()
+        self._stats = {'acquired': 0, 'waited': 0, 'total_wait_ms': 0.0, 'max_wait_ms': 0.0, 'waiting': 0, 'in_use': 0}
+
+    @contextlib.contextmanager
+    def connection(self, timeout=None):
+        '''
+        Muon 1 connection trong pool, cho neu tat ca dang duoc dung
+        '''
+        with self._lock:
+            self._stats['waiting'] += 1
+        start = time.perf_counter()
+        try:
+            con = self._idle.get(timeout=timeout)
+        finally:
+            wait_ms = (time.perf_counter() - start) * 1e3
+            with self._lock:
+                self._stats['waiting'] -= 1
+        with self._lock:
+            s = self._stats
+            s['acquired'] += 1
+            s['in_use'] += 1
+            s['total_wait_ms'] += wait_ms
+            s['max_wait_ms'] = max(s['max_wait_ms'], wait_ms)
+            if wait_ms >= 1:
+                s['waited'] += 1
+        try:
+            yield con
+        finally:
+            with self._lock:
+                self._stats['in_use'] -= 1
+            self._idle.put(con)
+
+    def execute(self, query, parameters=None):
+        '''
+        Chay 1 cau lenh khong can lay ket qua (DDL, refresh ...)
+        '''
+        with self.connection() as con:
+            con.execute(query, parameters)
+
+    def stats(self):
+        '''
+        So lan muon connection, so lan phai cho (>= 1ms) va thoi gian cho trung binh / lon nhat
+        '''
+        with self._lock:
+            s = dict(self._stats)
+        s['size'] = self.size
+        s['avg_wait_ms'] = s['total_wait_ms'] / s['acquired'] if s['acquired'] else 0.0
+        return s
+
+    def close(self):
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
+        self._root.close()
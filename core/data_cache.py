@@ -0,0 +1,134 @@
+'''
+Cache cho cac ham lay du lieu (get_*): key gom fingerprint cua cac file parquet nguon,
+nen ket qua duoc giu nguyen khi du lieu khong doi va tu het han khi file parquet moi duoc day len.
+'''
+import functools
+import hashlib
+import os
+import threading
+
+# 'stat': fingerprint theo (mtime, size) cua file
+# 'content': hash noi dung file (bo qua cac lan ghi lai file giong het)
+FINGERPRINT_MODE = 'stat'
+# so ket qua toi da giu cho moi ham get_* (cac to hop user / ngay / store cua cung 1 version du lieu)
+MAX_ENTRIES = 256
+
+_sources = []
+_content_hashes = {}
+_stats = {}
+# version du lieu lan goi gan nhat cua tung ham
+_versions = {}
+_lock = threading.Lock()
+
+
+def watch(*paths):
+    '''
+    Dang ky cac file nguon ma cache phu thuoc vao
+    '''
+    for path in paths:
+        if path not in _sources:
+            _sources.append(path)
+
+
+def _file_hash(path, stat):
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    if key not in _content_hashes:
+        # bo hash cua cac ban cu cua file
+        for old in [k for k in _content_hashes if k[0] == key[0]]:
+            del _content_hashes[old]
+        h = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+        _content_hashes[key] = h.hexdigest()
+    return _content_hashes[key]
+
+
+def parquet_files(path):
+    '''
+    Cac file parquet trong thu muc nguon chia partition (vd data_luongtt/ym=202412/mien=South/*.parquet)
+    '''
+    files = []
+    for root, dirs, names in os.walk(path):
+        # bo qua thu muc tam dang ghi (partitions.write)
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+        files.extend(os.path.join(root, name) for name in sorted(names) if name.endswith('.parquet'))
+    return files
+
+
+def _dir_version(path):
+    h = hashlib.blake2b(digest_size=16)
+    for file in parquet_files(path):
+        h.update(os.path.relpath(file, path).encode())
+        h.update(repr(file_version(file)[1:]).encode())
+    return h.hexdigest()
+
+
+def file_version(path):
+    '''
+    Fingerprint cua 1 file nguon, hoac cua tat ca file parquet neu la thu muc chia partition
+    '''
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return (os.path.basename(path), None)
+    if os.path.isdir(path):
+        return (os.path.basename(path), _dir_version(path))
+    if FINGERPRINT_MODE == 'content':
+        return (os.path.basename(path), _file_hash(path, stat))
+    return (os.path.basename(path), stat.st_mtime_ns, stat.st_size)
+
+
+def data_version():
+    '''
+    Fingerprint cua toan bo file nguon, thay doi khi co file duoc cap nhat
+    '''
+    return tuple(file_version(path) for path in _sources)
+
+
+def _count(name, field):
+    with _lock:
+        counter = _stats.setdefault(name, {'calls': 0, 'misses': 0})
+        counter[field] += 1
+
+
+def cached(func):
+    '''
+    Thay cho @st.cache_data: them data_version() vao key va dem so lan hit/miss.
+    Khi version doi thi xoa het ket qua cua version cu (khong de lai trong bo nho den khi restart).
+    '''
+    # import o day de cac module chi dung file_version (ingest, export) khong phai load Streamlit
+    import streamlit as st
+
+    name = func.__name__
+
+    @st.cache_data(max_entries=MAX_ENTRIES)
+    @functools.wraps(func)
+    def _load(version, *args, **kwargs):
+        _count(name, 'misses')
+        return func(*args, **kwargs)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        _count(name, 'calls')
+        version = data_version()
+        with _lock:
+            stale = _versions.get(name, version) != version
+            _versions[name] = version
+        if stale:
+            _load.clear()
+        return _load(version, *args, **kwargs)
+
+    wrapper.clear = _load.clear
+    return wrapper
+
+
+def cache_stats():
+    '''
+    So lan goi / hit / miss cua tung ham tu khi khoi dong server
+    '''
+    with _lock:
+        return {
+            name: {'calls': c['calls'], 'hits': c['calls'] - c['misses'], 'misses': c['misses']}
+            for name, c in _stats.items()
+        }
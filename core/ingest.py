@@ -0,0 +1,318 @@
+'''
+Nap cac file parquet nguon vao bang trong database DuckDB (file luongkhoan.duckdb).
+
+Moi bang duoc sap xep theo (store, ngay) de zone map cua DuckDB bo qua duoc cac row group
+khong thuoc store / khoang ngay can query. Bang chi duoc nap lai khi file parquet tuong ung
+thay doi (so sanh fingerprint trong data_cache voi lan nap truoc).
+
+Nguon co the la 1 file (data_luongtt.parquet) hoac thu muc chia partition kieu hive cung ten
+(data_luongtt/ym=202412/mien=South/*.parquet, xem partitions.py). Voi thu muc, chi cac partition
+co file thay doi / bi xoa duoc nap lai, cac partition con lai giu nguyen trong bang.
+
+data_daily (1 file, bi ghi lai ca file moi lan cap nhat) duoc nap kieu upsert: chi cac (store, ngay)
+co cob_dt khac voi trong bang hoac khong con trong file duoc ghi lai. Cac thang co du lieu thay
+doi duoc ghi vao ingest_changes de aggregates.py chi tinh lai cac thang do. File nguon doi cot so
+voi bang thi nap lai ca bang.
+'''
+import os
+import threading
+from pathlib import Path
+from urllib.parse import unquote
+
+from . import data_cache
+
+# ten bang: (file parquet, cot sap xep)
+SOURCES = {
+    'data_daily': ('data_luongtt.parquet', ('store_vt', 'report_date')),
+    'tc_tier': ('tier_tc.parquet', ('storevt', 'ym')),
+    'dta_pbo_thuong': ('dta_pbo_thuong.parquet', ('store_vt', 'start_of_month')),
+    'dta_gstar': ('dta_gstar.parquet', ('store_vt', 'ngay_tuyen')),
+    'dta_pbo_thuong_chot_thang': ('pbo_khoan_chot_thang.parquet', ('store_vt', 'start_of_month')),
+    'dta_chot_khoan_thang': ('chot_khoan.parquet', ('store_vt', 'som')),
+}
+
+# Cot partition (theo thu tu thu muc) va kieu du lieu cua tung bang khi nguon la thu muc chia partition.
+# Cot partition cung duoc ghi trong file parquet, hive_types giu dung kieu goc khi doc lai.
+PARTITIONS = {
+    'data_daily': {'ym': 'VARCHAR', 'mien': 'VARCHAR'},
+    'tc_tier': {'ym': 'VARCHAR', 'mien': 'VARCHAR'},
+    'dta_pbo_thuong': {'start_of_month': 'TIMESTAMP_NS', 'mien': 'VARCHAR'},
+    'dta_gstar': {'ym': 'VARCHAR', 'mien': 'VARCHAR'},
+    'dta_pbo_thuong_chot_thang': {'ym': 'VARCHAR'},
+    'dta_chot_khoan_thang': {'ym': 'VARCHAR', 'mien': 'VARCHAR'},
+}
+
+# Bang nap kieu upsert tu file nguon 1 file: (cot khoa, cot thoi diem cap nhat, cot ngay de tinh thang)
+UPSERTS = {
+    'data_daily': (('store_vt', 'report_date'), 'cob_dt', 'report_date'),
+}
+
+INGEST_LOG_DDL = '''
+    CREATE TABLE IF NOT EXISTS ingest_log (
+        name VARCHAR PRIMARY KEY,
+        version VARCHAR,
+        n_rows BIGINT,
+        ingested_at TIMESTAMP
+    )
+    '''
+
+# Cac thang co du lieu thay doi sau moi lan nap (som NULL = ca bang duoc nap lai), seq tang dan
+# de moi bang tong hop biet can tinh lai tu dau
+INGEST_CHANGES_DDL = [
+    'CREATE SEQUENCE IF NOT EXISTS ingest_change_seq',
+    '''
+    CREATE TABLE IF NOT EXISTS ingest_changes (
+        seq BIGINT DEFAULT nextval('ingest_change_seq'),
+        name VARCHAR,
+        som DATE,
+        ingested_at TIMESTAMP
+    )
+    ''',
+]
+
+_lock = threading.Lock()
+
+
+def source_path(data_dir, name):
+    '''
+    Thu muc chia partition cua bang `name` neu co, neu khong thi file parquet
+    '''
+    file, _ = SOURCES[name]
+    directory = Path(data_dir).joinpath(Path(file).stem)
+    return directory if directory.is_dir() else Path(data_dir).joinpath(file)
+
+
+def source_paths(data_dir):
+    '''
+    Ca file va thu muc partition cua moi nguon (de data_cache nhan ra khi chuyen layout)
+    '''
+    paths = []
+    for file, _ in SOURCES.values():
+        paths += [Path(data_dir).joinpath(file), Path(data_dir).joinpath(Path(file).stem)]
+    return paths
+
+
+def partition_files(path):
+    '''
+    {partition (vd 'ym=202412/mien=South'): [file parquet]} cua 1 thu muc nguon
+    '''
+    parts = {}
+    for file in data_cache.parquet_files(path):
+        part = Path(os.path.relpath(os.path.dirname(file), path)).as_posix()
+        parts.setdefault(part, []).append(file)
+    return parts
+
+
+def partition_values(part):
+    '''
+    'ym=202412/mien=South' -> [('ym', '202412'), ('mien', 'South')]; 'NULL' la gia tri null
+    '''
+    values = []
+    for segment in part.split('/'):
+        column, value = segment.split('=', 1)
+        value = unquote(value)
+        values.append((column, None if value == 'NULL' else value))
+    return values
+
+
+def _read_parquet(name, path):
+    if path.is_dir():
+        # union_by_name: partition moi co the them cot so voi partition cu
+        types = ', '.join(f"'{column}': {type_}" for column, type_ in PARTITIONS[name].items())
+        return f'read_parquet($path, hive_partitioning = true, hive_types = {{{types}}}, union_by_name = true)'
+    return 'read_parquet($path)'
+
+
+def _log(con, name, version, n_rows):
+    con.execute('''
+        INSERT OR REPLACE INTO ingest_log
+        VALUES ($name, $version, $n_rows, now()::timestamp)
+        ''', {'name': name, 'version': version, 'n_rows': n_rows})
+
+
+def _log_changes(con, name, months_sql=None, params=None):
+    '''
+    Ghi cac thang co du lieu thay doi (months_sql tra ve cot som), None = ca bang
+    '''
+    if months_sql is None:
+        months_sql = 'SELECT NULL::DATE som'
+    con.execute(f'''
+        INSERT INTO ingest_changes (name, som, ingested_at)
+        SELECT DISTINCT $name, som, now()::timestamp FROM ({months_sql})
+        ''', dict(params or {}, name=name))
+
+
+def _months_sql(name, relation):
+    _, _, date_column = UPSERTS[name]
+    return f"SELECT date_trunc('month', {date_column})::date som FROM {relation}"
+
+
+def _partition_version(files):
+    return str(tuple(data_cache.file_version(file) for file in files))
+
+
+def _source_params(path):
+    if path.is_dir():
+        return {'path': [file for files in partition_files(path).values() for file in files]}
+    return {'path': str(path)}
+
+
+def _same_columns(con, name, path):
+    '''
+    File nguon co cung cot (ten, kieu) voi bang `name` khong; khac thi INSERT BY NAME se loi binder
+    (file them cot) hoac thieu cot, phai nap lai ca bang
+    '''
+    source = con.execute(f'DESCRIBE SELECT * FROM {_read_parquet(name, path)}', _source_params(path)).fetchall()
+    table = con.execute(f'DESCRIBE {name}').fetchall()
+    # INSERT BY NAME khong can cung thu tu cot
+    return {column[:2] for column in source} == {column[:2] for column in table}
+
+
+def ingest_table(con, name, path, version):
+    '''
+    Nap lai ca bang tu file parquet / thu muc chia partition, sap xep theo cot store / ngay
+    '''
+    _, sort_cols = SOURCES[name]
+    parts = partition_files(path) if path.is_dir() else {}
+    con.execute('BEGIN TRANSACTION')
+    try:
+        con.execute(f'''
+            CREATE OR REPLACE TABLE {name} AS
+            SELECT * FROM {_read_parquet(name, path)}
+            ORDER BY {', '.join(sort_cols)}
+            ''', _source_params(path))
+        n_rows = con.execute(f'SELECT count(*) FROM {name}').fetchone()[0]
+        _log(con, name, version, n_rows)
+        _log_changes(con, name)
+        # version tung partition, lan sau chi nap lai partition thay doi
+        con.execute("DELETE FROM ingest_log WHERE starts_with(name, $prefix)", {'prefix': f'{name}/'})
+        for part, part_files in parts.items():
+            _log(con, f'{name}/{part}', _partition_version(part_files), None)
+        con.execute('COMMIT')
+    except Exception:
+        con.execute('ROLLBACK')
+        raise
+    return n_rows
+
+
+def ingest_partitions(con, name, path, version, loaded):
+    '''
+    Chi nap lai cac partition co file thay doi va xoa cac partition khong con trong thu muc nguon.
+    loaded: {ten trong ingest_log: version} cua lan nap truoc. Tra ve danh sach partition da nap lai.
+    '''
+    _, sort_cols = SOURCES[name]
+    types = PARTITIONS[name]
+    parts = partition_files(path)
+    prefix = f'{name}/'
+    logged = {key[len(prefix):]: value for key, value in loaded.items() if key.startswith(prefix)}
+    changed = {part: files for part, files in parts.items() if logged.get(part) != _partition_version(files)}
+    removed = [part for part in logged if part not in parts]
+    con.execute('BEGIN TRANSACTION')
+    try:
+        for part in list(changed) + removed:
+            params = {}
+            conditions = []
+            for i, (column, value) in enumerate(partition_values(part)):
+                conditions.append(f'{column} IS NOT DISTINCT FROM $p{i}::{types[column]}')
+                params[f'p{i}'] = value
+            where = ' AND '.join(conditions)
+            if name in UPSERTS:
+                _log_changes(con, name, _months_sql(name, f'{name} WHERE {where}'), params)
+            con.execute(f'DELETE FROM {name} WHERE {where}', params)
+        if changed:
+            params = {'path': [file for files in changed.values() for file in files]}
+            con.execute(f'''
+                INSERT INTO {name} BY NAME
+                SELECT * FROM {_read_parquet(name, path)}
+                ORDER BY {', '.join(sort_cols)}
+                ''', params)
+            if name in UPSERTS:
+                _log_changes(con, name, _months_sql(name, _read_parquet(name, path)), params)
+        if name not in UPSERTS:
+            _log_changes(con, name)
+        for part, files in changed.items():
+            _log(con, f'{name}/{part}', _partition_version(files), None)
+        for part in removed:
+            con.execute('DELETE FROM ingest_log WHERE name = $name', {'name': f'{name}/{part}'})
+        n_rows = con.execute(f'SELECT count(*) FROM {name}').fetchone()[0]
+        _log(con, name, version, n_rows)
+        con.execute('COMMIT')
+    except Exception:
+        con.execute('ROLLBACK')
+        raise
+    return list(changed) + removed
+
+
+def ingest_upsert(con, name, path, version):
+    '''
+    So (khoa, max cob_dt) giua file nguon va bang; chi xoa / ghi lai cac khoa moi, co cob_dt thay doi
+    hoac khong con trong file. Tra ve so khoa da ghi lai.
+    '''
+    keys, stamp, _ = UPSERTS[name]
+    _, sort_cols = SOURCES[name]
+    source = _read_parquet(name, path)
+    params = {'path': str(path)}
+    key_list = ', '.join(keys)
+    con.execute('BEGIN TRANSACTION')
+    try:
+        con.execute(f'''
+            CREATE OR REPLACE TEMP TABLE ingest_delta AS
+            SELECT {key_list}, s.{stamp} IS NULL deleted
+            FROM (SELECT {key_list}, max({stamp}) {stamp} FROM {source} GROUP BY ALL) s
+            FULL OUTER JOIN (SELECT {key_list}, max({stamp}) {stamp} FROM {name} GROUP BY ALL) t
+                USING ({key_list})
+            WHERE s.{stamp} IS DISTINCT FROM t.{stamp}
+            ''', params)
+        n_keys = con.execute('SELECT count(*) FROM ingest_delta').fetchone()[0]
+        if n_keys:
+            _log_changes(con, name, _months_sql(name, 'ingest_delta'))
+            con.execute(f'''
+                DELETE FROM {name} USING ingest_delta
+                WHERE {' AND '.join(f'{name}.{k} = ingest_delta.{k}' for k in keys)}
+                ''')
+            con.execute(f'''
+                INSERT INTO {name} BY NAME
+                SELECT s.* FROM {source} s
+                JOIN ingest_delta d ON {' AND '.join(f's.{k} = d.{k}' for k in keys)}
+                WHERE NOT d.deleted
+                ORDER BY {', '.join(f's.{c}' for c in sort_cols)}
+                ''', params)
+        con.execute('DROP TABLE ingest_delta')
+        n_rows = con.execute(f'SELECT count(*) FROM {name}').fetchone()[0]
+        _log(con, name, version, n_rows)
+        con.execute("DELETE FROM ingest_log WHERE starts_with(name, $prefix)", {'prefix': f'{name}/'})
+        con.execute('COMMIT')
+    except Exception:
+        con.execute('ROLLBACK')
+        raise
+    return n_keys
+
+
+def ingest(con, data_dir, force=False):
+    '''
+    Nap cac bang co file nguon thay doi tu lan nap truoc. Tra ve danh sach bang da nap lai.
+    '''
+    with _lock:
+        con.execute(INGEST_LOG_DDL)
+        for ddl in INGEST_CHANGES_DDL:
+            con.execute(ddl)
+        loaded = dict(con.execute('SELECT name, version FROM ingest_log').fetchall())
+        tables = {r[0] for r in con.execute('SELECT table_name FROM duckdb_tables()').fetchall()}
+        refreshed = []
+        for name in SOURCES:
+            path = source_path(data_dir, name)
+            version = str(data_cache.file_version(path))
+            if not force and name in tables and loaded.get(name) == version:
+                continue
+            # bang da nap tu thu muc partition truoc do: chi nap lai partition thay doi;
+            # file nguon doi cot (them / bot / doi kieu) thi nap lai ca bang
+            partitioned = any(key.startswith(f'{name}/') for key in loaded)
+            incremental = not force and name in tables and _same_columns(con, name, path)
+            if path.is_dir() and partitioned and incremental:
+                ingest_partitions(con, name, path, version, loaded)
+            elif not path.is_dir() and name in UPSERTS and incremental:
+                ingest_upsert(con, name, path, version)
+            else:
+                ingest_table(con, name, path, version)
+            refreshed.append(name)
+        return refreshed
@@ -0,0 +1,191 @@
+'''
+Do thoi gian tung buoc cua 1 lan chay script dashboard (loader get_*, query DuckDB, groupby,
+display_daily, chart_*, serialize figure, render Streamlit ...), de biet trang cham do DuckDB,
+pandas styling, dung figure plotly hay do figure qua nang khi gui len browser.
+
+Moi lan chay (run) ghi 1 dong JSON vao file log (log_to), gom danh sach cac buoc:
+
+    {"ts": ..., "run": "page", "user": "admin", "status": "ok", "total_ms": 812.4,
+     "stages": [{"stage": "get_daily_chart", "ms": 35.1, "rows": 31}, ...]}
+
+summary() doc cac dong cuoi cua file log va tinh p50 / p95 cua tung buoc qua cac session.
+File log qua LOG_MAX_BYTES thi doi ten thanh <file>.1 (<file>.1 cu thanh <file>.2 ...), giu LOG_BACKUPS file cu.
+Ngoai 1 run (export CLI, benchmark ...) stage() / timed() khong do gi ca.
+'''
+import contextlib
+import functools
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+# so run cuoi cung trong file log dung de tinh p50 / p95
+SUMMARY_RUNS = 5000
+# kich thuoc toi da cua file log truoc khi xoay vong, so file cu giu lai
+LOG_MAX_BYTES = 16 * 1024 * 1024
+LOG_BACKUPS = 2
+
+_local = threading.local()
+_log_path = None
+_write_lock = threading.Lock()
+
+
+def log_to(path):
+    '''
+    Dang ky file JSONL ghi ket qua cac run (None: khong ghi)
+    '''
+    global _log_path
+    _log_path = path
+
+
+def active():
+    '''
+    Dang trong 1 run (cac buoc duoc ghi lai)
+    '''
+    return getattr(_local, 'record', None) is not None
+
+
+def annotate(**fields):
+    '''
+    Them thong tin vao run hien tai, vd view dang xem
+    '''
+    record = getattr(_local, 'record', None)
+    if record is not None:
+        record.update(fields)
+
+
+@contextlib.contextmanager
+def stage(name, **fields):
+    '''
+    Do thoi gian khoi lenh ben trong; co the them so lieu vao dict tra ve (rows, bytes ...)
+    '''
+    record = getattr(_local, 'record', None)
+    if record is None:
+        yield fields
+        return
+    start = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        record['stages'].append(dict(stage=name, ms=round((time.perf_counter() - start) * 1e3, 3), **fields))
+
+
+def timed(func):
+    '''
+    Decorator: moi lan goi func la 1 buoc ten func.__name__, kem so dong cua ket qua
+    (hoac cua tham so dau tien neu ket qua khong phai DataFrame)
+    '''
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not active():
+            return func(*args, **kwargs)
+        with stage(func.__name__) as fields:
+            result = func(*args, **kwargs)
+            shape = getattr(result, 'shape', None) or getattr(args[0] if args else None, 'shape', None)
+            if shape:
+                fields['rows'] = shape[0]
+        return result
+
+    return wrapper
+
+
+@contextlib.contextmanager
+def run(name, **meta):
+    '''
+    1 lan chay script (hoac 1 fragment): gom cac buoc ben trong, ghi vao file log khi xong.
+    Run long trong run khac thi cac buoc thuoc ve run ben ngoai.
+    '''
+    record = getattr(_local, 'record', None)
+    if record is not None:
+        yield record
+        return
+    record = _local.record = dict(ts=datetime.now(timezone.utc).isoformat(timespec='seconds'), run=name, **meta,
+                                  stages=[])
+    start = time.perf_counter()
+    status = 'ok'
+    try:
+        yield record
+    except BaseException as exc:
+        # Streamlit dung exception de dung / chay lai script (widget thay doi, st.rerun)
+        status = type(exc).__name__
+        raise
+    finally:
+        _local.record = None
+        record['status'] = status
+        record['total_ms'] = round((time.perf_counter() - start) * 1e3, 3)
+        if _log_path:
+            _write(_log_path, record)
+
+
+def _backup(path, i):
+    return f'{path}.{i}'
+
+
+def _rotate(path):
+    for i in range(LOG_BACKUPS - 1, 0, -1):
+        if os.path.exists(_backup(path, i)):
+            os.replace(_backup(path, i), _backup(path, i + 1))
+    if LOG_BACKUPS:
+        os.replace(path, _backup(path, 1))
+    else:
+        os.remove(path)
+
+
+def _write(path, record):
+    line = json.dumps(record, ensure_ascii=False, default=str)
+    with _write_lock:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+            size = f.tell()
+        if size >= LOG_MAX_BYTES:
+            _rotate(path)
+
+
+def read_runs(path, limit=SUMMARY_RUNS):
+    '''
+    `limit` run cuoi cung trong file log va cac file da xoay vong (bo qua dong hong do dang ghi do)
+    '''
+    lines = deque(maxlen=limit)
+    for file in [_backup(path, i) for i in range(LOG_BACKUPS, 0, -1)] + [path]:
+        try:
+            with open(file, encoding='utf-8') as f:
+                lines.extend(f)
+        except FileNotFoundError:
+            continue
+    runs = []
+    for line in lines:
+        try:
+            runs.append(json.loads(line))
+        except ValueError:
+            continue
+    return runs
+
+
+def _percentile(values, q):
+    # nearest-rank tren list da sort
+    return values[max(math.ceil(q * len(values)) - 1, 0)]
+
+
+def summary(runs):
+    '''
+    {buoc: {n, p50_ms, p95_ms, max_ms, p50_rows, p50_bytes}} qua cac run; thoi gian ca trang
+    la buoc 'total:<ten run>', chi tinh cac run chay het (status ok)
+    '''
+    samples = {}
+    for record in runs:
+        if record.get('status') == 'ok':
+            samples.setdefault(f"total:{record['run']}", []).append({'ms': record['total_ms']})
+        for s in record.get('stages', []):
+            samples.setdefault(s['stage'], []).append(s)
+    result = {}
+    for name, items in samples.items():
+        ms = sorted(s['ms'] for s in items)
+        result[name] = {'n': len(ms), 'p50_ms': _percentile(ms, 0.5), 'p95_ms': _percentile(ms, 0.95), 'max_ms': ms[-1]}
+        for field in ('rows', 'bytes'):
+            values = sorted(s[field] for s in items if field in s)
+            if values:
+                result[name][f'p50_{field}'] = _percentile(values, 0.5)
+    return result
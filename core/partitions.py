@@ -0,0 +1,117 @@
+'''
+Ghi file nguon theo layout chia partition kieu hive (cot partition: ingest.PARTITIONS):
+
+    <data_dir>/data_luongtt/ym=202412/mien=South/data_0.parquet
+
+Job du lieu hang ngay chi can ghi lai cac partition co trong file moi (thuong la thang hien tai)
+bang write(), cac partition khac khong bi ghi lai; ingest.py cung chi nap lai cac partition do.
+migrate() chuyen cac file nguon 1 file hien tai sang layout nay.
+'''
+import os
+import shutil
+import uuid
+from pathlib import Path
+
+from . import ingest
+
+
+def partition_dir(data_dir, name):
+    '''
+    Thu muc partition cua bang `name`: ten file nguon bo duoi .parquet
+    '''
+    file, _ = ingest.SOURCES[name]
+    return Path(data_dir).joinpath(Path(file).stem)
+
+
+def _literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def write(con, name, source, data_dir):
+    '''
+    Ghi du lieu trong file parquet `source` vao thu muc partition cua bang `name`, thay the toan bo
+    cac partition co trong `source`. Tra ve danh sach partition da ghi.
+
+    File duoc ghi vao thu muc tam roi doi ten vao dung cho, nen ingest khong doc phai file ghi do;
+    partition cu duoc doi ten sang thu muc tam truoc roi moi xoa, partition khong bi thieu trong luc xoa.
+    Loi giua chung thi tra cac partition cu ve cho cu; chi xoa thu muc tam khi da doi xong hoac da tra lai.
+    '''
+    _, sort_cols = ingest.SOURCES[name]
+    target = partition_dir(data_dir, name)
+    target.mkdir(parents=True, exist_ok=True)
+    tmp = target.joinpath(f'.tmp-{uuid.uuid4().hex}')
+    try:
+        # COPY khong nhan tham so bind cho duong dan
+        con.execute(f'''
+            COPY (
+                SELECT * FROM read_parquet({_literal(source)})
+                ORDER BY {', '.join(sort_cols)}
+            ) TO {_literal(tmp)}
+            (FORMAT parquet, PARTITION_BY ({', '.join(ingest.PARTITIONS[name])}), WRITE_PARTITION_COLUMNS true)
+            ''')
+        parts = sorted(ingest.partition_files(tmp))
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    moved, swapped = [], []
+    try:
+        for part in parts:
+            old = target.joinpath(part)
+            if old.exists():
+                aside = tmp.joinpath('.old', part)
+                aside.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(old, aside)
+                moved.append(part)
+            old.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp.joinpath(part), old)
+            swapped.append(part)
+    except BaseException:
+        # loi o _restore thi giu nguyen thu muc tam (con partition cu trong .old)
+        _restore(target, tmp, moved, swapped)
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    shutil.rmtree(tmp, ignore_errors=True)
+    return parts
+
+
+def _restore(target, tmp, moved, swapped):
+    '''
+    Dua cac partition moi da doi ten vao (`swapped`) tro lai thu muc tam va tra partition cu (`moved`)
+    tu tmp/.old ve cho cu
+    '''
+    for part in reversed(swapped):
+        os.replace(target.joinpath(part), tmp.joinpath(part))
+    for part in reversed(moved):
+        os.replace(tmp.joinpath('.old', part), target.joinpath(part))
+
+
+def count_rows(con, files):
+    '''
+    Tong so dong cua cac file parquet
+    '''
+    if not files:
+        return 0
+    return con.execute('SELECT count(*) FROM read_parquet($files)', {'files': [str(f) for f in files]}).fetchone()[0]
+
+
+def migrate(con, data_dir, names=None, remove=False):
+    '''
+    Chuyen file nguon cua cac bang `names` (mac dinh tat ca) sang thu muc partition, kiem tra so dong
+    khop voi file goc; remove=True thi xoa file goc sau khi chuyen.
+    Tra ve {bang: (so dong, so partition)}, bo qua bang khong co file goc.
+    '''
+    result = {}
+    for name in names or ingest.SOURCES:
+        file = Path(data_dir).joinpath(ingest.SOURCES[name][0])
+        if not file.is_file():
+            continue
+        parts = write(con, name, file, data_dir)
+        written = ingest.partition_files(partition_dir(data_dir, name))
+        n_rows = count_rows(con, [file])
+        n_written = count_rows(con, [f for part in parts for f in written[part]])
+        if n_written != n_rows:
+            raise ValueError(f'{name}: {n_rows} dong trong {file.name} nhung thu muc partition co {n_written} dong')
+        if remove:
+            file.unlink()
+        result[name] = (n_rows, len(parts))
+    return result
@@ -0,0 +1,344 @@
+'''
+Cac cau query cua dashboard, viet dang parameterized ($from_date, $to_date, $stores, ...)
+thay vi ghep chuoi f-string. Danh sach store duoc chuan hoa (sort, bo trung) truoc khi vao
+cache key, va thoi gian chay cua tung query duoc ghi lai.
+'''
+import threading
+import time
+
+import pandas as pd
+import pyarrow as pa
+
+from . import instrument
+
+# 'arrow': lay ket qua dang Arrow; cot string giu nguyen buffer Arrow (pd.ArrowDtype) thay vi tao
+#          1 object Python cho moi o, cot so / ngay chuyen sang numpy (NaN / NaT nhu cu)
+# 'numpy': fetch_df() cua DuckDB nhu cu (string thanh object)
+FETCH_MODE = 'arrow'
+
+# Dieu kien loc store / ngay trong tuan, chi them vao query khi co truyen danh sach. Dang IN (SELECT unnest())
+# de DuckDB day duoc bo loc xuong scan (bo qua row group ngoai cac store, bang da sort theo store_vt);
+# list_contains() thi phai doc het cac dong roi moi loc
+STORE_FILTER = '{column} IN (SELECT unnest($stores))'
+DAY_FILTER = 'day_of_week2 IN (SELECT unnest($days))'
+# Chi lay cac store user duoc xem (index store_access), them vao query khi co truyen username
+ACCESS_FILTER = '{column} IN (SELECT store_vt FROM store_access WHERE username = $username)'
+
+QUERIES = {
+    'data_daily': '''
+        SELECT
+            *
+            , luong_tt_daily - total_luongtt_act chenh_lech_luong_khoan
+            , least(luong_tt_daily, total_luongtt_act) min_luong
+            , abs(luong_tt_daily - total_luongtt_act) abs_chenh_lech
+            , whr_gstar / baseline_rfc * 100 pct_whr_gstar_to_baseline
+            , whr_gstar / total_whr_act * 100 pct_whr_gstar_to_total_whr
+            , total_whr_act / baseline_act * 100 - 100 whr_act_vs_baseline_act
+        FROM data_daily
+        WHERE report_date between $from_date and $to_date
+        {store_filter}
+        {day_filter}
+        ''',
+    # cac diem cho violin chart (1 dong / store / ngay, chi lay cac cot can ve)
+    'daily_points': '''
+        SELECT
+            report_date
+            , store_vt
+            , profit_center
+            , day_of_week2
+            , luong_tt_daily - total_luongtt_act chenh_lech_luong_khoan
+            , total_luongtt_act
+            , luong_tt_daily
+            , tc_forecast
+            , tc
+        FROM data_daily
+        WHERE report_date between $from_date and $to_date
+        {store_filter}
+        {day_filter}
+        ''',
+    # TC va luong thuc te tung store / ngay, dau vao cho mo phong tier (whatif.py)
+    'daily_tc': '''
+        SELECT
+            store_vt
+            , ym
+            , report_date
+            , tc
+            , total_luongtt_act
+        FROM data_daily
+        WHERE report_date between $from_date and $to_date
+        {store_filter}
+        ''',
+    # tong hop theo ngay cho chart luong khoan / TC / gio cong
+    # coalesce(sum(), 0): nhom toan NULL (vd whr_gstar, luong_tt_daily_avg_mtd thang 10) tra ve 0 nhu pandas .sum()
+    'daily_chart': '''
+        SELECT
+            *
+            , least(luong_tt_daily, total_luongtt_act) min_luong
+            , abs(chenh_lech_luong_khoan) abs_chenh_lech
+            , whr_gstar / baseline_rfc * 100 pct_whr_gstar_to_baseline
+            , whr_gstar / total_whr_act * 100 pct_whr_gstar_to_total_whr
+        FROM (
+            SELECT
+                report_date
+                , coalesce(sum(tc), 0) tc
+                , coalesce(sum(tc_forecast), 0) tc_forecast
+                , coalesce(sum(luong_tt_daily), 0) luong_tt_daily
+                , coalesce(sum(total_luongtt_act), 0) total_luongtt_act
+                , coalesce(sum(luong_tt_daily - total_luongtt_act), 0) chenh_lech_luong_khoan
+                , coalesce(sum(baseline_rfc), 0) baseline_rfc
+                , coalesce(sum(baseline_act), 0) baseline_act
+                , coalesce(sum(whr_act), 0) whr_act
+                , coalesce(sum(whr_gstar), 0) whr_gstar
+                , coalesce(sum(total_whr_act), 0) total_whr_act
+            FROM data_daily
+            WHERE report_date between $from_date and $to_date
+            {store_filter}
+            {day_filter}
+            GROUP BY report_date
+        )
+        ORDER BY report_date
+        ''',
+    # luong khoan tam tinh theo thang / store (TC trung binh MTD)
+    'mtd_avg': '''
+        SELECT
+            ym
+            , profit_center
+            , store_vt
+            , level_report_mtd
+            , avg(mtd_avg_tc) mtd_avg_tc
+            , coalesce(sum(total_luongtt_act), 0) total_luongtt_act
+            , coalesce(sum(luong_tt_daily_avg_mtd), 0) luong_tt_daily_avg_mtd
+            , coalesce(sum(tc), 0) tc
+            , coalesce(sum(tc_forecast), 0) tc_forecast
+            , coalesce(sum(luong_tt_daily_avg_mtd), 0) - coalesce(sum(total_luongtt_act), 0) chenh_lech_luong_khoan
+        FROM data_daily
+        WHERE report_date between $from_date and $to_date
+        {store_filter}
+        {day_filter}
+        GROUP BY ALL
+        ORDER BY ym, profit_center, store_vt, level_report_mtd
+        ''',
+    'store_summary': '''
+        SELECT
+            profit_center
+            , store_vt
+            , coalesce(sum(luong_tt_daily_avg_mtd), 0) luong_tt_daily_avg_mtd
+            , coalesce(sum(total_luongtt_act), 0) total_luongtt_act
+            , coalesce(sum(tc), 0) tc
+            , coalesce(sum(tc_forecast), 0) tc_forecast
+        FROM data_daily
+        WHERE report_date between $from_date and $to_date
+        {store_filter}
+        {day_filter}
+        GROUP BY ALL
+        ORDER BY profit_center, store_vt
+        ''',
+    # so lieu tong (tam tinh) va thoi gian cap nhat du lieu
+    'daily_headline': '''
+        SELECT
+            coalesce(sum(luong_tt_daily_avg_mtd), 0) tong_khoan
+            , coalesce(sum(total_luongtt_act), 0) tong_actual
+            , coalesce(sum(luong_tt_daily_avg_mtd), 0) - coalesce(sum(total_luongtt_act), 0) chenh_lech
+            , max(cob_dt) last_update_time
+        FROM data_daily
+        WHERE report_date between $from_date and $to_date
+        {store_filter}
+        {day_filter}
+        ''',
+    'max_date': '''
+        SELECT
+            max(report_date)::timestamp max_date
+        FROM data_daily
+        ''',
+    # diem trung binh Gstar theo ung vien / ung vien - tuan, group by trong DuckDB
+    'gstar_candidates': '''
+        SELECT
+            ma_ung_vien
+            , doi_tuong
+            , ten_ung_vien
+            , sum(diem_danh_gia_sau_trong_so)::BIGINT diem_danh_gia_sau_trong_so
+            , sum(trong_so)::BIGINT trong_so
+            , sum(gio_cong_thuc_te) gio_cong_thuc_te
+            , sum(diem_danh_gia_sau_trong_so) / sum(trong_so) avg_score
+        FROM dta_gstar
+        WHERE ngay_tuyen between $from_date and $to_date
+        {store_filter}
+        GROUP BY ma_ung_vien, doi_tuong, ten_ung_vien
+        ORDER BY ma_ung_vien, doi_tuong, ten_ung_vien
+        ''',
+    'gstar_weekly': '''
+        SELECT
+            ma_ung_vien
+            , doi_tuong
+            , ten_ung_vien
+            , yw
+            , sum(diem_danh_gia_sau_trong_so)::BIGINT diem_danh_gia_sau_trong_so
+            , sum(trong_so)::BIGINT trong_so
+            , sum(gio_cong_thuc_te) gio_cong_thuc_te
+            , sum(diem_danh_gia_sau_trong_so) / sum(trong_so) avg_score
+        FROM dta_gstar
+        WHERE ngay_tuyen between $from_date and $to_date
+        {store_filter}
+        GROUP BY ma_ung_vien, doi_tuong, ten_ung_vien, yw
+        ORDER BY ma_ung_vien, doi_tuong, ten_ung_vien, yw
+        ''',
+    # dong chi tiet Gstar, chi cac cot bang / chart diem hang ngay can
+    'gstar_detail': '''
+        SELECT
+            ma_ung_vien, doi_tuong, ten_ung_vien, ma_nha_hang_tuyen, store_vt, mien, sbu, brand
+            , ngay_tuyen, gio_cong_thuc_te, diem_danh_gia
+        FROM dta_gstar
+        WHERE ngay_tuyen between $from_date and $to_date
+        {store_filter}
+        ''',
+    'allocated_bonus': r'''
+        SELECT
+            a.* EXCLUDE (whr_sau_he_so, whr_ratio)
+            , strftime(a.start_of_month, '%m/%Y') ym
+            , b.var_luongtt
+        FROM dta_pbo_thuong a
+        LEFT JOIN thuong_monthly b
+            ON a.profit_center = b.profit_center AND a.start_of_month = b.som
+            AND b.som between date_trunc('month', $from_date::date) and date_trunc('month', $to_date::date)
+        WHERE a.start_of_month between date_trunc('month', $from_date::date) and date_trunc('month', $to_date::date)
+        {store_filter}
+        ''',
+    'chot_khoan_thang': '''
+        SELECT
+            *
+        FROM dta_chot_khoan_thang
+        WHERE som::date between date_trunc('month', $from_date::date) and date_trunc('month', $to_date::date)
+        {store_filter}
+        ''',
+    'pbo_chot_thang': '''
+        SELECT
+            * REPLACE (start_of_month::timestamp AS start_of_month)
+        FROM dta_pbo_thuong_chot_thang
+        WHERE start_of_month::date between date_trunc('month', $from_date::date) and date_trunc('month', $to_date::date)
+        {store_filter}
+        ''',
+    'tier_tc': r'''
+        SELECT
+            *
+        FROM tc_tier
+        WHERE ym between strftime($from_date::date, '%Y%m') and strftime($to_date::date, '%Y%m')
+        {store_filter}
+        ''',
+    # cac store user duoc xem, tu index phan quyen (aggregates.refresh_store_access)
+    'store': '''
+        SELECT
+            distinct store_vt
+        FROM store_access
+        WHERE username = $username
+        order by store_vt
+        ''',
+    'dayofweek': '''
+        SELECT
+            distinct day_of_week2
+        FROM data_daily
+        order by day_of_week2
+        ''',
+}
+
+# Cot store dung de loc, mac dinh la store_vt
+STORE_COLUMNS = {
+    'allocated_bonus': 'a.store_vt',
+    'tier_tc': 'storevt',
+}
+
+_timings = {}
+_lock = threading.Lock()
+
+
+def canonical_stores(stores):
+    '''
+    Chuan hoa danh sach store (sort, bo trung) de cache key on dinh.
+    None nghia la khong loc theo store; danh sach rong thi khong tra ve dong nao.
+    '''
+    if stores is None:
+        return None
+    if isinstance(stores, str):
+        stores = [stores]
+    return tuple(sorted(set(stores)))
+
+
+def build_query(name, stores=None, days=None, username=None):
+    '''
+    Tra ve (sql, params) cho query `name`; sql chi phu thuoc vao co loc store / ngay / user hay khong.
+    username: chi lay cac store user duoc xem (join vao store_access).
+    '''
+    sql = QUERIES[name]
+    params = {}
+    filters = {}
+    if '{store_filter}' in sql:
+        column = STORE_COLUMNS.get(name, 'store_vt')
+        conditions = []
+        if stores is not None:
+            conditions.append(STORE_FILTER.format(column=column))
+            params['stores'] = list(stores)
+        if username is not None:
+            conditions.append(ACCESS_FILTER.format(column=column))
+        filters['store_filter'] = ' '.join('and ' + c for c in conditions)
+    if '{day_filter}' in sql:
+        filters['day_filter'] = ''
+        if days:
+            filters['day_filter'] = 'and ' + DAY_FILTER
+            params['days'] = list(days)
+    sql = sql.format(**filters)
+    if '$username' in sql:
+        params['username'] = username
+    return sql, params
+
+
+def _record(name, elapsed, rows):
+    with _lock:
+        t = _timings.setdefault(name, {'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'last_ms': 0.0, 'last_rows': 0})
+        t['calls'] += 1
+        t['total_ms'] += elapsed * 1e3
+        t['max_ms'] = max(t['max_ms'], elapsed * 1e3)
+        t['last_ms'] = elapsed * 1e3
+        t['last_rows'] = rows
+
+
+def _arrow_dtype(arrow_type):
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.ArrowDtype(arrow_type)
+    return None
+
+
+def to_frame(result, mode=None):
+    '''
+    Chuyen ket qua query DuckDB thanh DataFrame theo FETCH_MODE
+    '''
+    if (mode or FETCH_MODE) == 'arrow':
+        return result.fetch_arrow_table().to_pandas(types_mapper=_arrow_dtype, split_blocks=True, self_destruct=True)
+    return result.fetch_df()
+
+
+def fetch_df(pool, name, from_date=None, to_date=None, stores=None, days=None, username=None, mode=None):
+    '''
+    Chay query `name` voi tham so bind (khong ghep chuoi) tren 1 connection muon tu pool
+    va tra ve DataFrame (kieu du lieu cua cac cot co dinh trong SQL, xem FETCH_MODE).
+    Thoi gian ghi lai khong tinh thoi gian cho connection.
+    '''
+    sql, params = build_query(name, stores=stores, days=days, username=username)
+    if '$from_date' in sql:
+        params['from_date'] = from_date
+        params['to_date'] = to_date
+    with pool.connection() as con, instrument.stage(f'query:{name}') as fields:
+        start = time.perf_counter()
+        df_data = to_frame(con.execute(sql, params), mode)
+        _record(name, time.perf_counter() - start, len(df_data))
+        fields['rows'] = len(df_data)
+    return df_data
+
+
+def query_timings():
+    '''
+    Thoi gian chay cua tung query tu khi khoi dong server (ms)
+    '''
+    with _lock:
+        return {
+            name: dict(t, avg_ms=t['total_ms'] / t['calls'])
+            for name, t in _timings.items()
+        }
@@ -0,0 +1,164 @@
+'''
+Bang du lieu chi tiet / tong hop cua dashboard, khong phu thuoc Streamlit: dung chung cho
+phan "Dữ liệu chi tiết" / "TC Tiers" tren app va cho export chot thang (export.py).
+'''
+import numpy as np
+import pandas as pd
+
+from . import instrument, styling
+
+# cac cot cua bang du lieu chi tiet hang ngay va ten hien thi
+DAILY_COLUMNS = [
+    'brand', 'store_vt',
+    'report_date',
+    'tc_forecast',
+    'baseline_rfc',
+    'luong_khoan_daily_rfc',
+    'whr_sche',
+    'tc',
+    'baseline_act',
+    'whr_act',
+    'whr_gstar',
+    'total_whr_act',
+    'luongtt_gstar',
+    'luongtt_ggg',
+    'total_luongtt_act',
+    'luong_tt_daily',
+    'chenh_lech_luong_khoan',
+    'whr_act_vs_baseline_act',
+]
+
+DAILY_RENAME = {
+    'brand': 'Brand',
+    'store_vt': 'Store',
+    'tc_forecast': 'TC Forecast',
+    'luong_khoan_daily_rfc': 'Lương khoán - TC RFC',
+    'report_date': 'Date',
+    'tc': 'TC Actual',
+    'luongtt_gstar': 'Lương Gstar',
+    'luongtt_ggg': 'Lương trực tiếp',
+    'total_luongtt_act': 'Tổng lương trực tiếp',
+    'luong_tt_daily': 'Lương khoán theo TC từng ngày',
+    'chenh_lech_luong_khoan': 'Chênh lệch Khoán - Thực tế hàng ngày',
+    'whr_sche': 'Giờ công lập lịch',
+    'baseline_act': 'Baseline TC Actual',
+    'baseline_rfc': 'Baseline TC Forecast',
+    'whr_act': 'Giờ công thực tế',
+    'whr_gstar': 'Giờ công Gstar',
+    'total_whr_act': 'Tổng giờ công',
+    'whr_act_vs_baseline_act': 'Chênh lệch WHR Thực tế - Baseline TC Act (%)',
+}
+
+# cac cot so, hien thi dang {:,.0f} (styling.FORMATS['integer'])
+DAILY_FORMAT_COLUMNS = [
+    'TC Forecast', 'TC Actual', 'Lương Gstar', 'Lương trực tiếp', 'Tổng lương trực tiếp',
+    'Lương khoán theo TC từng ngày', 'Chênh lệch Khoán - Thực tế hàng ngày', 'Lương khoán - TC RFC',
+    'Giờ công lập lịch', 'Baseline TC Actual', 'Baseline TC Forecast', 'Giờ công thực tế', 'Giờ công Gstar',
+    'Tổng giờ công', 'Chênh lệch WHR Thực tế - Baseline TC Act (%)',
+]
+
+DAILY_FORMATS = dict.fromkeys(DAILY_FORMAT_COLUMNS, 'integer')
+# mau chu ca dong theo dau cua cot chenh lech
+DAILY_COLOR_COLUMN = 'Chênh lệch Khoán - Thực tế hàng ngày'
+
+# so dong moi trang cua bang chi tiet tren dashboard
+DAILY_PAGE_SIZE = 100
+# cot tim kiem cua bang chi tiet
+DAILY_SEARCH_COLUMNS = ['brand', 'store_vt']
+
+
+def daily_table(data_daily):
+    '''
+    Bang chi tiet hang ngay: chon cot, format ngay va doi ten cot hien thi
+    '''
+    # Format 'report_date' to show only year-month-date
+    data_display = data_daily[DAILY_COLUMNS].assign(report_date=data_daily['report_date'].dt.strftime('%Y-%m-%d'))
+    return data_display.rename(columns=DAILY_RENAME)
+
+
+def daily_summary(data_display):
+    '''
+    Tong (Sum Total) va trung binh (Average Total) theo Brand, Store cua bang daily_table
+    '''
+    # summary theo tong va avg
+    data_display_sum = data_display.drop(columns='Date').groupby(['Brand', 'Store']).sum()
+    data_display_sum['Chênh lệch WHR Thực tế - Baseline TC Act (%)'] = (data_display_sum['Tổng giờ công'] / data_display_sum['Baseline TC Actual']) * 100 - 100
+    data_display_sum['aggregation'] = 'Sum Total'
+    data_display_avg = data_display.drop(columns='Date').groupby(['Brand', 'Store']).mean()
+    data_display_avg['Chênh lệch WHR Thực tế - Baseline TC Act (%)'] = (data_display_avg['Tổng giờ công'] / data_display_avg['Baseline TC Actual']) * 100 - 100
+    data_display_avg['aggregation'] = 'Average Total'
+    summary_data = pd.concat(objs=[data_display_sum, data_display_avg], axis=0)
+    # Move the last column to the first position
+    last_col = summary_data.columns[-1]
+    summary_data = summary_data[[last_col] + summary_data.columns[:-1].tolist()]
+    return summary_data
+
+
+@instrument.timed
+def display_daily(data_display):
+    '''
+    Styler cua bang daily_table / daily_summary: format cac cot so, mau chu theo dau chenh lech
+    '''
+    return styling.style(data_display, DAILY_FORMATS, css=styling.row_css(data_display, DAILY_COLOR_COLUMN))
+
+
+@instrument.timed
+def daily_order(data_daily, search=None, sort_by=None, descending=False):
+    '''
+    Vi tri cac dong cua bang chi tiet sau khi loc (brand / store chua `search`, khong phan biet hoa
+    thuong) va sap theo cot `sort_by` (None: giu thu tu cua query); dashboard chi lay 1 trang tu day
+    '''
+    positions = np.arange(len(data_daily))
+    if search:
+        match = np.zeros(len(data_daily), dtype=bool)
+        for column in DAILY_SEARCH_COLUMNS:
+            match |= data_daily[column].astype(str).str.contains(search, case=False, regex=False).to_numpy(dtype=bool)
+        positions = positions[match]
+    if sort_by:
+        values = data_daily[sort_by].iloc[positions]
+        positions = positions[values.reset_index(drop=True).sort_values(ascending=not descending, kind='stable').index]
+    return positions
+
+
+@instrument.timed
+def display_page(data_daily, positions):
+    '''
+    Styler cua 1 trang bang chi tiet (cac dong `positions`), chi trang nay duoc format va gui len browser
+    '''
+    return display_daily(daily_table(data_daily.iloc[positions]))
+
+
+@instrument.timed
+def display_tiertc(tier_tc):
+
+    tier_tc['luong_tt_tier0_monthly'] = tier_tc['luong_tt_tier0']*30
+    cols = [
+        'ym','brand', 'pc', 'storevt', 'level_report',
+       'tc_from_daily', 
+       'tc',
+       'tier_from', 
+       'tier_monthly',
+       'luong_tt_tier0',
+       'luong_tt_tier0_monthly', 
+        'bonus_per_tc_over'
+       ]
+    rename_cols = {
+        "ym":'Tháng',
+        'brand':"Brand", 
+        'pc':"Profit center", 
+        'storevt':"Store", 
+        'level_report':"Level",
+        'tc_from_daily':"TC/ngày từ", 
+        'tc':"TC/ngày đến",
+        'tier_from':"TC/tháng từ", 
+        'tier_monthly':"TC/tháng đến",
+        'luong_tt_tier0':"Lương cơ bản tại tier0/ngày", 
+        'luong_tt_tier0_monthly':"Lương cơ bản tại tier0/tháng",
+        'bonus_per_tc_over':"X-đơn giá tiền lương/TC"
+    }
+    format_cols = ["TC/ngày từ", "TC/ngày đến", "TC/tháng từ","TC/tháng đến","Lương cơ bản tại tier0/ngày","Lương cơ bản tại tier0/tháng","X-đơn giá tiền lương/TC"]
+
+    data_table = tier_tc[cols].rename(columns=rename_cols)
+    styled_data = styling.style(data_table, dict.fromkeys(format_cols, 'integer'))
+
+    return styled_data
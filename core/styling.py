@@ -0,0 +1,68 @@
+'''
+Style bang cho st.dataframe / st.data_editor / export: format hien thi theo loai cot va mau theo
+dieu kien tinh 1 lan cho ca bang bang np.where, ap dung qua 1 lan Styler.apply(axis=None),
+thay vi goi ham Python cho tung dong / tung o (cac ham highlight_* cu, xem benchmarks/bench_styling.py).
+
+    styling.style(data, {'tc': 'decimal', 'luong_khoan': 'integer'},
+                  css=styling.cell_css(data, ['chenh_lech_khoan']))
+'''
+import numpy as np
+import pandas as pd
+
+# format hien thi theo loai cot
+FORMATS = {
+    'integer': '{:,.0f}',
+    'decimal': '{:,.1f}',
+    'percent': '{:.1%}',
+}
+
+# mau theo dau cua gia tri: am / duong / bang 0 hoac trong
+NEGATIVE = '#FF5353'
+POSITIVE = '#3CB32D'
+ZERO = 'black'
+
+
+def sign_css(values, negative=NEGATIVE, positive=POSITIVE, zero=ZERO, prop='color'):
+    '''
+    Mang CSS (cung shape voi `values`) theo dau cua tung gia tri; zero='' thi khong style o 0 / NaN
+    '''
+    values = np.asarray(values, dtype=float)
+    return np.where(values < 0, f'{prop}: {negative}',
+                    np.where(values > 0, f'{prop}: {positive}', f'{prop}: {zero}' if zero else ''))
+
+
+def row_css(data, column, **kwargs):
+    '''
+    CSS cho ca bang: moi dong mot mau theo dau cua cot `column` (nhu highlight_text / highlight_row)
+    '''
+    css = sign_css(data[column].to_numpy(dtype=float, na_value=np.nan), **kwargs)
+    return pd.DataFrame(np.repeat(css[:, None], data.shape[1], axis=1), index=data.index, columns=data.columns)
+
+
+def cell_css(data, columns, **kwargs):
+    '''
+    CSS cho ca bang: cac cot `columns` to mau theo dau cua tung o (nhu highlight_chenh_lech), cot khac de trong
+    '''
+    css = np.full(data.shape, '', dtype=object)
+    columns = [c for c in columns if c in data.columns]
+    if columns:
+        values = data[columns].to_numpy(dtype=float, na_value=np.nan)
+        css[:, data.columns.get_indexer(columns)] = sign_css(values, **kwargs)
+    return pd.DataFrame(css, index=data.index, columns=data.columns)
+
+
+def style(data, formats=None, css=None):
+    '''
+    Styler cua `data`: formats = {cot: loai trong FORMATS} (moi loai 1 lan Styler.format),
+    css = DataFrame CSS cung shape (row_css, cell_css ...) ap dung 1 lan qua Styler.apply(axis=None)
+    '''
+    styler = data.style
+    by_kind = {}
+    for column, kind in (formats or {}).items():
+        if column in data.columns:
+            by_kind.setdefault(kind, []).append(column)
+    for kind, columns in by_kind.items():
+        styler = styler.format(FORMATS[kind], subset=columns)
+    if css is not None:
+        styler = styler.apply(lambda _: css, axis=None)
+    return styler
@@ -0,0 +1,140 @@
+'''
+Tinh luong khoan theo bang tier TC (tier_tc) bang NumPy, khong can file data_luongtt.parquet moi.
+
+Moi (store, thang) co cac tier sap xep theo nguong tren `tc`; tier cua 1 ngay la tier dau tien co
+nguong tren >= TC cua ngay do, nguong duoi la tc_from_daily - 1 (tier0 tu 0):
+
+    luong khoan ngay = luong_tt_tier0 + bonus_fix + bonus_per_tc_over * (TC - tc_from_daily + 1)
+
+Luong khoan thang dung tier theo TC trung binh ngay, nguong duoi va bonus_fix nhan voi so ngay.
+Tat ca cac (store, thang) duoc tra trong 1 lan searchsorted: gia tri duoc dich theo so thu tu
+nhom (nhom * SPAN + TC) de cac nhom nam tren cac doan rieng cua cung 1 truc so.
+'''
+import numpy as np
+import pandas as pd
+
+# cac cot cua tier_tc dung de tinh khoan
+TIER_COLUMNS = ['storevt', 'ym', 'level_report', 'tc_from_daily', 'tc', 'bonus_fix', 'bonus_per_tc_over', 'luong_tt_tier0']
+
+
+def build_tier_index(tier_tc):
+    '''
+    Chuan bi bang tier_tc de tra cuu: sap xep theo (store, thang, nguong tren) va tinh
+    nguong duoi, vi tri dau / cuoi cua tung nhom (store, thang)
+    '''
+    tiers = tier_tc[TIER_COLUMNS].sort_values(['storevt', 'ym', 'tc'], kind='stable')
+    store_codes, store_keys = pd.factorize(tiers['storevt'].astype(str))
+    ym_codes, ym_keys = pd.factorize(tiers['ym'].astype(str))
+    gid = pd.factorize(store_codes * len(ym_keys) + ym_codes)[0]
+    # bang (store, thang) -> so thu tu nhom, -1 neu khong co tier
+    groups = np.full((len(store_keys), len(ym_keys)), -1)
+    groups[store_codes, ym_codes] = gid
+    upper = tiers['tc'].to_numpy(dtype=float)
+    start = np.flatnonzero(np.r_[True, gid[1:] != gid[:-1]])
+    end = np.r_[start[1:], len(gid)]
+    # bonus tinh tu TC dau tien cua tier (tc_from_daily): (TC - tc_from_daily + 1) * bonus_per_tc_over;
+    # tier0 (tc_from_daily = 0) khong co bonus vuot tier. Thang 12 tc_from_daily = tc cua tier truoc
+    # (khong phai tc + 1 nhu thang 10, 11) nen nguong duoi phai lay tu tc_from_daily, khong tu tc
+    lower = np.maximum(tiers['tc_from_daily'].to_numpy(dtype=float) - 1, 0.0)
+    # do rong cua moi doan tren truc so, lon hon moi nguong / TC co the gap
+    span = 2.0 ** np.ceil(np.log2(max(upper.max(initial=0.0), 1.0) * 4))
+    return {
+        'stores': pd.Index(store_keys),
+        'yms': pd.Index(ym_keys),
+        'groups': groups,
+        'span': span,
+        'gid': gid,
+        'start': start,
+        'end': end,
+        'sorted_upper': gid * span + upper,
+        'level': tiers['level_report'].to_numpy(dtype=object),
+        'upper': upper,
+        'lower': lower,
+        'bonus_fix': tiers['bonus_fix'].to_numpy(dtype=float),
+        'bonus_per_tc_over': tiers['bonus_per_tc_over'].to_numpy(dtype=float),
+        'luong_tt_tier0': tiers['luong_tt_tier0'].to_numpy(dtype=float),
+    }
+
+
+def _as_keys(values):
+    # key trong index la string; chi ep kieu khi can (vd ym dang so), astype(str) tren mang lon rat cham
+    values = np.asarray(values)
+    return values if values.dtype == object else values.astype(str)
+
+
+def lookup(index, stores, yms, tc):
+    '''
+    Vi tri tier (trong index) cua tung dong (store, thang, TC); -1 neu (store, thang) khong co tier
+    '''
+    tc = np.asarray(tc, dtype=float)
+    store = index['stores'].get_indexer(_as_keys(stores))
+    ym = index['yms'].get_indexer(_as_keys(yms))
+    group = np.where((store >= 0) & (ym >= 0), index['groups'][store, ym], -1)
+    found = group >= 0
+    pos = np.full(len(tc), -1)
+    if not found.any():
+        return pos
+    g = group[found]
+    # TC vuot nguong tren cao nhat thi van o tier cao nhat cua nhom
+    values = g * index['span'] + np.clip(np.nan_to_num(tc[found]), 0, index['span'] / 2)
+    hit = np.searchsorted(index['sorted_upper'], values, side='left')
+    pos[found] = np.minimum(hit, index['end'][g] - 1)
+    return pos
+
+
+def _take(index, pos, column):
+    values = index[column][np.maximum(pos, 0)]
+    if values.dtype == object:
+        return np.where(pos >= 0, values, None)
+    return np.where(pos >= 0, values, np.nan)
+
+
+def luong_khoan_daily(index, stores, yms, tc):
+    '''
+    Luong khoan ngay cho tung dong (store, thang yyyymm, TC ngay), tra ve DataFrame cung thu tu
+    '''
+    tc = np.asarray(tc, dtype=float)
+    pos = lookup(index, stores, yms, tc)
+    lower = _take(index, pos, 'lower')
+    bonus_fix = _take(index, pos, 'bonus_fix')
+    bonus_per_tc_over = _take(index, pos, 'bonus_per_tc_over')
+    luong_tt_tier0 = _take(index, pos, 'luong_tt_tier0')
+    bonus_daily = bonus_per_tc_over * (tc - lower)
+    return pd.DataFrame({
+        'level_report': _take(index, pos, 'level'),
+        'tc_from': lower,
+        'tc_to': _take(index, pos, 'upper'),
+        'bonus_fix': bonus_fix,
+        'bonus_per_tc_over': bonus_per_tc_over,
+        'luong_tt_tier0': luong_tt_tier0,
+        'bonus_daily': bonus_daily,
+        'luong_khoan': luong_tt_tier0 + bonus_fix + bonus_daily,
+    })
+
+
+def luong_khoan_monthly(index, stores, yms, tc, no_of_days):
+    '''
+    Luong khoan thang cho tung dong (store, thang, tong TC thang, so ngay): tier theo TC trung
+    binh ngay, bonus vuot tier = bonus_per_tc_over * (tong TC - (tc_from_daily - 1) * so ngay)
+    '''
+    tc = np.asarray(tc, dtype=float)
+    no_of_days = np.asarray(no_of_days, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_tc = tc / no_of_days
+    pos = lookup(index, stores, yms, avg_tc)
+    lower = _take(index, pos, 'lower')
+    bonus_fix = _take(index, pos, 'bonus_fix')
+    bonus_per_tc_over = _take(index, pos, 'bonus_per_tc_over')
+    luong_tt_tier0 = _take(index, pos, 'luong_tt_tier0')
+    bonus_vuot_tier = bonus_per_tc_over * (tc - lower * no_of_days)
+    return pd.DataFrame({
+        'avg_tc_per_day': avg_tc,
+        'level_report': _take(index, pos, 'level'),
+        'tc_from': lower,
+        'tc_to': _take(index, pos, 'upper'),
+        'bonus_fix_daily': bonus_fix,
+        'bonus_per_tc_over': bonus_per_tc_over,
+        'luong_tt_tier0': luong_tt_tier0,
+        'bonus_vuot_tier': bonus_vuot_tier,
+        'luong_khoan': (luong_tt_tier0 + bonus_fix) * no_of_days + bonus_vuot_tier,
+    })
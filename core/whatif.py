@@ -0,0 +1,147 @@
+'''
+Mo phong "what-if" khi thay doi tham so tier (nguong TC tu / den, bonus_fix, don gia / TC, luong tier0).
+
+Ket qua goc (baseline) tinh 1 lan bang engine trong tiers.py cho moi (store, thang). Khi bang tier
+bi sua, chi cac (store, thang) co dong tier thay doi duoc tinh lai, cac nhom con lai lay tu
+baseline. Moi kich ban duoc nhan dien bang hash cua cac dong tier da thay doi.
+'''
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from . import tiers
+
+# khoa cua 1 dong tier va cac cot duoc phep sua
+KEY_COLUMNS = ['storevt', 'ym', 'level_report']
+EDIT_COLUMNS = ['tc_from_daily', 'tc', 'bonus_fix', 'bonus_per_tc_over', 'luong_tt_tier0']
+GROUP_COLUMNS = ['store_vt', 'ym']
+
+
+def tier_rows(tier_tc):
+    '''
+    Cac cot tier dung cho mo phong, sap xep theo (store, thang, nguong tren)
+    '''
+    return tier_tc[KEY_COLUMNS + EDIT_COLUMNS].sort_values(['storevt', 'ym', 'tc']).reset_index(drop=True)
+
+
+def _bound_errors(tier_tc, order):
+    # tier lien truoc theo `order`; thang 12 tc_from_daily = tc tier truoc la hop le
+    tiers_sorted = tier_tc.loc[order]
+    prev_tc = tiers_sorted.groupby(['storevt', 'ym'], sort=False, dropna=False)['tc'].shift()
+    errors = pd.Series('', index=order)
+    errors[tiers_sorted['tc_from_daily'] < prev_tc] = 'TC từ < TC đến của tier trước'
+    errors[tiers_sorted['tc_from_daily'] > tiers_sorted['tc']] = 'TC từ > TC đến'
+    return errors
+
+
+def check_tiers(tier_tc, base=None):
+    '''
+    Cac dong tier co nguong khong hop le, kem cot loi: tc_from_daily > tc, hoac tc_from_daily nho hon
+    tc cua tier lien truoc (chong len tier truoc). Co `base` (bang goc, cung index) thi thu tu tier lay
+    theo bang goc va chi bao loi moi do sua, vi bang tier_tc goc da co san mot so tier rong.
+    '''
+    order = (tier_tc if base is None else base.loc[tier_tc.index]).sort_values(
+        ['storevt', 'ym', 'tc_from_daily', 'tc'], kind='stable').index
+    errors = _bound_errors(tier_tc, order)
+    invalid = errors != ''
+    if base is not None:
+        invalid &= _bound_errors(base, order) == ''
+    return tier_tc.loc[order[invalid.to_numpy()], KEY_COLUMNS + ['tc_from_daily', 'tc']].assign(loi=errors[invalid])
+
+
+def apply_bulk(tier_tc, levels, column, value, mode='set'):
+    '''
+    Sua hang loat 1 cot cho cac tier `levels` cua tat ca store: 'set' gan gia tri moi,
+    'add' cong them, 'pct' tang / giam theo %
+    '''
+    tier_tc = tier_tc.copy()
+    rows = tier_tc['level_report'].isin(levels)
+    if mode == 'add':
+        tier_tc.loc[rows, column] = tier_tc.loc[rows, column] + value
+    elif mode == 'pct':
+        tier_tc.loc[rows, column] = tier_tc.loc[rows, column] * (1 + value / 100)
+    else:
+        tier_tc.loc[rows, column] = value
+    return tier_tc
+
+
+def changed_groups(base, edited):
+    '''
+    Cac (store, thang) co it nhat 1 dong tier khac nhau giua bang goc va bang da sua
+    '''
+    merged = base[KEY_COLUMNS + EDIT_COLUMNS].merge(
+        edited[KEY_COLUMNS + EDIT_COLUMNS], on=KEY_COLUMNS, how='outer', suffixes=('', '_new'), indicator=True)
+    diff = (merged['_merge'] != 'both').to_numpy()
+    for col in EDIT_COLUMNS:
+        diff |= ~np.isclose(merged[col].to_numpy(dtype=float), merged[f'{col}_new'].to_numpy(dtype=float), equal_nan=True)
+    groups = merged.loc[diff, ['storevt', 'ym']].drop_duplicates()
+    return groups.rename(columns={'storevt': 'store_vt'}).reset_index(drop=True)
+
+
+def scenario_hash(base, edited):
+    '''
+    Hash cua kich ban = hash cac dong tier da sua trong cac (store, thang) bi thay doi
+    '''
+    groups = changed_groups(base, edited)
+    rows = _rows_in(edited, groups, store_column='storevt')
+    rows = rows[KEY_COLUMNS + EDIT_COLUMNS].sort_values(KEY_COLUMNS)
+    digest = hashlib.blake2b(pd.util.hash_pandas_object(rows, index=False).to_numpy().tobytes(), digest_size=16)
+    return digest.hexdigest()
+
+
+def _rows_in(df, groups, store_column='store_vt'):
+    keys = pd.MultiIndex.from_frame(df[[store_column, 'ym']].astype(str))
+    return df[keys.isin(pd.MultiIndex.from_frame(groups[GROUP_COLUMNS].astype(str)))]
+
+
+def summarize(daily, luong_khoan):
+    '''
+    Tong hop theo (store, thang): luong khoan, luong thuc te, chenh lech va phan vuot khoan (> 0)
+    '''
+    data = pd.DataFrame({
+        'store_vt': daily['store_vt'].to_numpy(),
+        'ym': daily['ym'].to_numpy(),
+        'so_ngay': 1,
+        'luong_khoan': np.asarray(luong_khoan, dtype=float),
+        'luong_thuc_te': daily['total_luongtt_act'].to_numpy(dtype=float),
+    })
+    summary = data.groupby(GROUP_COLUMNS, as_index=False).sum()
+    summary['chenh_lech'] = summary['luong_khoan'] - summary['luong_thuc_te']
+    summary['vuot_khoan'] = summary['chenh_lech'].clip(lower=0)
+    return summary
+
+
+def baseline(daily, tier_tc):
+    '''
+    Ket qua goc theo (store, thang), tinh lai tu bang tier hien tai
+    '''
+    index = tiers.build_tier_index(tier_tc)
+    calc = tiers.luong_khoan_daily(index, daily['store_vt'], daily['ym'], daily['tc'])
+    return summarize(daily, calc['luong_khoan'])
+
+
+def simulate(daily, base_tiers, edited, base_summary):
+    '''
+    Ket qua theo (store, thang) cua kich ban `edited`: chi tinh lai cac nhom co dong tier thay
+    doi. Tra ve bang baseline them cac cot *_moi va cot thay_doi.
+    '''
+    result = base_summary.copy()
+    for col in ('luong_khoan', 'chenh_lech', 'vuot_khoan'):
+        result[f'{col}_moi'] = result[col]
+    result['thay_doi'] = False
+    groups = changed_groups(base_tiers, edited)
+    if groups.empty:
+        return result
+
+    rows = _rows_in(daily, groups)
+    index = tiers.build_tier_index(_rows_in(edited, groups, store_column='storevt'))
+    calc = tiers.luong_khoan_daily(index, rows['store_vt'], rows['ym'], rows['tc'])
+    changed = summarize(rows, calc['luong_khoan']).set_index(GROUP_COLUMNS)
+
+    result = result.set_index(GROUP_COLUMNS)
+    keys = changed.index.intersection(result.index)
+    for col in ('luong_khoan', 'chenh_lech', 'vuot_khoan'):
+        result.loc[keys, f'{col}_moi'] = changed.loc[keys, col]
+    result.loc[keys, 'thay_doi'] = True
+    return result.reset_index()
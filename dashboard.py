@@ -0,0 +1,734 @@
+'''
+Dashboard sau khi dang nhap: pool DuckDB, cac ham lay du lieu (get_*), cac section va view.
+
+app.py chi import module nay khi nguoi dung da dang nhap, nen man hinh login khong phai load
+pandas / duckdb / plotly. Cac bang trong database chi duoc nap lai tu file parquet khi co query
+dau tien can den chung (db()), khong phai moi lan chay lai script.
+'''
+import streamlit as st
+import pandas as pd
+from datetime import datetime, timedelta
+import pytz
+import uuid
+from pathlib import Path
+import plotly.io
+from core import aggregates, allocation, data_cache, ingest, instrument, queries, styling, whatif
+from core.charts import (chart_luong_tt, chart_luong_tt_bystore, chart_luong_tt_bystore_chot_thang, chart_dayofweek,
+                         chart_store, chart_tc, chart_whr, char_gio_cong_avg_score, chart_violin_avgscore,
+                         chart_weekly_heatmap, weekly_pivot, candidate_order, char_gio_cong_daily_score,
+                         chart_violin_dailyscore)
+from core.connection import ConnectionPool, POOL_SIZE
+from core.reports import DAILY_COLUMNS, DAILY_PAGE_SIZE, DAILY_RENAME, daily_order, display_page, display_tiertc
+import lazy
+
+# data folder path
+cwd = Path(__file__).parent
+
+# file / thu muc partition nguon: cache tu het han khi chung thay doi
+data_cache.watch(*ingest.source_paths(cwd))
+
+# database DuckDB chua cac bang nap tu file parquet (ingest.py) va cac bang tong hop (aggregates.py)
+db_path = cwd.joinpath('luongkhoan.duckdb')
+
+# thoi gian tung buoc cua moi lan chay (core/instrument.py), ghi JSONL de xem p50 / p95 qua cac session;
+# [instrument] log_path trong secrets.toml, de "" thi khong ghi file
+timings_path = st.secrets.get('instrument', {}).get('log_path', str(cwd.joinpath('logs', 'timings.jsonl')))
+if timings_path:
+    Path(timings_path).parent.mkdir(parents=True, exist_ok=True)
+    instrument.log_to(timings_path)
+
+@st.cache_resource
+def get_pool():
+    # [duckdb] trong secrets.toml: pool_size, threads, memory_limit
+    config = st.secrets.get('duckdb', {})
+    return ConnectionPool(db_path,
+                          size=config.get('pool_size', POOL_SIZE),
+                          threads=config.get('threads'),
+                          memory_limit=config.get('memory_limit'))
+
+@st.cache_resource(max_entries=1)
+def _prepare(version, usernames):
+    # chi nap lai / tinh lai khi file parquet (version = data_version()) hoac danh sach user thay doi
+    with get_pool().connection() as con:
+        ingest.ingest(con, cwd)
+        daily_version = data_cache.file_version(ingest.source_path(cwd, 'data_daily'))
+        aggregates.refresh_thuong_monthly(con, daily_version)
+        aggregates.refresh_store_access(con, daily_version, usernames)
+
+def db():
+    '''
+    Pool da nap du lieu moi nhat; chi goi trong cac ham get_* (khi cache miss)
+    '''
+    usernames = tuple(sorted(creds['username'] for creds in st.secrets['credentials'].values()))
+    _prepare(data_cache.data_version(), usernames)
+    return get_pool()
+
+@instrument.timed
+@data_cache.cached
+def get_data_daily(from_date, to_date, stores=None, days=None, username=None):
+    return queries.fetch_df(db(), 'data_daily', from_date, to_date, stores, days, username)
+
+@instrument.timed
+@data_cache.cached
+def get_daily_points(from_date, to_date, stores=None, days=None, username=None):
+    return queries.fetch_df(db(), 'daily_points', from_date, to_date, stores, days, username)
+
+@instrument.timed
+@data_cache.cached
+def get_daily_chart(from_date, to_date, stores=None, days=None, username=None):
+    return queries.fetch_df(db(), 'daily_chart', from_date, to_date, stores, days, username)
+
+@instrument.timed
+@data_cache.cached
+def get_mtd_avg(from_date, to_date, stores=None, days=None, username=None):
+    return queries.fetch_df(db(), 'mtd_avg', from_date, to_date, stores, days, username)
+
+@instrument.timed
+@data_cache.cached
+def get_store_summary(from_date, to_date, stores=None, days=None, username=None):
+    return queries.fetch_df(db(), 'store_summary', from_date, to_date, stores, days, username)
+
+@instrument.timed
+@data_cache.cached
+def get_daily_headline(from_date, to_date, stores=None, days=None, username=None):
+    return queries.fetch_df(db(), 'daily_headline', from_date, to_date, stores, days, username)
+
+@instrument.timed
+@data_cache.cached
+def get_max_date():
+    return queries.fetch_df(db(), 'max_date')
+
+@instrument.timed
+@data_cache.cached
+def get_gstar_candidates(from_date, to_date, stores=None, username=None):
+    return queries.fetch_df(db(), 'gstar_candidates', from_date, to_date, stores, username=username)
+
+@instrument.timed
+@data_cache.cached
+def get_gstar_weekly(from_date, to_date, stores=None, username=None):
+    return queries.fetch_df(db(), 'gstar_weekly', from_date, to_date, stores, username=username)
+
+@instrument.timed
+@data_cache.cached
+def get_gstar_detail(from_date, to_date, stores=None, username=None):
+    return queries.fetch_df(db(), 'gstar_detail', from_date, to_date, stores, username=username)
+
+@instrument.timed
+@data_cache.cached
+def get_allocated_bonus(from_date, to_date, stores=None, username=None):
+    return allocation.allocate(queries.fetch_df(db(), 'allocated_bonus', from_date, to_date, stores, username=username))
+
+@instrument.timed
+@data_cache.cached
+def get_data_chot_khoan_thang(from_date, to_date, stores=None, username=None):
+    return queries.fetch_df(db(), 'chot_khoan_thang', from_date, to_date, stores, username=username)
+
+@instrument.timed
+@data_cache.cached
+def get_data_pbo_chot_thang(from_date, to_date, stores=None, username=None):
+    return queries.fetch_df(db(), 'pbo_chot_thang', from_date, to_date, stores, username=username)
+
+@instrument.timed
+@data_cache.cached
+def get_tier_tc(from_date, to_date, stores=None, username=None):
+    return queries.fetch_df(db(), 'tier_tc', from_date, to_date, stores, username=username)
+
+@instrument.timed
+@data_cache.cached
+def get_daily_tc(from_date, to_date, stores=None, username=None):
+    return queries.fetch_df(db(), 'daily_tc', from_date, to_date, stores, username=username)
+
+@instrument.timed
+@data_cache.cached
+def get_whatif_baseline(from_date, to_date, stores=None, username=None):
+    tier_tc = whatif.tier_rows(get_tier_tc(from_date, to_date, stores, username=username))
+    return whatif.baseline(get_daily_tc(from_date, to_date, stores, username=username), tier_tc)
+
+@instrument.timed
+@st.cache_data(max_entries=64)
+def simulate_scenario(from_date, to_date, stores, username, version, scenario, _edited):
+    '''
+    Ket qua 1 kich ban what-if, cache theo (bo loc, version du lieu, hash kich ban)
+    '''
+    return whatif.simulate(get_daily_tc(from_date, to_date, stores, username=username),
+                           whatif.tier_rows(get_tier_tc(from_date, to_date, stores, username=username)),
+                           _edited,
+                           get_whatif_baseline(from_date, to_date, stores, username=username))
+
+@instrument.timed
+@data_cache.cached
+def get_store(username):
+    return queries.fetch_df(db(), 'store', username=username)
+
+@instrument.timed
+@data_cache.cached
+def get_dayofweek():
+    return queries.fetch_df(db(), 'dayofweek')
+
+
+def plotly_chart(fig, name):
+    '''
+    st.plotly_chart, khi dang do thoi gian thi ghi them kich thuoc JSON cua figure gui len browser
+    '''
+    if instrument.active():
+        with instrument.stage(f'to_json:{name}') as fields:
+            # giong cach Streamlit serialize figure
+            fields['bytes'] = len(plotly.io.to_json(fig, validate=False).encode())
+    with instrument.stage(f'st.plotly_chart:{name}'):
+        st.plotly_chart(fig)
+
+def section_tong_hop(data_chot_khoan_thang, mtd_avg):
+    # st.write(data_chot_khoan_thang.columns)
+    if len(data_chot_khoan_thang)>0:
+        st.data_editor(styling.style(data_chot_khoan_thang, {
+            "tc": "decimal",
+            "no_of_days": "integer",
+            "avg_tc_per_day": "decimal",
+            "luong_tt_tier0": "integer",
+            "bonus_vuot_tier": "integer",
+            "luong_khoan_allocated": "integer",
+            "pnl_luong_tt_allocated": "integer",
+            "chenh_lech_khoan": "integer",
+            "chenh_lech_khoan_theo_cum": "integer",
+            "chenh_lech_khoan_pbo_theo_cum": "integer",
+            },
+            ),
+            column_order=['som','profit_center', 'store_vt', 'no_of_days', 'tc','avg_tc_per_day',
+            # 'luong_tt_tier0',
+            'luong_khoan_allocated','pnl_luong_tt_allocated','chenh_lech_khoan','chenh_lech_khoan_theo_cum','chenh_lech_khoan_pbo_theo_cum'],
+            column_config={
+                "profit_center": st.column_config.TextColumn(
+                    "Mã NH",
+                ),
+                "store_vt": st.column_config.TextColumn(
+                    "Nhà hàng",
+                ),
+                "som": st.column_config.DatetimeColumn(
+                    "Tháng",
+                    format='MM/YYYY',
+                ),
+                "no_of_days": st.column_config.NumberColumn(
+                    "Số ngày",
+                ),
+                "tc": st.column_config.NumberColumn(
+                    "TC",
+                ),
+                "avg_tc_per_day": st.column_config.NumberColumn(
+                    "TC/ngày",
+                ),
+                "avg_tc_per_day": st.column_config.NumberColumn(
+                    "TC/ngày",
+                ),
+                "luong_khoan_allocated": st.column_config.NumberColumn(
+                    "Lương khoán",
+                ),
+                "pnl_luong_tt_allocated": st.column_config.NumberColumn(
+                    "Lương thực tế",
+                ),
+                "chenh_lech_khoan": st.column_config.NumberColumn(
+                    "Chênh lệch khoán",
+                ),
+                "chenh_lech_khoan_theo_cum": st.column_config.NumberColumn(
+                    "Chênh lệch khoán theo cụm NH",
+                ),
+                "chenh_lech_khoan_pbo_theo_cum": st.column_config.NumberColumn(
+                    "Vượt khoán",
+                ),
+            },
+            disabled=True,
+            )
+    else:
+        # st.dataframe(data_daily)
+
+
+        st.data_editor(styling.style(mtd_avg, {
+            "mtd_avg_tc": "decimal",
+            "total_luongtt_act": "integer",
+            "luong_tt_daily_avg_mtd": "integer",
+            "chenh_lech_luong_khoan": "integer",
+            },
+            ),
+            column_order=[
+                'ym', 'profit_center', 'store_vt', 'level_report_mtd',
+                'mtd_avg_tc','total_luongtt_act','luong_tt_daily_avg_mtd','chenh_lech_luong_khoan',
+            ],
+            column_config={
+                "profit_center": st.column_config.TextColumn(
+                    "Mã NH",
+                ),
+                "store_vt": st.column_config.TextColumn(
+                    "Nhà hàng",
+                ),
+                "level_report_mtd": st.column_config.TextColumn(
+                    "level",
+                ),
+                "mtd_avg_tc": st.column_config.NumberColumn(
+                    "TC/ngày",
+                ),
+                "total_luongtt_act": st.column_config.NumberColumn(
+                    "Lương trực tiếp",
+                ),
+                "luong_tt_daily_avg_mtd": st.column_config.NumberColumn(
+                    "Lương khoán",
+                ),
+                "chenh_lech_luong_khoan": st.column_config.NumberColumn(
+                    "Chênh lệch lương khoán",
+                ),
+            },
+            disabled=True,
+            )
+
+def section_chi_tiet(from_date, to_date, stores, days, username):
+    ghi_chu = '''
+    **[1] Baseline Forecast**: giờ công do hệ thống Ghero tính toán dựa trên TC RFC  
+    **[2] Giờ công lập lịch**: giờ công lập lịch trên Ghero do nhà hàng xếp lịch, lưu ý chỉ xếp tối đa 70% của [1]  
+    **[3] Giờ công thực tế**: giờ công thực tế của nhân viên nhà hàng ghi nhận, tối đa chỉ tương đương với [2]  
+    **[4] Giờ công Gstar**: giờ công trên Job market, tối đa bằng 30% của [1]  
+    **[5] Tổng giờ công** = [3] Giờ công thực tế + [4] Giờ công Gstar  
+    **[6] Baseline Actual**: giờ công do hệ thống Ghero tính toán dựa trên TC Actual
+    '''
+    st.markdown(ghi_chu)
+    data_daily = get_data_daily(from_date, to_date, stores, days, username)
+    # loc / sap xep / chia trang o server, chi trang dang xem duoc format va gui len browser
+    col1, col2, col3, col4, col5 = st.columns([3, 3, 1, 1, 1])
+    search = col1.text_input('Tìm brand / store', key='daily_search')
+    sort_by = col2.selectbox('Sắp xếp theo', [None] + DAILY_COLUMNS, key='daily_sort',
+                             format_func=lambda c: '(mặc định)' if c is None else DAILY_RENAME.get(c, c))
+    descending = col3.toggle('Giảm dần', key='daily_desc')
+    page_sizes = sorted({50, 100, 500, DAILY_PAGE_SIZE})
+    page_size = col4.selectbox('Số dòng', page_sizes, index=page_sizes.index(DAILY_PAGE_SIZE), key='daily_page_size')
+    positions = daily_order(data_daily, search, sort_by, descending)
+    n_pages = max(1, -(-len(positions) // page_size))
+    page = min(col5.number_input('Trang', min_value=1, step=1, key='daily_page'), n_pages)
+    st.caption(f'{len(positions):,} dòng, trang {page}/{n_pages}')
+    styled_data = display_page(data_daily, positions[(page - 1) * page_size:page * page_size])
+    # Styler chi tinh format / mau khi render
+    with instrument.stage('st.dataframe:display_page'):
+        st.dataframe(styled_data)
+
+def section_phan_bo(from_date, to_date, stores, username):
+    data_allocated_bonus = get_allocated_bonus(from_date, to_date, stores, username=username)
+    data_pbo_chot_thang = get_data_pbo_chot_thang(from_date, to_date, stores, username=username)
+    ghi_chu3 = r'''
+    Phần chênh lệch lương khoán >0 được phân chia cho các cá nhân dựa trên:    
+    **[1] Tổng số giờ công trong tháng**  
+    **[2] Hệ số nhóm nhân viên**  
+    **[3] Giờ công sau hệ số** = [1]*[2]  
+    **[4] Hệ số phân bổ** 
+    '''
+    st.markdown(ghi_chu3)
+    st.latex(r'''
+            Hệ\ số\ phân\ bổ = \frac{[3]}{\sum[3]}
+            ''')
+    ghi_chu4 = r'''
+    Phần chênh lệch lương khoán >0 được phân chia cho các cá nhân dựa trên:    
+    **[5] Phân bổ chênh lệch khoán** = Chênh lệch Khoán - Thực tế * Hệ số phân bổ
+
+    '''
+    st.markdown(ghi_chu4)
+    cols = [
+        'ym',
+        'profit_center', 
+        'store_vt',
+        'group_nv', 
+        'nhom_nhan_vien', 
+        'ma_nhan_vien', 
+        'ho_ten_nv', 
+        'chuc_danh',
+        'cap_bac', 
+        'he_so', 
+        'whr', 
+        'whr_sau_he_so', 
+        'whr_ratio', 
+        'allocated_bonus',
+        ]
+    data_allocated_bonus_style = data_allocated_bonus[cols].sort_values(by=[            
+                                                                            'ym',
+                                                                            'profit_center', 
+                                                                            'store_vt',
+                                                                            'group_nv', 
+                                                                            'nhom_nhan_vien', 
+                                                                            'ma_nhan_vien', 
+                                                                            'ho_ten_nv', 
+                                                                            'chuc_danh',
+                                                                            'cap_bac', 
+                                                                            'he_so', ])
+    rename_cols = {
+        'ym':'Tháng/Năm',
+        'profit_center':'Mã profit center', 
+        'store_vt':'Store',
+        'group_nv':'Nhom nhan vien 1', 
+        'nhom_nhan_vien':'Nhom nhan vien 2', 
+        'ma_nhan_vien':'Mã nhân viên', 
+        'ho_ten_nv':"Họ tên", 
+        'chuc_danh':'Chức danh',
+        'cap_bac':'Cấp bậc', 
+        'he_so':'Hệ số', 
+        'whr':'Giờ công', 
+        'whr_sau_he_so':'Giờ công sau hệ số', 
+        'whr_ratio':'Tỷ lệ phân bổ', 
+        'allocated_bonus':'Phân bổ chênh lệch Khoán',
+    }
+    data_allocated_bonus_style = data_allocated_bonus_style.rename(columns=rename_cols)
+    data_allocated_bonus_style = styling.style(data_allocated_bonus_style,
+        {'Hệ số':"decimal", 
+        'Giờ công':"decimal", 
+        'Giờ công sau hệ số':"decimal", 
+        'Tỷ lệ phân bổ':"percent", 
+        'Phân bổ chênh lệch Khoán':"integer",
+        }
+    )
+    if len(data_pbo_chot_thang) == 0:
+        st.dataframe(data_allocated_bonus_style)
+    else:
+        st.data_editor(
+            styling.style(data_pbo_chot_thang, {"allocate_vuot_khoan": "integer"}),
+            column_order=["profit_center", "store_vt", "start_of_month",'ma_nv','ho_va_ten','chuc_danh',
+                        #   'nhom_smart_staffing',
+                          'nhom_nhan_thuong','tong_gio_cong','he_so_thuong','level_report','allocate_vuot_khoan'],
+            column_config={
+                "profit_center": st.column_config.TextColumn(
+                    "Mã NH",
+                ),
+                "store_vt": st.column_config.TextColumn(
+                    "Nhà hàng",
+                ),
+                "start_of_month": st.column_config.DatetimeColumn(
+                    "Tháng",
+                    format='MM/YYYY',
+                ),
+                "ma_nv": st.column_config.TextColumn(
+                    "Mã nhân viên",
+                ),
+                "ho_va_ten": st.column_config.TextColumn(
+                    "Họ và tên",
+                ),
+                "chuc_danh": st.column_config.TextColumn(
+                    "Chức danh",
+                ),
+                # "nhom_smart_staffing": st.column_config.TextColumn(
+                #     "Nhóm staffing",
+                # ),
+                "nhom_nhan_thuong": st.column_config.TextColumn(
+                    "Nhóm",
+                ),
+                "tong_gio_cong": st.column_config.NumberColumn(
+                    "Giờ công",
+                    format ='%.1f'
+                ),
+                "he_so_thuong": st.column_config.NumberColumn(
+                    "Hệ số",
+                    format ='%.1f'
+                ),
+                "level_report": st.column_config.TextColumn(
+                    "Level",
+                ),
+                "allocate_vuot_khoan": st.column_config.NumberColumn(
+                    "Vượt khoán",
+                    # format ='%.f'
+                ),
+            },
+            disabled =True
+            )
+
+def section_tc_tiers(from_date, to_date, stores, username):
+    tier_tc = get_tier_tc(from_date, to_date, stores, username=username)
+    ghi_chu2 = '''
+    **[1] TC/ngày từ & TC/ngày đến**: khoảng TC/ngày của mỗi level  
+    **[2] TC/tháng từ & TC/tháng đến**: khoảng TC/tháng của mỗi level tính theo :blue-background[30 ngày hoạt động]  
+    **[3] Lương cơ bản tại Tier0/ngày & Lương cơ bản tại Tier0/tháng**: tính theo :blue-background[30 ngày hoạt động]  
+    **[4] X-đơn giá tiền lương/TC** trong từng mức tier.          
+    ***Ví dụ*** ở level **tier1**, có TC/ngày từ 51 đến 140, đơn giá X=40.000đ/TC thì giả sử tại ngày hoạt động có TC là 100, nhà hàng sẽ **:green[nhận thêm]** tiền lương tại mức tier1 là:  
+    :money_with_wings: (100-51+1)*40.000 = **:green[2.000.000đ]**.  
+    Với lương cơ bản tại tier0 = 1.800.000đ/ngày thì **lương khoán tại ngày hôm đó** sẽ là:  
+    :moneybag: 1.800.000 + 2.000.000 = **:green[3.800.000đ]**  
+
+    Vẫn ví dụ ở level tier1, có TC/tháng từ 1.501 đến 4.200, đơn giá vẫn là 40.000đ/TC thì giả sử cả tháng đạt 1.800TC, nhà hàng sẽ **:green[nhận thêm]** tiền lương tại mức tier1 là:  
+    :money_with_wings: (1.800-1.501+1)*40.000 = **:green[12.000.000]**.  
+    Với lương cơ bản tại tier0 = 54.000.000đ/tháng, tổng **lương khoán tại tháng đó** sẽ là:  
+    :moneybag: 54.000.000 + 12.000.000 = **:green[66.000.000đ]**
+    '''
+    st.markdown(ghi_chu2)
+    styled_tctier = display_tiertc(tier_tc)
+    with instrument.stage('st.dataframe:display_tiertc'):
+        st.dataframe(styled_tctier)
+
+def section_whatif(from_date, to_date, stores, username):
+    base_tiers = whatif.tier_rows(get_tier_tc(from_date, to_date, stores, username=username))
+    scenarios = st.session_state.setdefault('whatif_scenarios', {})
+    ten_kich_ban = st.selectbox('Kịch bản', ['(mới)'] + list(scenarios), key='whatif_scenario')
+    tier_table = scenarios.get(ten_kich_ban, base_tiers)
+
+    # sua hang loat 1 cot cho cac level duoc chon, ap dung cho tat ca store
+    col1, col2, col3, col4 = st.columns(4)
+    levels = col1.multiselect('Level', sorted(base_tiers['level_report'].unique()), key='whatif_levels')
+    column = col2.selectbox('Cột', whatif.EDIT_COLUMNS, index=3, key='whatif_column')
+    mode = col3.selectbox('Cách sửa', ['set', 'add', 'pct'],
+                          format_func={'set': 'Gán giá trị', 'add': 'Cộng thêm', 'pct': 'Tăng/giảm %'}.get,
+                          key='whatif_mode')
+    value = col4.number_input('Giá trị', value=0.0, step=1000.0, key='whatif_value')
+    if levels:
+        tier_table = whatif.apply_bulk(tier_table, levels, column, value, mode)
+
+    edited = st.data_editor(tier_table, disabled=whatif.KEY_COLUMNS, hide_index=True,
+                            key=f'whatif_editor_{ten_kich_ban}')
+    col1, col2 = st.columns([3, 1])
+    ten_moi = col1.text_input('Lưu kịch bản', placeholder='Tên kịch bản', key='whatif_name', label_visibility='collapsed')
+    if col2.button('Lưu kịch bản', key='whatif_save') and ten_moi:
+        scenarios[ten_moi] = edited.copy()
+
+    invalid = whatif.check_tiers(edited, base_tiers)
+    if not invalid.empty:
+        st.error(f'{len(invalid):,} dòng tier có ngưỡng TC không hợp lệ, chưa tính kịch bản')
+        st.dataframe(invalid, hide_index=True)
+        return
+    scenario = whatif.scenario_hash(base_tiers, edited)
+    result = simulate_scenario(from_date, to_date, stores, username, data_cache.data_version(), scenario, edited)
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric('Lương khoán', f"{result['luong_khoan_moi'].sum()/1e6:,.1f}M",
+                f"{(result['luong_khoan_moi'].sum() - result['luong_khoan'].sum())/1e6:,.1f}M")
+    col2.metric('Chênh lệch Khoán - Thực tế', f"{result['chenh_lech_moi'].sum()/1e6:,.1f}M",
+                f"{(result['chenh_lech_moi'].sum() - result['chenh_lech'].sum())/1e6:,.1f}M")
+    col3.metric('Vượt khoán', f"{result['vuot_khoan_moi'].sum()/1e6:,.1f}M",
+                f"{(result['vuot_khoan_moi'].sum() - result['vuot_khoan'].sum())/1e6:,.1f}M")
+    col4.metric('Store-tháng thay đổi', f"{result['thay_doi'].sum():,}")
+    st.dataframe(result[result['thay_doi']].drop(columns='thay_doi'), hide_index=True)
+
+def get_box_data(from_date, to_date, stores, days, username):
+    data_points = get_daily_points(from_date, to_date, stores, days, username)
+    return data_points.rename(columns={
+                    'report_date': 'Date',
+                    'store_vt':'Store', 
+                    'chenh_lech_luong_khoan': 'Chênh lệch',  # Format with comma and one decimal place
+                    'total_luongtt_act': 'Lương thực tế', 
+                    'luong_tt_daily': 'Lương khoán theo TC từng ngày', 
+                    'tc_forecast':'TC forecast', 
+                    'tc':'TC Actual', 
+                    'day_of_week2':'Ngày trong tuần'
+    })
+
+def section_violin(chart, from_date, to_date, stores, days, username):
+    state = (from_date, to_date, stores, days, username, data_cache.data_version())
+    fig = lazy.memo(chart.__name__, state, lambda: chart(get_box_data(from_date, to_date, stores, days, username)))
+    plotly_chart(fig, chart.__name__)
+
+def section_gstar_weekly(from_date, to_date, stores, username):
+    gstar_avg_ungvien_weekly = get_gstar_weekly(from_date, to_date, stores, username=username)
+    pivot = lazy.memo('gstar_weekly_pivot', (from_date, to_date, stores, username, data_cache.data_version()),
+                      weekly_pivot, gstar_avg_ungvien_weekly)
+    # chi ve 1 trang ung vien (sap theo tong gio cong), chart khong lon theo so ung vien
+    col1, col2, col3 = st.columns([3, 1, 1])
+    search = col1.text_input('Tìm ứng viên', placeholder='Mã hoặc tên ứng viên', key='gstar_search')
+    page_size = col2.selectbox('Số ứng viên / trang', [25, 50, 100], index=1, key='gstar_page_size')
+    order = candidate_order(pivot, search)
+    n_pages = max(1, -(-len(order) // page_size))
+    page = min(col3.number_input('Trang', min_value=1, step=1, key='gstar_page'), n_pages)
+    st.caption(f'{len(order):,} ứng viên, trang {page}/{n_pages}, sắp theo tổng giờ công')
+    plotly_chart(chart_weekly_heatmap(pivot, order[(page - 1) * page_size:page * page_size]), 'chart_weekly_gstar_score')
+
+def section_gstar_daily_data(from_date, to_date, stores, username):
+    st.dataframe(get_gstar_detail(from_date, to_date, stores, username=username))
+
+def section_gstar_daily_chart(from_date, to_date, stores, username):
+    data_gstar = get_gstar_detail(from_date, to_date, stores, username=username)
+    plotly_chart(char_gio_cong_daily_score(data_gstar), 'char_gio_cong_daily_score')
+    plotly_chart(chart_violin_dailyscore(data_gstar), 'chart_violin_dailyscore')
+
+def view_gstar(from_date, to_date, stores, username):
+    # diem trung binh theo ung vien duoc group by trong DuckDB, dong chi tiet / theo tuan chi lay khi mo expander
+    gstar_avg_ungvien = get_gstar_candidates(from_date, to_date, stores, username=username)
+
+    with st.expander("Dữ liệu chi tiết - over all"):
+        st.dataframe(gstar_avg_ungvien)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        with st.container(border=True):
+            plotly_chart(char_gio_cong_avg_score(gstar_avg_ungvien), 'char_gio_cong_avg_score')
+    with col2:
+        with st.container(border=True):
+            plotly_chart(chart_violin_avgscore(gstar_avg_ungvien), 'chart_violin_avgscore')
+
+    lazy.expander("Weekly score", section_gstar_weekly, from_date, to_date, stores, username, key='gstar_weekly')
+    lazy.expander("Daily score data", section_gstar_daily_data, from_date, to_date, stores, username, key='gstar_daily_data')
+    lazy.expander("Daily score chart", section_gstar_daily_chart, from_date, to_date, stores, username, key='gstar_daily_chart')
+
+
+def admin_panel():
+    with st.sidebar.expander("Cache"):
+        st.caption(f"Fingerprint: {data_cache.FINGERPRINT_MODE}")
+        st.dataframe(pd.DataFrame.from_dict(data_cache.cache_stats(), orient='index'))
+        if st.button('Clear cache'):
+            st.cache_data.clear()
+    with st.sidebar.expander("Query timings"):
+        st.dataframe(pd.DataFrame.from_dict(queries.query_timings(), orient='index').round(1))
+    with st.sidebar.expander("DuckDB pool"):
+        st.dataframe(pd.Series(get_pool().stats(), name='value'))
+
+@st.cache_data(ttl=60)
+def timing_summary(path):
+    runs = instrument.read_runs(path)
+    return len(runs), instrument.summary(runs)
+
+def timings_panel(record):
+    '''
+    Thoi gian tung buoc cua lan chay vua xong va p50 / p95 qua cac session (file log)
+    '''
+    with st.sidebar.expander("Stage timings"):
+        st.caption(f"This run: {record['total_ms']:,.0f} ms")
+        st.dataframe(pd.DataFrame(record['stages']), hide_index=True)
+        if timings_path:
+            n_runs, summary = timing_summary(timings_path)
+            st.caption(f"p50 / p95 of the last {n_runs} runs ({timings_path})")
+            if summary:
+                st.dataframe(pd.DataFrame.from_dict(summary, orient='index').sort_values('p95_ms', ascending=False).round(1))
+
+
+def main(username):
+    # moi session 1 id, dung chung cho cac run cua fragment (lazy.py)
+    meta = st.session_state.setdefault('_timing_meta', {'session': uuid.uuid4().hex[:12]})
+    meta['user'] = username
+    with instrument.run('page', **meta) as record:
+        page(username)
+    if username == 'admin':
+        timings_panel(record)
+
+
+def page(username):
+    # get max date
+    max_date = get_max_date()['max_date'][0]
+
+    # Get the current date
+    current_date = datetime.now()
+    yesterday = datetime.now() - timedelta(days=1)
+
+
+
+    # Get the start of the current month
+    start_of_month = yesterday.replace(day=1)
+    from_date = st.sidebar.date_input('Lay du lieu tu ngay', 
+                                      value=min(start_of_month, max_date).replace(day=1), 
+                                      max_value=max_date, min_value=datetime(year=2024, month=10, day=14)
+                                      )
+    to_date = st.sidebar.date_input('Lay du lieu den ngay', 
+                                    value=min(yesterday, max_date), 
+                                    max_value=max_date, min_value=datetime(year=2024, month=10, day=14))
+
+    # st.write(from_date)
+    # st.write(to_date)
+
+    stores = get_store(username)
+    stores = list(stores.sort_values(by='store_vt')['store_vt'])
+
+    # st.write(stores)
+
+    # chon_vitri = st.sidebar.selectbox(label='Chon vi tri',
+    #                                options=vitri,
+    #                                )
+    # if len(chon_vitri)==0:
+    #     chon_vitri='total'
+
+    chon_store = st.sidebar.multiselect(label='Chon store',
+                                    options=stores,
+                                    # default='GG Lê Trọng Tấn'
+                                    )
+    # khong chon store = tat ca store duoc xem: query chi join vao index store_access theo username
+    # thay vi truyen ca danh sach store; tuple store da sort + bo trung de cache key on dinh
+    chon_store = queries.canonical_stores(chon_store) if chon_store else None
+
+    day_of_weeks = get_dayofweek()
+    day_of_weeks = list(day_of_weeks['day_of_week2'])
+    chon_dayofweek = st.sidebar.multiselect(label='Chon ngay trong tuan',
+                                    options=day_of_weeks,
+                                    # default='GG Lê Trọng Tấn'
+                                    )
+    chon_dayofweek = tuple(sorted(chon_dayofweek))
+
+    # cac so lieu tong hop duoc group by san trong DuckDB, chi lay dong chi tiet khi can
+    headline = get_daily_headline(from_date, to_date, chon_store, chon_dayofweek, username)
+    last_update_time = headline['last_update_time'][0]
+    # Define your local timezone (for example, 'Asia/Singapore')
+    local_timezone = pytz.timezone('Etc/GMT-7')
+
+    # Convert to your local timezone
+    last_update_time_local = last_update_time.astimezone(local_timezone)
+    st.write(f'Data updated time: {last_update_time_local:%c}')
+
+
+    data_chot_khoan_thang = get_data_chot_khoan_thang(from_date, to_date, chon_store, username=username)
+
+    data_chart = get_daily_chart(from_date, to_date, chon_store, chon_dayofweek, username)
+
+    chart_luongtt = chart_luong_tt(data_chart)
+    fig_tc = chart_tc(data_chart)
+
+    mtd_avg = get_mtd_avg(from_date, to_date, chon_store, chon_dayofweek, username)
+
+    fig_whr = chart_whr(data_chart)
+
+
+    if len(data_chot_khoan_thang) > 0:
+        tong_khoan = data_chot_khoan_thang['luong_khoan'].sum()
+        tong_actual = data_chot_khoan_thang['pnl_luong_tt_allocated'].sum()
+        chenh_lech = data_chot_khoan_thang['chenh_lech_khoan'].sum()
+        vuot_khoan = data_chot_khoan_thang['chenh_lech_khoan_pbo_theo_cum'].sum()
+    else:
+        tong_khoan = headline['tong_khoan'].sum()
+        tong_actual = headline['tong_actual'].sum()
+        chenh_lech = headline['chenh_lech'].sum()
+        vuot_khoan = 0
+
+    # chi render view duoc chon, cac expander ben trong chi query khi duoc mo
+    view = st.radio('View', ['Store', 'Gstar'], horizontal=True, label_visibility='collapsed', key='view')
+    instrument.annotate(view=view)
+    if view == 'Store':
+
+        with st.container(border=True):
+            col21, col22, col23, col24 = st.columns(4)
+            with col21:
+                st.metric(label='Lương khoán theo TC/ngày tạm tính', 
+                        value=f'{tong_khoan/1e6:,.1f}M',
+                        )
+            with col22:
+                st.metric(label='Lương thực tế tạm tính', 
+                        value=f'{tong_actual/1e6:,.1f}M',
+                        )
+            with col23:
+                st.metric(label='Chênh lệch', 
+                        value=f'{chenh_lech/1e6:,.1f}M',
+                        )
+            with col24:
+                st.metric(label='Vượt khoán chốt tháng', 
+                        value=f'{vuot_khoan/1e6:,.1f}M',
+                        )
+        # col01, col02 = st.columns(2)
+        # with col01:
+        col1, col2 = st.columns(2)
+        with col1:
+            with st.container(border=True):
+                plotly_chart(chart_luongtt, 'chart_luong_tt')
+            with st.container(border=True):
+                plotly_chart(fig_tc, 'chart_tc')
+        with col2:
+            with st.container(border=True):
+                plotly_chart(fig_whr, 'chart_whr')
+            lazy.container('Chênh lệch theo ngày trong tuần', section_violin, chart_dayofweek,
+                           from_date, to_date, chon_store, chon_dayofweek, username, key='violin_dayofweek')
+
+        lazy.expander("Dữ liệu tổng hợp", section_tong_hop, data_chot_khoan_thang, mtd_avg, key='tong_hop')
+        lazy.expander("Dữ liệu chi tiết", section_chi_tiet, from_date, to_date, chon_store, chon_dayofweek, username, key='daily_detail')
+        lazy.expander("Phân bổ chênh lệch Khoán", section_phan_bo, from_date, to_date, chon_store, username, key='phan_bo')
+        lazy.expander("TC Tiers", section_tc_tiers, from_date, to_date, chon_store, username, key='tc_tiers')
+        lazy.expander("What-if TC Tiers", section_whatif, from_date, to_date, chon_store, username, key='whatif')
+
+        lazy.container('Chênh lệch theo từng nhà', section_violin, chart_store,
+                       from_date, to_date, chon_store, chon_dayofweek, username, key='violin_store')
+        with st.container(border=True):
+            if len(data_chot_khoan_thang)>0:
+                fig_storesum = chart_luong_tt_bystore_chot_thang(data_chot_khoan_thang)
+            else:
+                fig_storesum = chart_luong_tt_bystore(get_store_summary(from_date, to_date, chon_store, chon_dayofweek, username))
+            plotly_chart(fig_storesum, 'chart_luong_tt_bystore')
+
+    else:
+        view_gstar(from_date, to_date, chon_store, username)
@@ -0,0 +1,181 @@
+'''
+Export bao cao chot thang ra file, khong can mo dashboard / import Streamlit.
+
+Moi thang, moi bao cao duoc query 1 lan cho tat ca store (daily_summary tinh tu frame cua
+daily_detail, khong query lai), sau do tach theo store va ghi ra
+<out>/<yyyymm>/<bao cao>/<store>.<dinh dang> song song tren process pool (ghi XLSX / CSV la
+phan ton thoi gian nhat). File duoc ghi xong den dau in tien do den do.
+
+    python export.py --month 2024-11 --format parquet xlsx --out exports --workers 4
+    python export.py --month 2024-10 2024-11 --store "GG Lê Trọng Tấn" --format csv
+'''
+import argparse
+import importlib.util
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, timedelta
+from pathlib import Path
+
+from core import aggregates, allocation, data_cache, ingest, queries, reports
+from core.connection import ConnectionPool
+
+ROOT = Path(__file__).resolve().parent
+FORMATS = ['parquet', 'csv', 'xlsx']
+
+
+def _chot_khoan_thang(pool, from_date, to_date, stores):
+    return queries.fetch_df(pool, 'chot_khoan_thang', from_date, to_date, stores)
+
+
+def _pbo_chot_thang(pool, from_date, to_date, stores):
+    return queries.fetch_df(pool, 'pbo_chot_thang', from_date, to_date, stores)
+
+
+def _allocated_bonus(pool, from_date, to_date, stores):
+    return allocation.allocate(queries.fetch_df(pool, 'allocated_bonus', from_date, to_date, stores))
+
+
+def _daily_detail(pool, from_date, to_date, stores):
+    return reports.daily_table(queries.fetch_df(pool, 'data_daily', from_date, to_date, stores))
+
+
+def _daily_summary(daily_detail):
+    return reports.daily_summary(daily_detail).sort_index().reset_index()
+
+
+# ten bao cao: (ham lay du lieu cho ca thang, cot store dung de tach file)
+REPORTS = {
+    'chot_khoan_thang': (_chot_khoan_thang, 'store_vt'),
+    'pbo_chot_thang': (_pbo_chot_thang, 'store_vt'),
+    'allocated_bonus': (_allocated_bonus, 'store_vt'),
+    'daily_detail': (_daily_detail, 'Store'),
+    'daily_summary': (_daily_summary, 'Store'),
+}
+
+# bao cao tinh tu frame cua bao cao khac trong cung thang (ham lay du lieu nhan frame do), khong query lai
+DERIVED = {
+    'daily_summary': 'daily_detail',
+}
+
+
+def month_range(month):
+    '''
+    'yyyy-mm' -> (ngay dau thang, ngay cuoi thang)
+    '''
+    first = date.fromisoformat(f'{month}-01')
+    last = (first.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    return first, last
+
+
+def file_name(store):
+    return re.sub(r'[\\/:*?"<>|]', '_', str(store)).strip() or '_'
+
+
+def write_frame(df, path, fmt):
+    '''
+    Ghi 1 DataFrame ra file; chay trong process con cua pool
+    '''
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == 'parquet':
+        df.to_parquet(path, index=False)
+    elif fmt == 'csv':
+        # utf-8-sig de Excel doc dung tieng Viet
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+    else:
+        # Excel khong ghi duoc datetime co timezone
+        for col in df.select_dtypes(include=['datetimetz']).columns:
+            df[col] = df[col].dt.tz_localize(None)
+        df.to_excel(path, index=False)
+    return path, len(df)
+
+
+def open_pool(database, data_dir):
+    '''
+    ':memory:' = nap lai parquet vao database tam; file .duckdb thi mo chi doc (dashboard da nap)
+    '''
+    if database == ':memory:':
+        pool = ConnectionPool(database, size=1)
+        with pool.connection() as con:
+            ingest.ingest(con, data_dir)
+            aggregates.refresh_thuong_monthly(con, data_cache.file_version(ingest.source_path(data_dir, 'data_daily')))
+        return pool
+    return ConnectionPool(database, size=1, read_only=True)
+
+
+def load_report(pool, name, from_date, to_date, stores, frames):
+    '''
+    Frame cua bao cao `name` cho 1 thang; frames: {bao cao: frame} da lay trong thang, dung lai cho
+    bao cao trong DERIVED
+    '''
+    if name not in frames:
+        load, _ = REPORTS[name]
+        if name in DERIVED:
+            frames[name] = load(load_report(pool, DERIVED[name], from_date, to_date, stores, frames))
+        else:
+            frames[name] = load(pool, from_date, to_date, stores)
+    return frames[name]
+
+
+def default_month(pool):
+    max_date = queries.fetch_df(pool, 'max_date')['max_date'][0]
+    return f'{max_date.year}-{max_date.month:02d}'
+
+
+def export(pool, months, out_dir, formats, workers=None, stores=None, report_names=None):
+    '''
+    Query tung (thang, bao cao) cho tat ca store, ghi tung store ra file song song.
+    Tra ve so file da ghi.
+    '''
+    report_names = report_names or list(REPORTS)
+    n_files = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for month in months:
+            from_date, to_date = month_range(month)
+            ym = from_date.strftime('%Y%m')
+            frames = {}
+            for name in report_names:
+                _, store_column = REPORTS[name]
+                df = load_report(pool, name, from_date, to_date, stores, frames)
+                for store, part in df.groupby(store_column, sort=True):
+                    for fmt in formats:
+                        path = out_dir.joinpath(ym, name, f'{file_name(store)}.{fmt}')
+                        futures.append(executor.submit(write_frame, part.reset_index(drop=True), path, fmt))
+        for future in as_completed(futures):
+            path, rows = future.result()
+            n_files += 1
+            print(f'[{n_files}/{len(futures)}] {path} ({rows} dong)', flush=True)
+    print(f'Xong {n_files} file trong {time.perf_counter() - start:.1f}s')
+    return n_files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export bao cao chot thang theo tung store')
+    parser.add_argument('--month', nargs='+', help='thang yyyy-mm (mac dinh: thang co du lieu moi nhat)')
+    parser.add_argument('--store', nargs='+', help='chi export cac store nay (mac dinh: tat ca)')
+    parser.add_argument('--report', nargs='+', choices=list(REPORTS), help='mac dinh: tat ca bao cao')
+    parser.add_argument('--format', nargs='+', choices=FORMATS, default=['parquet'])
+    parser.add_argument('--out', type=Path, default=Path('exports'))
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--database', default=':memory:', help='file .duckdb da nap san (mo chi doc)')
+    parser.add_argument('--data-dir', type=Path, default=ROOT, help='thu muc chua file parquet nguon')
+    args = parser.parse_args(argv)
+
+    if 'xlsx' in args.format and importlib.util.find_spec('openpyxl') is None:
+        parser.error('can cai openpyxl de ghi xlsx (pip install openpyxl)')
+
+    pool = open_pool(args.database, args.data_dir)
+    try:
+        months = args.month or [default_month(pool)]
+        export(pool, months, args.out, args.format, workers=args.workers,
+               stores=queries.canonical_stores(args.store), report_names=args.report)
+    finally:
+        pool.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,51 @@
+'''
+Section chi query va render khi nguoi dung mo.
+
+Than cua moi section chay trong st.fragment, sau 1 toggle: khi toggle tat thi khong query /
+render gi ca, bat / tat toggle chi chay lai fragment do chu khong chay lai ca trang.
+Ket qua ton kem (Styler, figure ...) duoc giu trong session theo trang thai bo loc (memo).
+'''
+import streamlit as st
+
+from core import instrument
+
+LOAD_LABEL = 'Hiển thị'
+
+
+@st.fragment
+def _body(key, label, render, args, kwargs):
+    if st.toggle(label, key=f'lazy_{key}'):
+        # chay rieng fragment thi la 1 run rieng, trong lan chay ca trang thi thuoc run cua trang
+        with instrument.run(f'fragment:{key}', **st.session_state.get('_timing_meta', {})), \
+                instrument.stage(f'section:{key}'):
+            render(*args, **kwargs)
+
+
+def expander(label, render, *args, key, load_label=LOAD_LABEL, **kwargs):
+    '''
+    st.expander(label) chi goi render(*args, **kwargs) khi toggle ben trong duoc bat
+    '''
+    with st.expander(label):
+        _body(key, load_label, render, args, kwargs)
+
+
+def container(label, render, *args, key, **kwargs):
+    '''
+    Khung co vien voi toggle `label`, chi goi render(*args, **kwargs) khi toggle duoc bat
+    '''
+    with st.container(border=True):
+        _body(key, label, render, args, kwargs)
+
+
+def memo(key, state, build, *args, **kwargs):
+    '''
+    Tra ve build(*args, **kwargs), tinh lai chi khi `state` (bo loc hien tai) thay doi.
+    Moi key chi giu ket qua cua trang thai gan nhat.
+    '''
+    cache = st.session_state.setdefault('_lazy_memo', {})
+    hit = cache.get(key)
+    if hit is not None and hit[0] == state:
+        return hit[1]
+    value = build(*args, **kwargs)
+    cache[key] = (state, value)
+    return value
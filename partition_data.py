@@ -0,0 +1,56 @@
+'''
+Quan ly layout parquet chia partition theo thang / mien (core/partitions.py).
+
+migrate: chuyen cac file nguon 1 file (data_luongtt.parquet ...) sang thu muc partition
+         (data_luongtt/ym=202412/mien=South/...), dashboard tu dung thu muc khi co.
+write:   ghi 1 file du lieu moi vao thu muc partition cua 1 bang, chi thay the cac partition co
+         trong file do (job hang ngay ghi thang hien tai thay vi ghi lai ca file lich su).
+
+    python partition_data.py migrate --data-dir . --remove
+    python partition_data.py write data_daily drop_20241231.parquet --data-dir .
+'''
+import argparse
+import sys
+from pathlib import Path
+
+import duckdb
+
+from core import ingest, partitions
+
+ROOT = Path(__file__).resolve().parent
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Layout parquet chia partition theo thang / mien')
+    parser.add_argument('--data-dir', type=Path, default=ROOT, help='thu muc chua du lieu nguon')
+    # --data-dir dung duoc ca truoc va sau ten lenh; SUPPRESS de lenh con khong ghi de gia tri o truoc
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--data-dir', type=Path, default=argparse.SUPPRESS, help='thu muc chua du lieu nguon')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    migrate = commands.add_parser('migrate', parents=[common], help='chuyen file nguon sang thu muc partition')
+    migrate.add_argument('--table', nargs='+', choices=list(ingest.SOURCES), help='mac dinh: tat ca')
+    migrate.add_argument('--remove', action='store_true', help='xoa file goc sau khi chuyen')
+
+    write = commands.add_parser('write', parents=[common], help='ghi file moi, thay the cac partition co trong file')
+    write.add_argument('table', choices=list(ingest.SOURCES))
+    write.add_argument('source', type=Path, help='file parquet du lieu moi')
+    args = parser.parse_args(argv)
+
+    con = duckdb.connect()
+    try:
+        if args.command == 'migrate':
+            result = partitions.migrate(con, args.data_dir, args.table, remove=args.remove)
+            for name, (n_rows, n_parts) in result.items():
+                print(f'{name}: {n_rows} dong -> {n_parts} partition ({partitions.partition_dir(args.data_dir, name)})')
+            if not result:
+                print('Khong con file nguon 1 file nao can chuyen')
+        else:
+            for part in partitions.write(con, args.table, args.source, args.data_dir):
+                print(f'{args.table}/{part}')
+    finally:
+        con.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())